@@ -0,0 +1,88 @@
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+
+from app.states.coupons_state import coupon_redeemer
+from app.states.state_profiler import TOP, state_profiler
+from app.store.export import MEDIA_TYPES, export_chunks
+from app.store.metrics import registry
+from app.store.record_store import all_stores
+from app.store.redemption import RedemptionError
+
+
+async def export(request: Request) -> Response:
+    """Stream a store's rows matching ``?q=`` as a CSV or NDJSON download.
+
+    The generator is iterated in Starlette's thread pool, so a long export
+    does not hold up the event loop serving other sessions.
+    """
+    name = request.path_params["name"]
+    fmt = request.path_params["fmt"]
+    store = all_stores().get(name)
+    if store is None or fmt not in MEDIA_TYPES:
+        return PlainTextResponse("Not found", status_code=404)
+    rows = store.iter_matching(request.query_params.get("q", ""))
+    return StreamingResponse(
+        export_chunks(rows, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def coupon(request: Request) -> Response:
+    """Validate (GET) or redeem once (POST) the coupon ``code``.
+
+    Plain ``def``: redeeming takes the store lock, so Starlette runs it on
+    its threadpool rather than the event loop.
+
+    Answers with the coupon as JSON, 404 for an unknown code, or 409 with
+    the coupon's status when it is expired or exhausted.
+    """
+    code = request.path_params["code"]
+    use = (
+        coupon_redeemer.redeem if request.method == "POST" else coupon_redeemer.validate
+    )
+    try:
+        return JSONResponse(use(code))
+    except KeyError:
+        return JSONResponse({"error": "unknown code"}, status_code=404)
+    except RedemptionError as error:
+        return JSONResponse(
+            {"error": str(error), "status": error.status}, status_code=409
+        )
+
+
+async def metrics(request: Request) -> Response:
+    """This process's metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+async def state_profile(request: Request) -> Response:
+    """The largest sessions and states; ``?fresh=1`` profiles them first."""
+    top = request.query_params.get("top", str(TOP))
+    if not top.isdecimal():
+        return JSONResponse(
+            {"error": "top must be a non-negative integer"}, status_code=400
+        )
+    if request.query_params.get("fresh") == "1":
+        await state_profiler.refresh()
+    return JSONResponse(state_profiler.report(int(top)))
+
+
+api = Starlette(
+    routes=[
+        Route("/export/{name}.{fmt}", export),
+        Route("/coupons/{code}", coupon, methods=["GET"]),
+        Route("/coupons/{code}/redeem", coupon, methods=["POST"]),
+        Route("/metrics", metrics),
+        Route("/state-profile", state_profile),
+    ]
+)
@@ -1,5 +1,8 @@
 import reflex as rx
-from app.states.nav_state import NavState
+from typing import Callable
+from reflex.app import default_backend_exception_handler
+from reflex.event import EventSpec
+from app.api import api
 from app.components.sidebar import sidebar
 from app.components.header import header
 from app.components.orders_view import orders_view
@@ -7,44 +10,45 @@ from app.components.customers_view import customers_view
 from app.components.products_view import products_view
 from app.components.trials_view import trials_view
 from app.components.coupons_view import coupons_view
+from app.components.import_modal import import_modal
+from app.components.analytics_view import kpi_cards, kpi_row, revenue_table
+from app.states.analytics_state import AnalyticsState
+from app.states.broadcast import sync_sessions
+from app.states.coupons_state import CouponsState, coupon_expiry
+from app.states.customers_state import CustomersState
+from app.states.instrumentation import EventMetrics
+from app.states.nav_state import NavState
+from app.states.orders_state import OrdersState
+from app.states.products_state import ProductsState
+from app.states.state_profiler import held_sessions, state_profiler
+from app.states.trials_state import TrialsState, trial_expiry
+from app.store.aggregates import check_aggregates
+from app.store.persistence import StoreBusy
+from app.store.record_store import follow_stores, load_stores
 
 
 def dashboard_placeholder() -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.h1(
-                NavState.active_item,
+                "Dashboard",
                 class_name="text-3xl font-bold text-gray-900 mb-2 tracking-tight",
             ),
             rx.el.p(
-                f"Manage your {NavState.active_item.lower()} and view performance metrics.",
+                "Manage your dashboard and view performance metrics.",
                 class_name="text-gray-500 font-medium",
             ),
             class_name="mb-8",
         ),
+        kpi_row(),
         rx.el.div(
             rx.el.div(
-                rx.el.div(
-                    rx.el.div(class_name="h-8 w-1/3 bg-gray-200/50 rounded-lg mb-4"),
-                    rx.el.div(class_name="h-64 bg-gray-100/50 rounded-xl"),
-                    class_name="p-6 h-full",
-                ),
-                class_name="col-span-12 lg:col-span-8 bg-white rounded-2xl shadow-sm border border-gray-100 animate-pulse",
-            ),
-            rx.el.div(
-                rx.el.div(
-                    rx.el.div(class_name="h-8 w-1/2 bg-gray-200/50 rounded-lg mb-4"),
-                    rx.el.div(class_name="h-32 bg-gray-100/50 rounded-xl mb-4"),
-                    rx.el.div(class_name="h-32 bg-gray-100/50 rounded-xl"),
-                    class_name="p-6 h-full",
-                ),
-                class_name="col-span-12 lg:col-span-4 bg-white rounded-2xl shadow-sm border border-gray-100 animate-pulse",
+                revenue_table(),
+                class_name="col-span-12 lg:col-span-8 bg-white rounded-2xl shadow-sm border border-gray-100",
             ),
             rx.el.div(
-                rx.el.div(
-                    class_name="h-48 bg-gray-50 rounded-xl border border-gray-200 border-dashed flex items-center justify-center text-gray-400 font-medium"
-                ),
-                class_name="col-span-12 p-6 bg-white rounded-2xl shadow-sm border border-gray-100",
+                kpi_cards(),
+                class_name="col-span-12 lg:col-span-4 bg-white rounded-2xl shadow-sm border border-gray-100",
             ),
             class_name="grid grid-cols-12 gap-6",
         ),
@@ -52,32 +56,51 @@ def dashboard_placeholder() -> rx.Component:
     )
 
 
-def content_area() -> rx.Component:
-    """The main content area which changes based on selection."""
-    return rx.match(
-        NavState.active_item,
-        ("Customers", customers_view()),
-        ("Orders", orders_view()),
-        ("Products", products_view()),
-        ("Trials", trials_view()),
-        ("Coupons", coupons_view()),
-        dashboard_placeholder(),
-    )
-
-
-def index() -> rx.Component:
+def layout(active_route: str, content: rx.Component) -> rx.Component:
     return rx.el.div(
-        sidebar(),
+        sidebar(active_route),
         rx.el.main(
             header(),
-            content_area(),
+            content,
+            import_modal(),
             class_name="flex-1 ml-0 md:ml-64 min-h-screen bg-gray-50/50 flex flex-col",
         ),
         class_name="flex min-h-screen font-['Inter'] bg-gray-50 text-gray-900",
     )
 
 
+def page(route: str, view: Callable[[], rx.Component]) -> Callable[[], rx.Component]:
+    """A page rendering ``view`` inside the shared layout."""
+
+    def render() -> rx.Component:
+        return layout(route, view())
+
+    return render
+
+
+# Each section is its own route, so a page bundles only its own view, and
+# its state reads the tables in from ``on_load`` when first visited rather
+# than on every hydration.
+PAGES = [
+    ("/", dashboard_placeholder, AnalyticsState.load),
+    ("/customers", customers_view, CustomersState.load),
+    ("/orders", orders_view, OrdersState.load),
+    ("/products", products_view, ProductsState.load),
+    ("/trials", trials_view, TrialsState.load),
+    ("/coupons", coupons_view, CouponsState.load),
+]
+
+
+def backend_error(exception: Exception) -> EventSpec:
+    """Ask to retry a write another worker held the table through."""
+    if isinstance(exception, StoreBusy):
+        return rx.toast.error(f"{exception}, please try again.")
+    return default_backend_exception_handler(exception)
+
+
 app = rx.App(
+    api_transformer=api,
+    backend_exception_handler=backend_error,
     theme=rx.theme(appearance="light"),
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
@@ -88,4 +111,41 @@ app = rx.App(
         ),
     ],
 )
-app.add_page(index, route="/")
\ No newline at end of file
+
+
+async def push_expired_trials(keys: list):
+    await sync_sessions(app, TrialsState, AnalyticsState)
+
+
+async def push_expired_coupons(keys: list):
+    await sync_sessions(app, CouponsState, AnalyticsState)
+
+
+# The states reading each store, to push writes other workers made to it.
+STORE_STATES = {
+    "orders": (OrdersState, AnalyticsState),
+    "customers": (CustomersState,),
+    "products": (ProductsState, AnalyticsState),
+    "trials": (TrialsState, AnalyticsState),
+    "coupons": (CouponsState, AnalyticsState),
+}
+
+
+async def push_shared_writes(names: set[str]):
+    states = dict.fromkeys(state for name in names for state in STORE_STATES[name])
+    await sync_sessions(app, *states)
+
+
+app.add_middleware(
+    EventMetrics(
+        NavState, OrdersState, CustomersState, ProductsState, TrialsState, CouponsState
+    )
+)
+app.register_lifespan_task(load_stores)
+app.register_lifespan_task(check_aggregates)
+app.register_lifespan_task(trial_expiry.run, notify=push_expired_trials)
+app.register_lifespan_task(coupon_expiry.run, notify=push_expired_coupons)
+app.register_lifespan_task(follow_stores, notify=push_shared_writes)
+app.register_lifespan_task(state_profiler.run, sessions=lambda: held_sessions(app))
+for route, view, on_load in PAGES:
+    app.add_page(page(route, view), route=route, on_load=on_load)
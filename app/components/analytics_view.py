@@ -0,0 +1,119 @@
+import reflex as rx
+from app.states.analytics_state import AnalyticsState, RevenueGroup
+
+
+def kpi_card(label: str, value: rx.Var, icon: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.icon(icon, size=18, class_name="text-teal-600"),
+            class_name="p-2 bg-teal-50 rounded-lg",
+        ),
+        rx.el.div(
+            rx.el.p(label, class_name="text-sm font-medium text-gray-500"),
+            rx.el.p(value, class_name="text-xl font-bold text-gray-900"),
+        ),
+        class_name="flex items-center gap-4 p-4 bg-gray-50/50 rounded-xl border border-gray-100",
+    )
+
+
+def kpi_cards() -> rx.Component:
+    totals = AnalyticsState.totals
+    return rx.el.div(
+        rx.el.h3("Totals", class_name="text-lg font-bold text-gray-900 mb-4"),
+        rx.el.div(
+            kpi_card("Revenue", f"${totals['revenue']:.2f}", "dollar-sign"),
+            kpi_card("Orders", totals["orders"], "shopping-cart"),
+            kpi_card("Units", totals["units"], "package"),
+            kpi_card("Avg. order value", f"${totals['aov']:.2f}", "receipt"),
+            class_name="flex flex-col gap-3",
+        ),
+        class_name="p-6 h-full",
+    )
+
+
+def kpi_row() -> rx.Component:
+    kpis = AnalyticsState.kpis
+    return rx.el.div(
+        kpi_card("Total revenue", f"${kpis['revenue']:.2f}", "dollar-sign"),
+        kpi_card("Open trials", kpis["open_trials"], "timer"),
+        kpi_card("Active coupons", kpis["active_coupons"], "ticket"),
+        kpi_card("Low stock", kpis["low_stock"], "package"),
+        class_name="grid grid-cols-2 lg:grid-cols-4 gap-4 mb-6",
+    )
+
+
+def dimension_button(dimension: str) -> rx.Component:
+    return rx.el.button(
+        dimension.capitalize(),
+        on_click=lambda: AnalyticsState.set_dimension(dimension),
+        class_name=rx.cond(
+            AnalyticsState.dimension == dimension,
+            "px-3 py-1.5 text-sm font-medium rounded-lg bg-teal-600 text-white shadow-sm",
+            "px-3 py-1.5 text-sm font-medium rounded-lg text-gray-600 hover:bg-gray-100",
+        ),
+    )
+
+
+def group_row(group: RevenueGroup) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            rx.el.span(group["key"], class_name="font-medium text-gray-900"),
+            class_name="px-6 py-3 whitespace-nowrap",
+        ),
+        rx.el.td(
+            rx.el.span(
+                f"${group['revenue']:.2f}", class_name="text-gray-900 font-semibold"
+            ),
+            class_name="px-6 py-3 whitespace-nowrap text-right",
+        ),
+        rx.el.td(
+            group["orders"],
+            class_name="px-6 py-3 whitespace-nowrap text-right text-gray-600",
+        ),
+        rx.el.td(
+            group["units"],
+            class_name="px-6 py-3 whitespace-nowrap text-right text-gray-600",
+        ),
+        rx.el.td(
+            f"${group['aov']:.2f}",
+            class_name="px-6 py-3 whitespace-nowrap text-right text-gray-600",
+        ),
+        class_name="hover:bg-gray-50 transition-colors",
+    )
+
+
+def revenue_table() -> rx.Component:
+    header_class = (
+        "px-6 py-3 text-xs font-semibold text-gray-500 uppercase tracking-wider"
+    )
+    return rx.el.div(
+        rx.el.div(
+            rx.el.h3("Revenue", class_name="text-lg font-bold text-gray-900"),
+            rx.el.div(
+                rx.foreach(AnalyticsState.dimensions, dimension_button),
+                class_name="flex flex-wrap gap-1",
+            ),
+            class_name="flex flex-wrap items-center justify-between gap-4 mb-4",
+        ),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("Group", class_name=f"{header_class} text-left"),
+                        rx.el.th("Revenue", class_name=f"{header_class} text-right"),
+                        rx.el.th("Orders", class_name=f"{header_class} text-right"),
+                        rx.el.th("Units", class_name=f"{header_class} text-right"),
+                        rx.el.th("AOV", class_name=f"{header_class} text-right"),
+                    ),
+                    class_name="bg-gray-50/50 sticky top-0",
+                ),
+                rx.el.tbody(
+                    rx.foreach(AnalyticsState.groups, group_row),
+                    class_name="divide-y divide-gray-100",
+                ),
+                class_name="w-full",
+            ),
+            class_name="max-h-96 overflow-y-auto rounded-xl border border-gray-100",
+        ),
+        class_name="p-6 h-full",
+    )
\ No newline at end of file
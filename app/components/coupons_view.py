@@ -1,5 +1,8 @@
 import reflex as rx
 from app.states.coupons_state import CouponsState, Coupon
+from app.components.scroll_table import virtual_table
+from app.components.export_menu import export_menu
+from app.components.import_modal import import_button
 
 
 def coupon_status_badge(status: str) -> rx.Component:
@@ -90,72 +93,105 @@ def coupon_row(coupon: Coupon) -> rx.Component:
 def coupons_pagination() -> rx.Component:
     return rx.el.div(
         rx.el.p(
-            CouponsState.showing_text, class_name="text-sm text-gray-500 font-medium"
+            rx.cond(
+                CouponsState.scroll_mode,
+                f"{CouponsState.total_items} entries",
+                CouponsState.showing_text,
+            ),
+            class_name="text-sm text-gray-500 font-medium",
         ),
         rx.el.div(
             rx.el.button(
-                "Previous",
-                on_click=CouponsState.prev_page,
-                disabled=CouponsState.page == 1,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
-            ),
-            rx.foreach(
-                CouponsState.page_numbers,
-                lambda p: rx.el.button(
-                    p,
-                    on_click=lambda: CouponsState.set_page(p),
-                    class_name=rx.cond(
-                        CouponsState.page == p,
-                        "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
-                        "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
-                    ),
-                ),
-            ),
-            rx.el.button(
-                "Next",
-                on_click=CouponsState.next_page,
-                disabled=CouponsState.page == CouponsState.total_pages,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+                rx.cond(CouponsState.scroll_mode, "Pages", "Scroll"),
+                on_click=CouponsState.toggle_scroll_mode,
+                class_name="px-3 py-1 text-sm font-medium text-teal-600 hover:text-teal-700",
             ),
+            rx.cond(~CouponsState.scroll_mode, coupons_page_buttons()),
             class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between px-6 py-4 border-t border-gray-100",
     )
 
 
+def coupons_page_buttons() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Previous",
+            on_click=CouponsState.prev_page,
+            disabled=CouponsState.page == 1,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.foreach(
+            CouponsState.page_numbers,
+            lambda p: rx.el.button(
+                p,
+                on_click=lambda: CouponsState.set_page(p),
+                class_name=rx.cond(
+                    CouponsState.page == p,
+                    "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
+                    "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
+                ),
+            ),
+        ),
+        rx.el.button(
+            "Next",
+            on_click=CouponsState.next_page,
+            disabled=CouponsState.page == CouponsState.total_pages,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def coupons_table_head() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                "Code",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Type",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Value",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Usage",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Status",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            class_name="bg-gray-50/50",
+        )
+    )
+
+
 def coupons_table() -> rx.Component:
     return rx.el.div(
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "Code",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Type",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Value",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Usage",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Status",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    class_name="bg-gray-50/50",
-                )
+        rx.cond(
+            CouponsState.scroll_mode,
+            virtual_table(
+                coupons_table_head(),
+                CouponsState.scroll_rows,
+                coupon_row,
+                CouponsState.scroll_top_pad,
+                CouponsState.scroll_bottom_pad,
+                on_scroll=CouponsState.scroll_to,
+                key=CouponsState.search_query,
             ),
-            rx.el.tbody(
-                rx.foreach(CouponsState.current_page_coupons, coupon_row),
-                class_name="divide-y divide-gray-100 bg-white",
+            rx.el.table(
+                coupons_table_head(),
+                rx.el.tbody(
+                    rx.foreach(CouponsState.current_page_coupons, coupon_row),
+                    class_name="divide-y divide-gray-100 bg-white",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
             ),
-            class_name="min-w-full divide-y divide-gray-200",
         ),
         coupons_pagination(),
         class_name="bg-white rounded-2xl shadow-sm border border-gray-100 overflow-hidden flex flex-col justify-between h-full",
@@ -390,6 +426,8 @@ def coupons_header() -> rx.Component:
                 ),
                 class_name="relative",
             ),
+            export_menu(CouponsState.export),
+            import_button("Coupons"),
             rx.el.button(
                 rx.icon("plus", size=18),
                 rx.el.span("New Coupon"),
@@ -412,7 +450,7 @@ def coupons_view() -> rx.Component:
             ),
             rx.el.div(
                 rx.cond(
-                    CouponsState.coupons,
+                    CouponsState.has_rows,
                     coupon_details_panel(),
                     rx.el.div(
                         "No coupon selected",
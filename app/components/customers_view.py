@@ -1,5 +1,9 @@
 import reflex as rx
 from app.states.customers_state import CustomersState, Customer
+from app.components.scroll_table import virtual_table
+from app.components.export_menu import export_menu
+from app.components.import_modal import import_button
+from app.components.dedupe_modal import dedupe_button, dedupe_modal
 
 
 def status_badge(status: str) -> rx.Component:
@@ -90,68 +94,101 @@ def customer_row(customer: Customer) -> rx.Component:
 def pagination_controls() -> rx.Component:
     return rx.el.div(
         rx.el.p(
-            CustomersState.showing_text, class_name="text-sm text-gray-500 font-medium"
+            rx.cond(
+                CustomersState.scroll_mode,
+                f"{CustomersState.total_items} entries",
+                CustomersState.showing_text,
+            ),
+            class_name="text-sm text-gray-500 font-medium",
         ),
         rx.el.div(
             rx.el.button(
-                "Previous",
-                on_click=CustomersState.prev_page,
-                disabled=CustomersState.page == 1,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
-            ),
-            rx.foreach(
-                CustomersState.page_numbers,
-                lambda p: rx.el.button(
-                    p,
-                    on_click=lambda: CustomersState.set_page(p),
-                    class_name=rx.cond(
-                        CustomersState.page == p,
-                        "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
-                        "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
-                    ),
-                ),
-            ),
-            rx.el.button(
-                "Next",
-                on_click=CustomersState.next_page,
-                disabled=CustomersState.page == CustomersState.total_pages,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+                rx.cond(CustomersState.scroll_mode, "Pages", "Scroll"),
+                on_click=CustomersState.toggle_scroll_mode,
+                class_name="px-3 py-1 text-sm font-medium text-teal-600 hover:text-teal-700",
             ),
+            rx.cond(~CustomersState.scroll_mode, page_buttons()),
             class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between px-6 py-4 border-t border-gray-100",
     )
 
 
+def page_buttons() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Previous",
+            on_click=CustomersState.prev_page,
+            disabled=CustomersState.page == 1,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.foreach(
+            CustomersState.page_numbers,
+            lambda p: rx.el.button(
+                p,
+                on_click=lambda: CustomersState.set_page(p),
+                class_name=rx.cond(
+                    CustomersState.page == p,
+                    "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
+                    "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
+                ),
+            ),
+        ),
+        rx.el.button(
+            "Next",
+            on_click=CustomersState.next_page,
+            disabled=CustomersState.page == CustomersState.total_pages,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def customers_table_head() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                "Customer",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Phone",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Company",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Status",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            class_name="bg-gray-50/50",
+        )
+    )
+
+
 def customers_table() -> rx.Component:
     return rx.el.div(
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "Customer",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Phone",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Company",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Status",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    class_name="bg-gray-50/50",
-                )
+        rx.cond(
+            CustomersState.scroll_mode,
+            virtual_table(
+                customers_table_head(),
+                CustomersState.scroll_rows,
+                customer_row,
+                CustomersState.scroll_top_pad,
+                CustomersState.scroll_bottom_pad,
+                on_scroll=CustomersState.scroll_to,
+                key=CustomersState.search_query,
             ),
-            rx.el.tbody(
-                rx.foreach(CustomersState.current_page_customers, customer_row),
-                class_name="divide-y divide-gray-100 bg-white",
+            rx.el.table(
+                customers_table_head(),
+                rx.el.tbody(
+                    rx.foreach(CustomersState.current_page_customers, customer_row),
+                    class_name="divide-y divide-gray-100 bg-white",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
             ),
-            class_name="min-w-full divide-y divide-gray-200",
         ),
         pagination_controls(),
         class_name="bg-white rounded-2xl shadow-sm border border-gray-100 overflow-hidden flex flex-col justify-between h-full",
@@ -351,6 +388,9 @@ def customers_header() -> rx.Component:
                 ),
                 class_name="relative",
             ),
+            export_menu(CustomersState.export),
+            import_button("Customers"),
+            dedupe_button(),
             rx.el.button(
                 rx.icon("plus", size=18),
                 rx.el.span("Add New User"),
@@ -366,6 +406,7 @@ def customers_header() -> rx.Component:
 def customers_view() -> rx.Component:
     return rx.el.div(
         add_customer_modal(),
+        dedupe_modal(),
         customers_header(),
         rx.el.div(
             rx.el.div(
@@ -373,7 +414,7 @@ def customers_view() -> rx.Component:
             ),
             rx.el.div(
                 rx.cond(
-                    CustomersState.customers,
+                    CustomersState.has_rows,
                     customer_details_panel(),
                     rx.el.div(
                         "No customer selected",
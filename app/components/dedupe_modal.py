@@ -0,0 +1,80 @@
+import reflex as rx
+from app.states.customers_state import Customer
+from app.states.dedupe_state import DedupeState
+
+
+def dedupe_button() -> rx.Component:
+    return rx.el.button(
+        rx.icon("copy", size=18),
+        rx.el.span("Duplicates"),
+        on_click=DedupeState.scan,
+        class_name="flex items-center gap-2 px-4 py-2 bg-white border border-gray-200 hover:bg-gray-50 text-gray-700 text-sm font-medium rounded-xl shadow-sm transition-all active:scale-[0.98]",
+    )
+
+
+def cluster_member(customer: Customer) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(customer["name"], class_name="text-sm font-medium text-gray-900"),
+        rx.el.p(
+            f"{customer['email']} · {customer['phone']}",
+            class_name="text-xs text-gray-500",
+        ),
+        class_name="flex flex-col",
+    )
+
+
+def cluster_card(cluster: list[Customer], index: int) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.foreach(cluster, cluster_member),
+            class_name="flex flex-col gap-2",
+        ),
+        rx.el.button(
+            "Merge",
+            on_click=DedupeState.merge(index),
+            disabled=DedupeState.is_running,
+            class_name="px-3 py-1.5 text-sm font-medium text-teal-700 bg-white border border-teal-600 rounded-lg hover:bg-teal-50 disabled:opacity-50",
+        ),
+        class_name="flex items-start justify-between gap-4 p-4 bg-gray-50 rounded-xl",
+    )
+
+
+def dedupe_modal() -> rx.Component:
+    return rx.dialog.root(
+        rx.dialog.content(
+            rx.dialog.title(
+                "Duplicate customers",
+                class_name="text-lg font-bold text-gray-900 mb-1",
+            ),
+            rx.el.p(
+                rx.cond(
+                    DedupeState.is_running,
+                    "Looking for customers sharing an email, phone or name…",
+                    f"{DedupeState.cluster_count} clusters among {DedupeState.scanned} customers ({DedupeState.pairs} pairs compared). The oldest customer in each cluster is kept; orders and trials of the others move to it.",
+                ),
+                class_name="text-sm text-gray-500 mb-4",
+            ),
+            rx.el.div(
+                rx.foreach(DedupeState.clusters, cluster_card),
+                class_name="flex flex-col gap-3 max-h-96 overflow-y-auto mb-4",
+            ),
+            rx.el.div(
+                rx.dialog.close(
+                    rx.el.button(
+                        "Close",
+                        type="button",
+                        class_name="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 mr-2",
+                    )
+                ),
+                rx.el.button(
+                    "Merge all",
+                    on_click=DedupeState.merge_all,
+                    disabled=DedupeState.is_running | (DedupeState.cluster_count == 0),
+                    class_name="px-4 py-2 text-sm font-medium text-white bg-teal-600 rounded-lg hover:bg-teal-700 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                class_name="flex justify-end",
+            ),
+        ),
+        open=DedupeState.is_open,
+        on_open_change=DedupeState.set_open,
+    )
\ No newline at end of file
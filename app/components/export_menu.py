@@ -0,0 +1,18 @@
+import reflex as rx
+
+
+def export_menu(export: rx.EventHandler) -> rx.Component:
+    """Export button offering the current filtered table as CSV or NDJSON."""
+    return rx.menu.root(
+        rx.menu.trigger(
+            rx.el.button(
+                rx.icon("download", size=18),
+                rx.el.span("Export"),
+                class_name="flex items-center gap-2 px-4 py-2 bg-white border border-gray-200 hover:bg-gray-50 text-gray-700 text-sm font-medium rounded-xl shadow-sm transition-all active:scale-[0.98]",
+            )
+        ),
+        rx.menu.content(
+            rx.menu.item("CSV", on_click=export("csv")),
+            rx.menu.item("NDJSON", on_click=export("ndjson")),
+        ),
+    )
@@ -1,22 +1,69 @@
 import reflex as rx
 from app.states.nav_state import NavState
+from app.store.global_search import SearchGroup, SearchHit
+
+
+def search_hit(hit: SearchHit, entity: str) -> rx.Component:
+    return rx.el.button(
+        rx.el.p(hit["title"], class_name="text-sm font-medium text-gray-900 truncate"),
+        rx.el.p(hit["detail"], class_name="text-xs text-gray-500 truncate"),
+        on_click=NavState.open_result(entity, hit["key"]),
+        class_name="w-full text-left px-4 py-2 hover:bg-gray-50 transition-colors",
+    )
+
+
+def search_group(group: SearchGroup) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.icon(group["icon"], size=14),
+            rx.el.span(group["entity"]),
+            class_name="flex items-center gap-2 px-4 pt-3 pb-1 text-xs font-semibold text-gray-400 uppercase tracking-wide",
+        ),
+        rx.foreach(group["hits"], lambda hit: search_hit(hit, group["entity"])),
+    )
+
+
+def search_results() -> rx.Component:
+    """Grouped global search results under the header search box."""
+    return rx.cond(
+        NavState.search_results.length() > 0,
+        rx.el.div(
+            rx.foreach(NavState.search_results, search_group),
+            rx.el.button(
+                "Close",
+                on_click=NavState.clear_search,
+                class_name="w-full px-4 py-2 text-xs font-medium text-gray-500 hover:text-gray-700 border-t border-gray-100",
+            ),
+            class_name="absolute left-0 right-0 top-full mt-2 max-h-96 overflow-y-auto bg-white border border-gray-200 rounded-xl shadow-lg",
+        ),
+    )
 
 
 def header() -> rx.Component:
     """The top header component with search and profile."""
     return rx.el.header(
         rx.el.div(
-            rx.icon(
-                "search",
-                class_name="text-gray-400 absolute left-4 top-1/2 -translate-y-1/2",
-                size=20,
+            rx.cond(
+                NavState.is_searching,
+                rx.icon(
+                    "loader-circle",
+                    class_name="text-gray-400 absolute left-4 top-1/2 -translate-y-1/2 animate-spin",
+                    size=20,
+                ),
+                rx.icon(
+                    "search",
+                    class_name="text-gray-400 absolute left-4 top-1/2 -translate-y-1/2",
+                    size=20,
+                ),
             ),
             rx.el.input(
+                id="global-search",
                 placeholder="Global search...",
                 on_change=NavState.set_search,
                 class_name="w-full pl-12 pr-4 py-2.5 bg-gray-50 border border-transparent rounded-xl focus:border-teal-500 focus:ring-2 focus:ring-teal-500/20 focus:bg-white transition-all duration-200 text-gray-900 placeholder-gray-500 font-medium",
                 default_value=NavState.search_query,
             ),
+            search_results(),
             class_name="relative w-full max-w-md hidden md:block",
         ),
         rx.el.div(
@@ -0,0 +1,109 @@
+import reflex as rx
+from app.states.import_state import ImportState
+
+UPLOAD_ID = "bulk_import"
+
+
+def import_button(entity: str) -> rx.Component:
+    return rx.el.button(
+        rx.icon("upload", size=18),
+        rx.el.span("Import"),
+        on_click=ImportState.open_import(entity),
+        class_name="flex items-center gap-2 px-4 py-2 bg-white border border-gray-200 hover:bg-gray-50 text-gray-700 text-sm font-medium rounded-xl shadow-sm transition-all active:scale-[0.98]",
+    )
+
+
+def import_progress() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(
+                ImportState.filename, class_name="text-sm font-medium text-gray-900"
+            ),
+            rx.cond(
+                ImportState.is_running,
+                rx.spinner(size="2"),
+                rx.icon("circle-check", size=18, class_name="text-teal-600"),
+            ),
+            class_name="flex items-center justify-between mb-2",
+        ),
+        rx.el.p(
+            f"{ImportState.rows} rows read · {ImportState.imported} imported · {ImportState.failed} failed",
+            class_name="text-sm text-gray-500",
+        ),
+        rx.cond(
+            ImportState.errors.length() > 0,
+            rx.el.div(
+                rx.foreach(
+                    ImportState.errors,
+                    lambda error: rx.el.p(error, class_name="text-xs text-red-600"),
+                ),
+                rx.cond(
+                    ImportState.failed > ImportState.errors.length(),
+                    rx.el.p(
+                        f"and {ImportState.failed - ImportState.errors.length()} more",
+                        class_name="text-xs text-gray-500",
+                    ),
+                ),
+                class_name="mt-3 max-h-40 overflow-y-auto p-3 bg-red-50 rounded-lg space-y-1",
+            ),
+        ),
+        class_name="p-4 bg-gray-50 rounded-xl mb-6",
+    )
+
+
+def import_modal() -> rx.Component:
+    return rx.dialog.root(
+        rx.dialog.content(
+            rx.dialog.title(
+                f"Import {ImportState.entity}",
+                class_name="text-lg font-bold text-gray-900 mb-1",
+            ),
+            rx.el.p(
+                "CSV with a header row, or JSONL with one object per line. Invalid rows are skipped and listed below.",
+                class_name="text-sm text-gray-500 mb-4",
+            ),
+            rx.upload.root(
+                rx.el.div(
+                    rx.icon("file-up", size=24, class_name="text-gray-400"),
+                    rx.el.p(
+                        rx.cond(
+                            rx.selected_files(UPLOAD_ID).length() > 0,
+                            rx.selected_files(UPLOAD_ID)[0],
+                            "Drop a file here or click to choose",
+                        ),
+                        class_name="text-sm text-gray-600 font-medium",
+                    ),
+                    class_name="flex flex-col items-center gap-2",
+                ),
+                id=UPLOAD_ID,
+                multiple=False,
+                max_files=1,
+                accept={
+                    "text/csv": [".csv"],
+                    "application/x-ndjson": [".jsonl", ".ndjson"],
+                },
+                class_name="p-6 border-2 border-dashed border-gray-200 rounded-xl cursor-pointer hover:border-teal-500 transition-colors mb-4",
+            ),
+            rx.cond(ImportState.filename != "", import_progress()),
+            rx.el.div(
+                rx.dialog.close(
+                    rx.el.button(
+                        "Close",
+                        type="button",
+                        class_name="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 mr-2",
+                    )
+                ),
+                rx.el.button(
+                    "Import",
+                    on_click=ImportState.handle_upload(
+                        rx.upload_files(upload_id=UPLOAD_ID)
+                    ),
+                    disabled=ImportState.is_running,
+                    class_name="px-4 py-2 text-sm font-medium text-white bg-teal-600 rounded-lg hover:bg-teal-700 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                class_name="flex justify-end",
+            ),
+        ),
+        open=ImportState.is_open,
+        on_open_change=ImportState.set_open,
+    )
@@ -1,5 +1,7 @@
 import reflex as rx
 from app.states.orders_state import OrdersState, Order
+from app.components.scroll_table import virtual_table
+from app.components.export_menu import export_menu
 
 
 def order_row(order: Order) -> rx.Component:
@@ -43,68 +45,101 @@ def order_row(order: Order) -> rx.Component:
 def pagination_controls() -> rx.Component:
     return rx.el.div(
         rx.el.p(
-            OrdersState.showing_text, class_name="text-sm text-gray-500 font-medium"
+            rx.cond(
+                OrdersState.scroll_mode,
+                f"{OrdersState.total_items} entries",
+                OrdersState.showing_text,
+            ),
+            class_name="text-sm text-gray-500 font-medium",
         ),
         rx.el.div(
             rx.el.button(
-                "Previous",
-                on_click=OrdersState.prev_page,
-                disabled=OrdersState.page == 1,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
-            ),
-            rx.foreach(
-                OrdersState.page_numbers,
-                lambda p: rx.el.button(
-                    p,
-                    on_click=lambda: OrdersState.set_page(p),
-                    class_name=rx.cond(
-                        OrdersState.page == p,
-                        "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
-                        "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
-                    ),
-                ),
-            ),
-            rx.el.button(
-                "Next",
-                on_click=OrdersState.next_page,
-                disabled=OrdersState.page == OrdersState.total_pages,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+                rx.cond(OrdersState.scroll_mode, "Pages", "Scroll"),
+                on_click=OrdersState.toggle_scroll_mode,
+                class_name="px-3 py-1 text-sm font-medium text-teal-600 hover:text-teal-700",
             ),
+            rx.cond(~OrdersState.scroll_mode, page_buttons()),
             class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between px-6 py-4 border-t border-gray-100",
     )
 
 
+def page_buttons() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Previous",
+            on_click=OrdersState.prev_page,
+            disabled=OrdersState.page == 1,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.foreach(
+            OrdersState.page_numbers,
+            lambda p: rx.el.button(
+                p,
+                on_click=lambda: OrdersState.set_page(p),
+                class_name=rx.cond(
+                    OrdersState.page == p,
+                    "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
+                    "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
+                ),
+            ),
+        ),
+        rx.el.button(
+            "Next",
+            on_click=OrdersState.next_page,
+            disabled=OrdersState.page == OrdersState.total_pages,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def orders_table_head() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                "ID",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Product",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Quantity",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Charged",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            class_name="bg-gray-50/50",
+        )
+    )
+
+
 def orders_table() -> rx.Component:
     return rx.el.div(
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "ID",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Product",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Quantity",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Charged",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    class_name="bg-gray-50/50",
-                )
+        rx.cond(
+            OrdersState.scroll_mode,
+            virtual_table(
+                orders_table_head(),
+                OrdersState.scroll_rows,
+                order_row,
+                OrdersState.scroll_top_pad,
+                OrdersState.scroll_bottom_pad,
+                on_scroll=OrdersState.scroll_to,
+                key=OrdersState.search_query,
             ),
-            rx.el.tbody(
-                rx.foreach(OrdersState.current_page_orders, order_row),
-                class_name="divide-y divide-gray-100 bg-white",
+            rx.el.table(
+                orders_table_head(),
+                rx.el.tbody(
+                    rx.foreach(OrdersState.current_page_orders, order_row),
+                    class_name="divide-y divide-gray-100 bg-white",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
             ),
-            class_name="min-w-full divide-y divide-gray-200",
         ),
         pagination_controls(),
         class_name="bg-white rounded-2xl shadow-sm border border-gray-100 overflow-hidden flex flex-col justify-between h-full",
@@ -226,6 +261,7 @@ def orders_header() -> rx.Component:
                 ),
                 class_name="relative",
             ),
+            export_menu(OrdersState.export),
             rx.el.button(
                 rx.icon("plus", size=18),
                 rx.el.span("Add New User"),
@@ -246,7 +282,7 @@ def orders_view() -> rx.Component:
             ),
             rx.el.div(
                 rx.cond(
-                    OrdersState.orders,
+                    OrdersState.has_rows,
                     product_details_panel(),
                     rx.el.div(
                         "No order selected",
@@ -1,5 +1,9 @@
 import reflex as rx
-from app.states.products_state import ProductsState, Product
+from app.states.products_state import ProductsState, Product, StockMovement
+from app.store.ledger import KINDS
+from app.components.scroll_table import virtual_table
+from app.components.export_menu import export_menu
+from app.components.import_modal import import_button
 
 
 def product_status_badge(status: str) -> rx.Component:
@@ -87,76 +91,109 @@ def product_row(product: Product) -> rx.Component:
 def products_pagination() -> rx.Component:
     return rx.el.div(
         rx.el.p(
-            ProductsState.showing_text, class_name="text-sm text-gray-500 font-medium"
+            rx.cond(
+                ProductsState.scroll_mode,
+                f"{ProductsState.total_items} entries",
+                ProductsState.showing_text,
+            ),
+            class_name="text-sm text-gray-500 font-medium",
         ),
         rx.el.div(
             rx.el.button(
-                "Previous",
-                on_click=ProductsState.prev_page,
-                disabled=ProductsState.page == 1,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
-            ),
-            rx.foreach(
-                ProductsState.page_numbers,
-                lambda p: rx.el.button(
-                    p,
-                    on_click=lambda: ProductsState.set_page(p),
-                    class_name=rx.cond(
-                        ProductsState.page == p,
-                        "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
-                        "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
-                    ),
-                ),
-            ),
-            rx.el.button(
-                "Next",
-                on_click=ProductsState.next_page,
-                disabled=ProductsState.page == ProductsState.total_pages,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+                rx.cond(ProductsState.scroll_mode, "Pages", "Scroll"),
+                on_click=ProductsState.toggle_scroll_mode,
+                class_name="px-3 py-1 text-sm font-medium text-teal-600 hover:text-teal-700",
             ),
+            rx.cond(~ProductsState.scroll_mode, products_page_buttons()),
             class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between px-6 py-4 border-t border-gray-100",
     )
 
 
+def products_page_buttons() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Previous",
+            on_click=ProductsState.prev_page,
+            disabled=ProductsState.page == 1,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.foreach(
+            ProductsState.page_numbers,
+            lambda p: rx.el.button(
+                p,
+                on_click=lambda: ProductsState.set_page(p),
+                class_name=rx.cond(
+                    ProductsState.page == p,
+                    "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
+                    "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
+                ),
+            ),
+        ),
+        rx.el.button(
+            "Next",
+            on_click=ProductsState.next_page,
+            disabled=ProductsState.page == ProductsState.total_pages,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def products_table_head() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                "ID",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider w-16",
+            ),
+            rx.el.th(
+                "Product Name",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Category",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Price",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Quantity",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Status",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            class_name="bg-gray-50/50",
+        )
+    )
+
+
 def products_table() -> rx.Component:
     return rx.el.div(
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "ID",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider w-16",
-                    ),
-                    rx.el.th(
-                        "Product Name",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Category",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Price",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Quantity",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Status",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    class_name="bg-gray-50/50",
-                )
+        rx.cond(
+            ProductsState.scroll_mode,
+            virtual_table(
+                products_table_head(),
+                ProductsState.scroll_rows,
+                product_row,
+                ProductsState.scroll_top_pad,
+                ProductsState.scroll_bottom_pad,
+                on_scroll=ProductsState.scroll_to,
+                key=ProductsState.search_query,
             ),
-            rx.el.tbody(
-                rx.foreach(ProductsState.current_page_products, product_row),
-                class_name="divide-y divide-gray-100 bg-white",
+            rx.el.table(
+                products_table_head(),
+                rx.el.tbody(
+                    rx.foreach(ProductsState.current_page_products, product_row),
+                    class_name="divide-y divide-gray-100 bg-white",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
             ),
-            class_name="min-w-full divide-y divide-gray-200",
         ),
         products_pagination(),
         class_name="bg-white rounded-2xl shadow-sm border border-gray-100 overflow-hidden flex flex-col justify-between h-full",
@@ -255,11 +292,16 @@ def product_details_panel() -> rx.Component:
                                 size=16,
                                 class_name="absolute left-3 top-1/2 -translate-y-1/2 text-gray-400",
                             ),
+                            rx.el.input(
+                                name="seen_stock",
+                                type="hidden",
+                                value=ProductsState.selected_product["stock"],
+                            ),
                             rx.el.input(
                                 name="stock",
                                 type="number",
                                 default_value=ProductsState.selected_product["stock"],
-                                key=f"stock-{ProductsState.selected_product_id}",
+                                key=f"stock-{ProductsState.selected_product_id}-{ProductsState.selected_product['stock']}",
                                 class_name="w-full pl-9 pr-4 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm font-medium focus:border-teal-500 focus:ring-2 focus:ring-teal-500/20 outline-none",
                             ),
                             class_name="relative",
@@ -300,10 +342,73 @@ def product_details_panel() -> rx.Component:
             ),
             class_name="border-t border-gray-100 pt-6",
         ),
+        stock_movements(),
         class_name="p-6 bg-white rounded-2xl shadow-sm border border-gray-100 h-full flex flex-col",
     )
 
 
+def movement_row(movement: StockMovement) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.span(
+                movement["kind"].capitalize(),
+                class_name="text-sm font-medium text-gray-900",
+            ),
+            rx.el.span(movement["at"], class_name="text-xs text-gray-400"),
+            class_name="flex flex-col",
+        ),
+        rx.el.span(
+            rx.cond(
+                movement["quantity"] > 0,
+                f"+{movement['quantity']}",
+                movement["quantity"].to_string(),
+            ),
+            class_name=rx.cond(
+                movement["quantity"] > 0,
+                "text-sm font-semibold text-green-700",
+                "text-sm font-semibold text-red-600",
+            ),
+        ),
+        class_name="flex items-center justify-between py-2",
+    )
+
+
+def stock_movements() -> rx.Component:
+    field_class = "px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm font-medium focus:border-teal-500 focus:ring-2 focus:ring-teal-500/20 outline-none"
+    return rx.el.div(
+        rx.el.h4("Stock Movements", class_name="text-sm font-bold text-gray-900 mb-4"),
+        rx.el.form(
+            rx.el.div(
+                rx.el.select(
+                    *[rx.el.option(kind.capitalize(), value=kind) for kind in KINDS],
+                    name="kind",
+                    default_value="receipt",
+                    class_name=field_class,
+                ),
+                rx.el.input(
+                    name="quantity",
+                    type="number",
+                    placeholder="Qty",
+                    class_name=f"{field_class} w-20",
+                ),
+                rx.el.button(
+                    "Record",
+                    type="submit",
+                    class_name="px-4 py-2 bg-teal-600 hover:bg-teal-700 text-white text-sm font-medium rounded-lg shadow-sm",
+                ),
+                class_name="flex gap-2 mb-4",
+            ),
+            on_submit=ProductsState.record_movement,
+            reset_on_submit=True,
+        ),
+        rx.el.div(
+            rx.foreach(ProductsState.stock_history, movement_row),
+            class_name="divide-y divide-gray-100 max-h-64 overflow-y-auto",
+        ),
+        class_name="border-t border-gray-100 pt-6 mt-6",
+    )
+
+
 def add_product_modal() -> rx.Component:
     return rx.dialog.root(
         rx.dialog.content(
@@ -422,6 +527,8 @@ def products_header() -> rx.Component:
                 ),
                 class_name="relative",
             ),
+            export_menu(ProductsState.export),
+            import_button("Products"),
             rx.el.button(
                 rx.icon("plus", size=18),
                 rx.el.span("Add Product"),
@@ -444,7 +551,7 @@ def products_view() -> rx.Component:
             ),
             rx.el.div(
                 rx.cond(
-                    ProductsState.products,
+                    ProductsState.has_rows,
                     product_details_panel(),
                     rx.el.div(
                         "No product selected",
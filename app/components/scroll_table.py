@@ -0,0 +1,63 @@
+import dataclasses
+from typing import Callable
+
+import reflex as rx
+from reflex.vars.base import Var
+from reflex.vars.object import ObjectVar
+
+from app.store.scroll_window import ROW_HEIGHT, VIEWPORT_ROWS
+
+
+@dataclasses.dataclass(frozen=True)
+class _ScrollTarget:
+    scrollTop: float = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class _ScrollEvent:
+    target: _ScrollTarget = _ScrollTarget()
+
+
+def _scroll_top(e: ObjectVar[_ScrollEvent]) -> tuple[Var[float]]:
+    return (e.target.scrollTop,)
+
+
+class ScrollArea(rx.el.Div):
+    """A div whose ``on_scroll`` reports its own ``scrollTop``."""
+
+    on_scroll: rx.EventHandler[_scroll_top]
+
+
+def virtual_table(
+    head: rx.Component,
+    rows: Var,
+    row: Callable[[Var], rx.Component],
+    top_pad: Var,
+    bottom_pad: Var,
+    on_scroll: rx.EventHandler,
+    key: Var,
+) -> rx.Component:
+    """A scrolling table that renders only the rows its state holds.
+
+    Spacer rows stand in for everything above and below ``rows`` so the
+    scrollbar spans the whole result; rows are forced to ``ROW_HEIGHT`` to
+    keep the spacers exact. Scroll positions are debounced before
+    ``on_scroll`` asks the server for more chunks. Changing ``key`` (the
+    search query) remounts the area back at the top.
+    """
+    return ScrollArea.create(
+        rx.el.table(
+            head,
+            rx.el.tbody(
+                rx.el.tr(style={"height": f"{top_pad}px"}),
+                rx.foreach(rows, row),
+                rx.el.tr(style={"height": f"{bottom_pad}px"}),
+                class_name=f"divide-y divide-gray-100 bg-white [&>tr]:h-[{ROW_HEIGHT}px]",
+            ),
+            class_name="min-w-full divide-y divide-gray-200",
+        ),
+        on_scroll=on_scroll.debounce(50),
+        key=key,
+        class_name="overflow-y-auto [&_thead]:sticky [&_thead]:top-0 [&_thead]:z-10 [&_thead]:bg-white",
+        style={"height": f"{(VIEWPORT_ROWS + 1) * ROW_HEIGHT}px"},
+    )
@@ -2,9 +2,9 @@ import reflex as rx
 from app.states.nav_state import NavState
 
 
-def sidebar_item(item: dict) -> rx.Component:
+def sidebar_item(item: dict, active_route: str) -> rx.Component:
     """Renders a single sidebar navigation item."""
-    is_active = NavState.active_item == item["label"]
+    is_active = item["value"] == active_route
     return rx.el.button(
         rx.icon(
             item["icon"],
@@ -21,7 +21,7 @@ def sidebar_item(item: dict) -> rx.Component:
                 "font-medium text-gray-600 group-hover:text-gray-900",
             ),
         ),
-        on_click=lambda: NavState.set_active(item["label"]),
+        on_click=rx.redirect(item["value"]),
         class_name=rx.cond(
             is_active,
             "flex items-center gap-3 px-4 py-3 bg-teal-50 border-r-4 border-teal-600 w-full transition-all duration-200 cursor-pointer relative",
@@ -30,8 +30,8 @@ def sidebar_item(item: dict) -> rx.Component:
     )
 
 
-def sidebar() -> rx.Component:
-    """The main sidebar component."""
+def sidebar(active_route: str) -> rx.Component:
+    """The main sidebar component, highlighting the page at ``active_route``."""
     return rx.el.aside(
         rx.el.div(
             rx.el.div(
@@ -45,7 +45,9 @@ def sidebar() -> rx.Component:
             class_name="flex items-center gap-3 px-6 py-8 mb-2",
         ),
         rx.el.nav(
-            rx.foreach(NavState.menu_items, sidebar_item),
+            rx.foreach(
+                NavState.menu_items, lambda item: sidebar_item(item, active_route)
+            ),
             class_name="flex flex-col gap-1 py-2 flex-1 w-full",
         ),
         rx.el.div(
@@ -60,7 +62,6 @@ def sidebar() -> rx.Component:
                     "Settings",
                     class_name="font-medium text-gray-600 group-hover:text-gray-900",
                 ),
-                on_click=lambda: NavState.set_active("Settings"),
                 class_name="flex items-center gap-3 px-4 py-3 hover:bg-gray-50 w-full transition-all duration-200 group cursor-pointer",
             ),
             rx.el.button(
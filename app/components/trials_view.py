@@ -1,5 +1,7 @@
 import reflex as rx
 from app.states.trials_state import TrialsState, Trial
+from app.components.scroll_table import virtual_table
+from app.components.export_menu import export_menu
 
 
 def trial_status_badge(status: str) -> rx.Component:
@@ -92,72 +94,105 @@ def trial_row(trial: Trial) -> rx.Component:
 def trials_pagination() -> rx.Component:
     return rx.el.div(
         rx.el.p(
-            TrialsState.showing_text, class_name="text-sm text-gray-500 font-medium"
+            rx.cond(
+                TrialsState.scroll_mode,
+                f"{TrialsState.total_items} entries",
+                TrialsState.showing_text,
+            ),
+            class_name="text-sm text-gray-500 font-medium",
         ),
         rx.el.div(
             rx.el.button(
-                "Previous",
-                on_click=TrialsState.prev_page,
-                disabled=TrialsState.page == 1,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
-            ),
-            rx.foreach(
-                TrialsState.page_numbers,
-                lambda p: rx.el.button(
-                    p,
-                    on_click=lambda: TrialsState.set_page(p),
-                    class_name=rx.cond(
-                        TrialsState.page == p,
-                        "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
-                        "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
-                    ),
-                ),
-            ),
-            rx.el.button(
-                "Next",
-                on_click=TrialsState.next_page,
-                disabled=TrialsState.page == TrialsState.total_pages,
-                class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+                rx.cond(TrialsState.scroll_mode, "Pages", "Scroll"),
+                on_click=TrialsState.toggle_scroll_mode,
+                class_name="px-3 py-1 text-sm font-medium text-teal-600 hover:text-teal-700",
             ),
+            rx.cond(~TrialsState.scroll_mode, trials_page_buttons()),
             class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between px-6 py-4 border-t border-gray-100",
     )
 
 
+def trials_page_buttons() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            "Previous",
+            on_click=TrialsState.prev_page,
+            disabled=TrialsState.page == 1,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.foreach(
+            TrialsState.page_numbers,
+            lambda p: rx.el.button(
+                p,
+                on_click=lambda: TrialsState.set_page(p),
+                class_name=rx.cond(
+                    TrialsState.page == p,
+                    "w-8 h-8 flex items-center justify-center rounded-lg bg-teal-600 text-white text-sm font-medium shadow-sm",
+                    "w-8 h-8 flex items-center justify-center rounded-lg hover:bg-gray-100 text-gray-600 text-sm font-medium",
+                ),
+            ),
+        ),
+        rx.el.button(
+            "Next",
+            on_click=TrialsState.next_page,
+            disabled=TrialsState.page == TrialsState.total_pages,
+            class_name="px-3 py-1 text-sm font-medium text-gray-600 hover:text-gray-900 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def trials_table_head() -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            rx.el.th(
+                "ID",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider w-16",
+            ),
+            rx.el.th(
+                "Customer",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Product",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "End Date",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            rx.el.th(
+                "Status",
+                class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
+            ),
+            class_name="bg-gray-50/50",
+        )
+    )
+
+
 def trials_table() -> rx.Component:
     return rx.el.div(
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "ID",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider w-16",
-                    ),
-                    rx.el.th(
-                        "Customer",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Product",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "End Date",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    rx.el.th(
-                        "Status",
-                        class_name="px-6 py-3 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider",
-                    ),
-                    class_name="bg-gray-50/50",
-                )
+        rx.cond(
+            TrialsState.scroll_mode,
+            virtual_table(
+                trials_table_head(),
+                TrialsState.scroll_rows,
+                trial_row,
+                TrialsState.scroll_top_pad,
+                TrialsState.scroll_bottom_pad,
+                on_scroll=TrialsState.scroll_to,
+                key=TrialsState.search_query,
             ),
-            rx.el.tbody(
-                rx.foreach(TrialsState.current_page_trials, trial_row),
-                class_name="divide-y divide-gray-100 bg-white",
+            rx.el.table(
+                trials_table_head(),
+                rx.el.tbody(
+                    rx.foreach(TrialsState.current_page_trials, trial_row),
+                    class_name="divide-y divide-gray-100 bg-white",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
             ),
-            class_name="min-w-full divide-y divide-gray-200",
         ),
         trials_pagination(),
         class_name="bg-white rounded-2xl shadow-sm border border-gray-100 overflow-hidden flex flex-col justify-between h-full",
@@ -355,6 +390,7 @@ def trials_header() -> rx.Component:
                 ),
                 class_name="relative",
             ),
+            export_menu(TrialsState.export),
             rx.el.button(
                 rx.icon("plus", size=18),
                 rx.el.span("New Trial"),
@@ -377,7 +413,7 @@ def trials_view() -> rx.Component:
             ),
             rx.el.div(
                 rx.cond(
-                    TrialsState.trials,
+                    TrialsState.has_rows,
                     trial_details_panel(),
                     rx.el.div(
                         "No trial selected",
@@ -0,0 +1,72 @@
+import reflex as rx
+from typing import TypedDict
+from app.states.coupons_state import coupons_store
+from app.states.orders_state import order_columns, orders_store
+from app.states.products_state import products_store
+from app.states.trials_state import trials_store
+from app.store.aggregates import Aggregate
+from app.store.order_columns import DIMENSIONS
+
+kpis = (
+    Aggregate("revenue", orders_store, lambda order: order["total"]),
+    Aggregate.count(
+        "open_trials", trials_store, lambda t: t["status"] in ("Active", "Pending")
+    ),
+    Aggregate.count("active_coupons", coupons_store, lambda c: c["status"] == "Active"),
+    Aggregate.count("low_stock", products_store, lambda p: p["status"] == "Low Stock"),
+)
+
+
+class RevenueGroup(TypedDict):
+    key: str
+    revenue: float
+    units: int
+    orders: int
+    aov: float
+
+
+class AnalyticsState(rx.State):
+    dimension: str = "product"
+    dimensions: list[str] = list(DIMENSIONS)
+    _data_version: int = 0
+    _kpi_version: int = 0
+    _loaded: bool = False
+
+    def _sync_version(self):
+        if self._data_version != orders_store.version:
+            self._data_version = orders_store.version
+        kpi_version = sum(kpi.version for kpi in kpis)
+        if self._kpi_version != kpi_version:
+            self._kpi_version = kpi_version
+
+    @rx.var(deps=["_loaded", "_kpi_version"])
+    def kpis(self) -> dict[str, float]:
+        if not self._loaded:
+            return {}
+        return {kpi.name: round(kpi.value, 2) for kpi in kpis}
+
+    @rx.var(deps=["_loaded", "_data_version"])
+    def totals(self) -> dict[str, float]:
+        if not self._loaded:
+            return {}
+        return order_columns.totals()
+
+    @rx.var(deps=["_loaded", "_data_version"])
+    def groups(self) -> list[RevenueGroup]:
+        if not self._loaded:
+            return []
+        return order_columns.group_by(self.dimension)
+
+    @rx.event
+    def load(self):
+        """Read the aggregates in once the dashboard is visited."""
+        for kpi in kpis:
+            kpi.store.load()
+        self._loaded = True
+        self._sync_version()
+
+    @rx.event
+    def set_dimension(self, dimension: str):
+        if dimension in DIMENSIONS:
+            self.dimension = dimension
+        self._sync_version()
\ No newline at end of file
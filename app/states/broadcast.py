@@ -0,0 +1,18 @@
+import reflex as rx
+from reflex.state import _substate_key
+
+
+async def sync_sessions(app: rx.App, *state_classes: type[rx.State]):
+    """Push shared-store writes made outside an event to every connected tab.
+
+    Each state in ``state_classes`` re-syncs its store versions, so its
+    computed vars recompute and the resulting delta is emitted like the
+    end of an event.
+    """
+    if app.event_namespace is None:
+        return
+    for token in list(app.event_namespace.token_to_sid):
+        async with app.modify_state(_substate_key(token, state_classes[0])) as root:
+            for state_class in state_classes:
+                state = await root.get_state(state_class)
+                state._sync_version()
\ No newline at end of file
@@ -1,7 +1,11 @@
 import reflex as rx
-from typing import TypedDict
-import random
+from typing import ClassVar, Optional, TypedDict
 from datetime import datetime, timedelta
+from app.store.expiry import ExpiryScheduler, midnight_after
+from app.states.table_state import TableState
+from app.store.fixtures import fixture_seed
+from app.store.record_store import RecordStore
+from app.store.redemption import CouponRedeemer, coupon_status
 
 
 class Coupon(TypedDict):
@@ -14,128 +18,76 @@ class Coupon(TypedDict):
     status: str
 
 
-def _generate_sample_coupons() -> list[Coupon]:
-    codes = [
-        "BEAUTY20",
-        "GLOW15",
-        "SKINCARE10",
-        "FRAGRANCE25",
-        "LUXE50",
-        "MAKEUP15",
-        "HAIRCARE10",
-        "FIRSTORDER",
-        "VIPBEAUTY",
-        "SUMMERGLOW",
-        "HOLIDAYSCENT",
-        "FREESHIP",
-        "BDAYTREAT",
-        "LOYALTY20",
-    ]
-    types = ["Percentage", "Fixed Amount"]
-    statuses = ["Active", "Expired", "Exhausted"]
-    coupons = []
-    for i in range(25):
-        code_base = codes[i % len(codes)]
-        suffix = "" if i < len(codes) else str(random.randint(10, 99))
-        code = f"{code_base}{suffix}"
-        ctype = random.choice(types)
-        value = (
-            random.randint(5, 40) if ctype == "Percentage" else random.randint(10, 100)
-        )
-        limit = random.randint(50, 500)
-        used = random.randint(0, limit)
-        status = "Active"
-        expiry = datetime.now() + timedelta(days=random.randint(-60, 120))
-        if expiry < datetime.now():
-            status = "Expired"
-        elif used >= limit:
-            status = "Exhausted"
-        coupons.append(
-            {
-                "code": code,
-                "type": ctype,
-                "value": float(value),
-                "used": used,
-                "limit": limit,
-                "expiry_date": expiry.strftime("%Y-%m-%d"),
-                "status": status,
-            }
-        )
-    return coupons
-
-
-_initial_coupons = _generate_sample_coupons()
-
-
-class CouponsState(rx.State):
-    coupons: list[Coupon] = _initial_coupons
-    selected_code: str = _initial_coupons[0]["code"] if _initial_coupons else ""
-    search_query: str = ""
-    page: int = 1
-    items_per_page: int = 8
+def coupon_from_row(row: dict) -> Coupon:
+    """A coupon from an imported row; raises ValueError if it is invalid."""
+    code = str(row.get("code") or "").strip().upper()
+    if not code:
+        raise ValueError("code is required")
+    coupon_type = str(row.get("type") or "Percentage")
+    if coupon_type not in ("Percentage", "Fixed Amount"):
+        raise ValueError(f"unknown type {coupon_type!r}")
+    try:
+        value = float(row.get("value") or 0)
+        used = int(row.get("used") or 0)
+        limit = int(row.get("limit") or 100)
+    except ValueError:
+        raise ValueError("value, used and limit must be numbers")
+    expiry = str(
+        row.get("expiry_date")
+        or (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+    )
+    datetime.strptime(expiry, "%Y-%m-%d")
+    coupon: Coupon = {
+        "code": code,
+        "type": coupon_type,
+        "value": value,
+        "used": used,
+        "limit": limit,
+        "expiry_date": expiry,
+        "status": "Active",
+    }
+    coupon["status"] = coupon_status(coupon)
+    return coupon
+
+
+coupons_store: RecordStore[Coupon] = RecordStore(
+    "coupons", "code", fixture_seed("coupons"), search_fields=("code",)
+)
+coupon_redeemer = CouponRedeemer(coupons_store)
+
+
+def _coupon_deadline(coupon: Coupon) -> Optional[float]:
+    """Coupons expire at the midnight after their ``expiry_date``."""
+    if coupon["status"] == "Expired":
+        return None
+    return midnight_after(coupon["expiry_date"])
+
+
+coupon_expiry = ExpiryScheduler(coupons_store, _coupon_deadline, {"status": "Expired"})
+
+
+class CouponsState(TableState, rx.State):
+    _store: ClassVar[RecordStore] = coupons_store
+    _selection: ClassVar[str] = "selected_code"
+
+    selected_code: str = ""
     is_add_modal_open: bool = False
 
-    @rx.var
-    def filtered_coupons(self) -> list[Coupon]:
-        if not self.search_query:
-            return self.coupons
-        query = self.search_query.lower()
-        return [c for c in self.coupons if query in c["code"].lower()]
-
-    @rx.var
-    def total_items(self) -> int:
-        return len(self.filtered_coupons)
-
-    @rx.var
-    def total_pages(self) -> int:
-        return (self.total_items + self.items_per_page - 1) // self.items_per_page
-
-    @rx.var
+    @rx.var(deps=["_loaded", "_data_version"])
     def current_page_coupons(self) -> list[Coupon]:
-        start = (self.page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_coupons[start:end]
+        return self._page_rows()
 
-    @rx.var
+    @rx.var(deps=["_data_version"])
     def selected_coupon(self) -> Coupon:
-        for c in self.coupons:
-            if c["code"] == self.selected_code:
-                return c
-        return self.coupons[0] if self.coupons else {}
-
-    @rx.var
-    def showing_text(self) -> str:
-        if self.total_items == 0:
-            return "No entries found"
-        start = (self.page - 1) * self.items_per_page + 1
-        end = min(start + self.items_per_page - 1, self.total_items)
-        return f"Showing {start} - {end} from {self.total_items} entries"
-
-    @rx.var
-    def page_numbers(self) -> list[int]:
-        return list(range(1, self.total_pages + 1))
-
-    @rx.event
-    def set_search(self, query: str):
-        self.search_query = query
-        self.page = 1
+        return self._selected_row(self.selected_code)
 
-    @rx.event
-    def set_page(self, page: int):
-        self.page = page
-
-    @rx.event
-    def next_page(self):
-        if self.page < self.total_pages:
-            self.page += 1
-
-    @rx.event
-    def prev_page(self):
-        if self.page > 1:
-            self.page -= 1
+    @rx.var(deps=["_loaded", "_data_version", "_scroll_chunks"])
+    def scroll_rows(self) -> list[Coupon]:
+        return self._held_rows()
 
     @rx.event
     def select_coupon(self, code: str):
+        self._sync_version()
         self.selected_code = code
 
     @rx.event
@@ -147,6 +99,8 @@ class CouponsState(rx.State):
         code = form_data.get("code", "").upper()
         if not code:
             return rx.toast("Coupon Code is required")
+        if code in coupons_store:
+            return rx.toast("Coupon Code already exists")
         limit = int(form_data.get("limit", 100))
         value = float(form_data.get("value", 0))
         new_coupon: Coupon = {
@@ -158,7 +112,8 @@ class CouponsState(rx.State):
             "expiry_date": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
             "status": "Active",
         }
-        self.coupons.insert(0, new_coupon)
+        coupons_store.insert(new_coupon)
+        self._sync_version()
         self.selected_code = new_coupon["code"]
         self.is_add_modal_open = False
         rx.toast("Coupon added successfully")
@@ -167,21 +122,18 @@ class CouponsState(rx.State):
     def update_coupon(self, form_data: dict):
         limit = int(form_data.get("limit", 0))
         expiry = form_data.get("expiry_date", "")
-        updated_list = []
-        for c in self.coupons:
-            if c["code"] == self.selected_code:
-                updated_c = c.copy()
-                updated_c["limit"] = limit
-                updated_c["expiry_date"] = expiry
-                updated_list.append(updated_c)
-            else:
-                updated_list.append(c)
-        self.coupons = updated_list
+        with coupons_store.locked():
+            coupon = coupons_store.get(self.selected_code)
+            if coupon is not None:
+                changes = {"limit": limit, "expiry_date": expiry}
+                changes["status"] = coupon_status({**coupon, **changes})
+                coupons_store.update(self.selected_code, changes)
+        self._sync_version()
         rx.toast("Coupon updated successfully")
 
     @rx.event
     def delete_coupon(self):
-        self.coupons = [c for c in self.coupons if c["code"] != self.selected_code]
-        if self.coupons:
-            self.selected_code = self.coupons[0]["code"]
-        rx.toast("Coupon deleted")
\ No newline at end of file
+        coupons_store.remove(self.selected_code)
+        self.selected_code = coupons_store.first_key()
+        self._sync_version()
+        rx.toast("Coupon deleted")
@@ -1,7 +1,11 @@
 import reflex as rx
-from typing import TypedDict
-import random
-from datetime import datetime, timedelta
+from typing import ClassVar, TypedDict
+import uuid
+from datetime import datetime
+from app.store.dedupe import EmailIndex
+from app.states.table_state import TableState
+from app.store.fixtures import fixture_seed
+from app.store.record_store import RecordStore
 
 
 class Customer(TypedDict):
@@ -15,140 +19,63 @@ class Customer(TypedDict):
     created_date: str
 
 
-def _generate_sample_customers() -> list[Customer]:
-    names = [
-        "Alice Smith",
-        "Bob Johnson",
-        "Carol Williams",
-        "David Brown",
-        "Eva Davis",
-        "Frank Miller",
-        "Grace Wilson",
-        "Henry Moore",
-        "Isabel Taylor",
-        "Jack Anderson",
-        "Kelly Thomas",
-        "Liam Jackson",
-        "Mia White",
-        "Noah Harris",
-        "Olivia Martin",
-        "Peter Thompson",
-        "Quinn Garcia",
-        "Ryan Martinez",
-        "Sophia Robinson",
-        "Tyler Clark",
-    ]
-    companies = [
-        "Acme Corp",
-        "Globex",
-        "Soylent Corp",
-        "Initech",
-        "Umbrella Corp",
-        "Stark Ind",
-        "Wayne Ent",
-        "Cyberdyne",
-    ]
-    statuses = ["Active", "Inactive", "Pending", "VIP"]
-    customers = []
-    for i, name in enumerate(names):
-        first_name = name.split(" ")[0]
-        customers.append(
-            {
-                "id": f"CUST-{1000 + i}",
-                "name": name,
-                "email": f"{first_name.lower()}@example.com",
-                "phone": f"+1 (555) {random.randint(100, 999)}-{random.randint(1000, 9999)}",
-                "company": random.choice(companies),
-                "avatar": f"https://api.dicebear.com/9.x/notionists/svg?seed={name}",
-                "status": random.choice(statuses),
-                "created_date": (
-                    datetime.now() - timedelta(days=random.randint(1, 365))
-                ).strftime("%Y-%m-%d"),
-            }
-        )
-    return customers
-
-
-_initial_customers = _generate_sample_customers()
-
-
-class CustomersState(rx.State):
-    customers: list[Customer] = _initial_customers
-    selected_customer_id: str = (
-        _initial_customers[0]["id"] if _initial_customers else ""
-    )
-    search_query: str = ""
-    page: int = 1
-    items_per_page: int = 7
+def customer_from_row(row: dict) -> Customer:
+    """A customer from an imported row; raises ValueError if it is invalid."""
+    name = str(row.get("name") or "").strip()
+    email = str(row.get("email") or "").strip()
+    if not name or not email:
+        raise ValueError("name and email are required")
+    if "@" not in email:
+        raise ValueError(f"invalid email {email!r}")
+    return {
+        "id": str(row.get("id") or f"CUST-{uuid.uuid4().hex[:10].upper()}"),
+        "name": name,
+        "email": email,
+        "phone": str(row.get("phone") or ""),
+        "company": str(row.get("company") or ""),
+        "avatar": str(
+            row.get("avatar")
+            or f"https://api.dicebear.com/9.x/notionists/svg?seed={name}"
+        ),
+        "status": str(row.get("status") or "Active"),
+        "created_date": str(
+            row.get("created_date") or datetime.now().strftime("%Y-%m-%d")
+        ),
+    }
+
+
+customers_store: RecordStore[Customer] = RecordStore(
+    "customers",
+    "id",
+    fixture_seed("customers"),
+    search_fields=("name", "email", "company"),
+)
+customer_emails = EmailIndex(customers_store)
+
+
+class CustomersState(TableState, rx.State):
+    _store: ClassVar[RecordStore] = customers_store
+    _selection: ClassVar[str] = "selected_customer_id"
+
+    selected_customer_id: str = ""
     is_add_modal_open: bool = False
+    items_per_page: int = 7
 
-    @rx.var
-    def filtered_customers(self) -> list[Customer]:
-        if not self.search_query:
-            return self.customers
-        query = self.search_query.lower()
-        return [
-            c
-            for c in self.customers
-            if query in c["name"].lower()
-            or query in c["email"].lower()
-            or query in c["company"].lower()
-        ]
-
-    @rx.var
-    def total_items(self) -> int:
-        return len(self.filtered_customers)
-
-    @rx.var
-    def total_pages(self) -> int:
-        return (self.total_items + self.items_per_page - 1) // self.items_per_page
-
-    @rx.var
+    @rx.var(deps=["_loaded", "_data_version"])
     def current_page_customers(self) -> list[Customer]:
-        start = (self.page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_customers[start:end]
+        return self._page_rows()
 
-    @rx.var
+    @rx.var(deps=["_data_version"])
     def selected_customer(self) -> Customer:
-        for c in self.customers:
-            if c["id"] == self.selected_customer_id:
-                return c
-        return self.customers[0] if self.customers else {}
-
-    @rx.var
-    def showing_text(self) -> str:
-        if self.total_items == 0:
-            return "No entries found"
-        start = (self.page - 1) * self.items_per_page + 1
-        end = min(start + self.items_per_page - 1, self.total_items)
-        return f"Showing {start} - {end} from {self.total_items} entries"
-
-    @rx.var
-    def page_numbers(self) -> list[int]:
-        return list(range(1, self.total_pages + 1))
+        return self._selected_row(self.selected_customer_id)
 
-    @rx.event
-    def set_search(self, query: str):
-        self.search_query = query
-        self.page = 1
-
-    @rx.event
-    def set_page(self, page: int):
-        self.page = page
-
-    @rx.event
-    def next_page(self):
-        if self.page < self.total_pages:
-            self.page += 1
-
-    @rx.event
-    def prev_page(self):
-        if self.page > 1:
-            self.page -= 1
+    @rx.var(deps=["_loaded", "_data_version", "_scroll_chunks"])
+    def scroll_rows(self) -> list[Customer]:
+        return self._held_rows()
 
     @rx.event
     def select_customer(self, customer_id: str):
+        self._sync_version()
         self.selected_customer_id = customer_id
 
     @rx.event
@@ -161,8 +88,12 @@ class CustomersState(rx.State):
         email = form_data.get("email", "")
         if not name or not email:
             return rx.toast("Name and Email are required")
+        existing = customer_emails.find(email)
+        if existing is not None:
+            return rx.toast(f"{existing['name']} already uses {existing['email']}")
+        customer_id = customers_store.next_key("CUST-", 2000)
         new_customer: Customer = {
-            "id": f"CUST-{random.randint(2000, 9999)}",
+            "id": customer_id,
             "name": name,
             "email": email,
             "phone": form_data.get("phone", ""),
@@ -171,29 +102,21 @@ class CustomersState(rx.State):
             "status": "Active",
             "created_date": datetime.now().strftime("%Y-%m-%d"),
         }
-        self.customers.insert(0, new_customer)
+        customers_store.insert(new_customer)
+        self._sync_version()
         self.is_add_modal_open = False
         self.selected_customer_id = new_customer["id"]
         rx.toast("Customer added successfully")
 
     @rx.event
     def update_customer(self, form_data: dict):
-        updated_customers = []
-        for c in self.customers:
-            if c["id"] == self.selected_customer_id:
-                updated_c = c.copy()
-                updated_c.update(form_data)
-                updated_customers.append(updated_c)
-            else:
-                updated_customers.append(c)
-        self.customers = updated_customers
+        customers_store.update(self.selected_customer_id, form_data)
+        self._sync_version()
         rx.toast("Customer updated successfully")
 
     @rx.event
     def delete_customer(self):
-        self.customers = [
-            c for c in self.customers if c["id"] != self.selected_customer_id
-        ]
-        if self.customers:
-            self.selected_customer_id = self.customers[0]["id"]
+        customers_store.remove(self.selected_customer_id)
+        self.selected_customer_id = customers_store.first_key()
+        self._sync_version()
         rx.toast("Customer deleted")
\ No newline at end of file
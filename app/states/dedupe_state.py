@@ -0,0 +1,111 @@
+import asyncio
+
+import reflex as rx
+
+from app.states.customers_state import Customer, CustomersState, customers_store
+from app.states.orders_state import OrdersState, orders_store
+from app.states.trials_state import TrialsState, trials_store
+from app.store.dedupe import find_duplicates, merge_customers
+
+SHOWN_CLUSTERS = 50
+
+
+class DedupeState(rx.State):
+    """Duplicate customer review: a background scan, then merges.
+
+    The scan keeps the proposed clusters as ids in ``_clusters``; only the
+    first ``SHOWN_CLUSTERS`` are sent to the page, re-read from the store
+    so merged or deleted customers drop out.
+    """
+
+    is_open: bool = False
+    is_running: bool = False
+    scanned: int = 0
+    pairs: int = 0
+    _clusters: list[list[str]] = []
+    _version: int = 0
+
+    @rx.var(deps=["_clusters", "_version"])
+    def clusters(self) -> list[list[Customer]]:
+        shown = []
+        for ids in self._clusters:
+            rows = [row for key in ids if (row := customers_store.get(key))]
+            if len(rows) > 1:
+                shown.append(rows)
+                if len(shown) == SHOWN_CLUSTERS:
+                    break
+        return shown
+
+    @rx.var
+    def cluster_count(self) -> int:
+        return len(self._clusters)
+
+    @rx.event
+    def set_open(self, is_open: bool):
+        self.is_open = is_open
+
+    @rx.event(background=True)
+    async def scan(self):
+        async with self:
+            if self.is_running:
+                return
+            self.is_open = True
+            self.is_running = True
+        try:
+            found, stats = await asyncio.to_thread(
+                lambda: find_duplicates(customers_store.records)
+            )
+        finally:
+            async with self:
+                self.is_running = False
+        async with self:
+            self._clusters = [[row["id"] for row in cluster] for cluster in found]
+            self.scanned = stats["customers"]
+            self.pairs = stats["pairs"]
+
+    async def _merge(self, clusters: list[list[str]]):
+        rows = [
+            [row for key in ids if (row := customers_store.get(key))]
+            for ids in clusters
+        ]
+        moved = await asyncio.to_thread(
+            merge_customers,
+            [cluster for cluster in rows if len(cluster) > 1],
+            customers_store,
+            orders_store,
+            trials_store,
+        )
+        async with self:
+            merged = {key for ids in clusters for key in ids}
+            self._clusters = [
+                ids for ids in self._clusters if not merged.intersection(ids)
+            ]
+            self._version += 1
+            for view_state in (CustomersState, OrdersState, TrialsState):
+                (await self.get_state(view_state))._sync_version()
+        return rx.toast(
+            f"Merged {moved['customers']} duplicates, moved {moved['orders']} "
+            f"orders and {moved['trials']} trials"
+        )
+
+    @rx.event(background=True)
+    async def merge(self, index: int):
+        async with self:
+            clusters = self.clusters
+            if self.is_running or index >= len(clusters):
+                return
+            ids = [[row["id"] for row in clusters[index]]]
+        yield await self._merge(ids)
+
+    @rx.event(background=True)
+    async def merge_all(self):
+        async with self:
+            if self.is_running:
+                return
+            self.is_running = True
+            ids = list(self._clusters)
+        try:
+            yield await self._merge(ids)
+        finally:
+            async with self:
+                self.is_running = False
\ No newline at end of file
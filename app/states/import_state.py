@@ -0,0 +1,100 @@
+import asyncio
+import os
+import uuid
+
+import reflex as rx
+
+from app.states.coupons_state import CouponsState, coupon_from_row, coupons_store
+from app.states.customers_state import (
+    CustomersState,
+    customer_from_row,
+    customers_store,
+)
+from app.states.products_state import ProductsState, product_from_row, products_store
+from app.store.bulk_import import format_of, import_records, read_rows
+
+IMPORTERS = {
+    "Customers": (customers_store, customer_from_row, CustomersState),
+    "Products": (products_store, product_from_row, ProductsState),
+    "Coupons": (coupons_store, coupon_from_row, CouponsState),
+}
+SHOWN_ERRORS = 50
+
+
+class ImportState(rx.State):
+    """Bulk CSV/JSONL import into one of the ``IMPORTERS`` stores.
+
+    The upload is spooled to the upload directory, then a background task
+    streams it through ``import_records`` and reports progress after every
+    committed batch.
+    """
+
+    entity: str = ""
+    is_open: bool = False
+    is_running: bool = False
+    filename: str = ""
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[str] = []
+
+    @rx.event
+    def open_import(self, entity: str):
+        if not self.is_running:
+            self.entity = entity
+            self.filename = ""
+            self.rows = self.imported = self.failed = 0
+            self.errors = []
+        self.is_open = True
+
+    @rx.event
+    def set_open(self, is_open: bool):
+        self.is_open = is_open
+
+    @rx.event
+    async def handle_upload(self, files: list[rx.UploadFile]):
+        if self.is_running or not files:
+            return
+        upload = files[0]
+        name = upload.name or ""
+        fmt = format_of(name)
+        if fmt is None:
+            return rx.toast("Upload a .csv or .jsonl file")
+        path = rx.get_upload_dir() / f"import-{uuid.uuid4().hex}.{fmt}"
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        out = await asyncio.to_thread(path.open, "wb")
+        try:
+            while chunk := await upload.read(1 << 20):
+                await asyncio.to_thread(out.write, chunk)
+        finally:
+            await asyncio.to_thread(out.close)
+        self.filename = name
+        self.rows = self.imported = self.failed = 0
+        self.errors = []
+        self.is_running = True
+        return ImportState.run_import(str(path), fmt)
+
+    @rx.event(background=True)
+    async def run_import(self, path: str, fmt: str):
+        store, build, view_state = IMPORTERS[self.entity]
+        try:
+            stream = await asyncio.to_thread(open, path, "rb")
+            try:
+                reports = import_records(store, read_rows(stream, fmt), build)
+                while report := await asyncio.to_thread(next, reports, None):
+                    async with self:
+                        self.rows = report.rows
+                        self.imported = report.imported
+                        self.failed = report.failed
+                        self.errors = [
+                            f"Line {line}: {message}"
+                            for line, message in report.errors[:SHOWN_ERRORS]
+                        ]
+            finally:
+                await asyncio.to_thread(stream.close)
+        finally:
+            await asyncio.to_thread(os.remove, path)
+            async with self:
+                self.is_running = False
+                (await self.get_state(view_state))._sync_version()
+        yield rx.toast(f"Imported {self.imported} rows, {self.failed} failed")
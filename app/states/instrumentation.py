@@ -0,0 +1,176 @@
+import dataclasses
+import functools
+import inspect
+import os
+import random
+import time
+
+import reflex as rx
+from reflex.event import Event, EventHandler
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+from reflex.utils.format import json_dumps
+
+from app.store.metrics import BYTES_BUCKETS, registry
+
+event_seconds = registry.histogram(
+    "admin_event_handler_seconds",
+    "Time spent in each event handler, background handlers included.",
+    ("event",),
+)
+event_exceptions = registry.counter(
+    "admin_event_exceptions",
+    "Exceptions raised by each event handler, by exception type.",
+    ("event", "exception"),
+)
+delta_bytes = registry.histogram(
+    "admin_event_delta_bytes",
+    "Serialized size of a random sample of the state deltas sent for an event.",
+    ("event",),
+    BYTES_BUCKETS,
+)
+recomputes = registry.counter(
+    "admin_computed_var_recomputes",
+    "Computed vars recomputed into the deltas of each event.",
+    ("event",),
+)
+var_recomputes = registry.counter(
+    "admin_computed_var_recomputes_by_var",
+    "Times each computed var was recomputed into a delta.",
+    ("state", "var"),
+)
+
+
+def _timed(fn, label: str):
+    """``fn`` recording its duration and exceptions under ``label``.
+
+    Coroutines and generators are timed until they finish, so a background
+    handler counts its whole run, waits for the state lock included.
+    """
+
+    def failed(error: Exception):
+        event_exceptions.inc(label, type(error).__name__)
+
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                async for update in fn(*args, **kwargs):
+                    yield update
+            except Exception as error:
+                failed(error)
+                raise
+            finally:
+                event_seconds.observe(time.perf_counter() - start, label)
+
+    elif inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as error:
+                failed(error)
+                raise
+            finally:
+                event_seconds.observe(time.perf_counter() - start, label)
+
+    elif inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return (yield from fn(*args, **kwargs))
+            except Exception as error:
+                failed(error)
+                raise
+            finally:
+                event_seconds.observe(time.perf_counter() - start, label)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as error:
+                failed(error)
+                raise
+            finally:
+                event_seconds.observe(time.perf_counter() - start, label)
+
+    return wrapper
+
+
+class EventMetrics(Middleware):
+    """Times every event handler of ``state_classes`` and sizes their deltas.
+
+    Each handler is swapped for a timing wrapper once, when the middleware
+    is created; the backend looks handlers up by name, so components built
+    from the originals keep working. After each update of one of these
+    events the delta is serialized once more to measure it, and the
+    computed vars in it are counted: Reflex sends a computed var exactly
+    when it was recomputed. Events of other states are not recorded.
+
+    Serializing a delta costs about as much as the rest of the bookkeeping
+    together, so only one update in ``size_every`` (on average, picked at
+    random) is sized; ``ADMIN_METRICS_SIZE_EVERY`` sets the default. The
+    updates a background handler sends from ``async with self`` bypass the
+    middleware and are neither sized nor counted.
+    """
+
+    def __init__(self, *state_classes: type[rx.State], size_every: int = 0):
+        self.size_every = size_every or int(
+            os.environ.get("ADMIN_METRICS_SIZE_EVERY", "8")
+        )
+        self._labels: dict[str, str] = {}
+        # Delta key of each computed var, per state full name.
+        self._computed: dict[str, dict[str, str]] = {}
+        for state_cls in state_classes:
+            full_name = state_cls.get_full_name()
+            self._labels[full_name] = state_cls.__name__
+            self._computed[full_name] = {
+                getattr(state_cls, name)._js_expr.rpartition(".")[2]: name
+                for name in state_cls.computed_vars
+            }
+            for name, handler in list(state_cls.event_handlers.items()):
+                if type(handler) is not EventHandler:
+                    continue  # e.g. the built-in ``setvar``
+                label = f"{state_cls.__name__}.{name}"
+                timed: EventHandler = dataclasses.replace(
+                    handler, fn=_timed(handler.fn, label)
+                )
+                state_cls.event_handlers[name] = timed
+                setattr(state_cls, name, timed)
+
+    async def preprocess(
+        self, app: rx.App, state: BaseState, event: Event
+    ) -> StateUpdate | None:
+        return None
+
+    async def postprocess(
+        self, app: rx.App, state: BaseState, event: Event, update: StateUpdate
+    ) -> StateUpdate:
+        state_name, _, handler = event.name.rpartition(".")
+        owner = self._labels.get(state_name)
+        if owner is None or not update.delta:
+            return update
+        label = f"{owner}.{handler}"
+        if random.random() * self.size_every < 1:
+            delta_bytes.observe(len(json_dumps(update.delta)), label)
+        recomputed = 0
+        for name, delta in update.delta.items():
+            computed = self._computed.get(name)
+            if computed is None:
+                continue
+            for key in delta.keys() & computed.keys():
+                var_recomputes.inc(self._labels[name], computed[key])
+                recomputed += 1
+        if recomputed:
+            recomputes.inc(label, amount=recomputed)
+        return update
\ No newline at end of file
@@ -1,46 +1,85 @@
 import reflex as rx
 
+from app.states.coupons_state import CouponsState, coupons_store
+from app.states.customers_state import CustomersState, customers_store
+from app.states.orders_state import OrdersState, orders_store
+from app.states.products_state import ProductsState, products_store
+from app.states.trials_state import TrialsState, trials_store
+from app.store.global_search import GlobalSearch, SearchGroup, SearchSource
+
+global_search = GlobalSearch(
+    [
+        SearchSource(
+            "Customers", "users", customers_store, "name", ("email", "company")
+        ),
+        SearchSource(
+            "Orders",
+            "shopping-cart",
+            orders_store,
+            "id",
+            ("product_name", "customer_name"),
+        ),
+        SearchSource("Products", "package", products_store, "name", ("category", "id")),
+        SearchSource(
+            "Trials", "timer", trials_store, "customer_name", ("product_name", "status")
+        ),
+        SearchSource("Coupons", "ticket", coupons_store, "code", ("type", "status")),
+    ]
+)
+
+# The view state of each entity and its page.
+_SELECTIONS = {
+    "Customers": (CustomersState, "/customers"),
+    "Orders": (OrdersState, "/orders"),
+    "Products": (ProductsState, "/products"),
+    "Trials": (TrialsState, "/trials"),
+    "Coupons": (CouponsState, "/coupons"),
+}
+
 
 class NavState(rx.State):
-    active_item: str = "Customers"
     search_query: str = ""
+    search_results: list[SearchGroup] = []
+    is_searching: bool = False
     menu_items: list[dict[str, str]] = [
-        {"label": "Customers", "icon": "users", "value": "customers"},
-        {"label": "Orders", "icon": "shopping-cart", "value": "orders"},
-        {"label": "Products", "icon": "package", "value": "products"},
-        {"label": "Trials", "icon": "timer", "value": "trials"},
-        {"label": "Coupons", "icon": "ticket", "value": "coupons"},
+        {"label": "Dashboard", "icon": "layout-dashboard", "value": "/"},
+        {"label": "Customers", "icon": "users", "value": "/customers"},
+        {"label": "Orders", "icon": "shopping-cart", "value": "/orders"},
+        {"label": "Products", "icon": "package", "value": "/products"},
+        {"label": "Trials", "icon": "timer", "value": "/trials"},
+        {"label": "Coupons", "icon": "ticket", "value": "/coupons"},
     ]
 
+    @rx.event(background=True)
+    async def set_search(self, query: str):
+        async with self:
+            self.search_query = query
+            self.is_searching = True
+            session = self.router.session.client_token
+        groups = await global_search.search(session, query)
+        if groups is None:
+            return
+        async with self:
+            if self.search_query == query:
+                self.search_results = groups
+                self.is_searching = False
+
+    def _reset_search(self):
+        global_search.cancel(self.router.session.client_token)
+        self.search_query = ""
+        self.search_results = []
+        self.is_searching = False
+
     @rx.event
-    def set_active(self, item_label: str):
-        self.active_item = item_label
+    def clear_search(self):
+        self._reset_search()
+        return rx.set_value("global-search", "")
 
     @rx.event
-    async def set_search(self, query: str):
-        self.search_query = query
-        if self.active_item == "Customers":
-            from app.states.customers_state import CustomersState
-
-            state = await self.get_state(CustomersState)
-            state.search_query = query
-        elif self.active_item == "Orders":
-            from app.states.orders_state import OrdersState
-
-            state = await self.get_state(OrdersState)
-            state.search_query = query
-        elif self.active_item == "Products":
-            from app.states.products_state import ProductsState
-
-            state = await self.get_state(ProductsState)
-            state.search_query = query
-        elif self.active_item == "Trials":
-            from app.states.trials_state import TrialsState
-
-            state = await self.get_state(TrialsState)
-            state.search_query = query
-        elif self.active_item == "Coupons":
-            from app.states.coupons_state import CouponsState
-
-            state = await self.get_state(CouponsState)
-            state.search_query = query
\ No newline at end of file
+    async def open_result(self, entity: str, key: str):
+        view_state, route = _SELECTIONS[entity]
+        state = await self.get_state(view_state)
+        state._sync_version()
+        setattr(state, view_state._selection, key)
+        self._reset_search()
+        return [rx.set_value("global-search", ""), rx.redirect(route)]
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""Per-session state sizes, budget warnings and a report of the largest.
+
+Run ``python -m app.states.state_profiler [--url http://localhost:8000]
+[--top 10] [--cached]`` against a running backend to print its report.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Optional
+
+import reflex as rx
+from reflex.state import BaseState
+from reflex.utils import console
+
+from app.store.metrics import registry
+
+SESSION_BUDGET = int(os.environ.get("ADMIN_SESSION_BUDGET_KB", "512")) * 1024
+PROFILE_INTERVAL = float(os.environ.get("ADMIN_STATE_PROFILE_INTERVAL", "60"))
+TOP = 10
+
+state_bytes = registry.gauge(
+    "admin_session_state_bytes",
+    "Largest size of each state class in any one session at the last profile.",
+    ("state", "measure"),
+)
+session_bytes = registry.gauge(
+    "admin_session_bytes",
+    "Largest and total state size over the sessions at the last profile.",
+    ("stat", "measure"),
+)
+profiled_sessions = registry.gauge(
+    "admin_profiled_sessions", "Sessions held by this process at the last profile."
+)
+over_budget_sessions = registry.gauge(
+    "admin_sessions_over_budget", "Sessions over the state budget at the last profile."
+)
+
+
+@dataclass(frozen=True)
+class StateSize:
+    session: str
+    state: str
+    serialized: int
+    in_memory: int
+
+
+def deep_size(obj: Any, seen: set[int]) -> int:
+    """Bytes of ``obj`` and of everything it reaches that is not in ``seen``.
+
+    Classes, functions, modules and other states are not followed.
+    """
+    size = 0
+    pending = [obj]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or isinstance(
+            current, (type, FunctionType, ModuleType, BaseState)
+        ):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            pending += current.keys()
+            pending += current.values()
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pending += current
+        elif hasattr(current, "__dict__"):
+            pending.append(vars(current))
+    return size
+
+
+def measure_session(session: str, root: BaseState) -> list[StateSize]:
+    """The size of every state instance in one session's tree.
+
+    ``serialized`` is the pickle the disk and redis state managers store;
+    ``in_memory`` follows the instance's own vars, cached computed values
+    included. Objects the session shares with others, such as rows of the
+    shared stores held in a cached page, count towards every session
+    holding them, but only once per session.
+    """
+    seen: set[int] = set()
+    # ``__getstate__`` builds a new dict; keep each alive so ids stay unique.
+    own_vars = []
+    sizes = []
+    pending = [root]
+    while pending:
+        state = pending.pop()
+        pending += state.substates.values()
+        own_vars.append(state.__getstate__())
+        sizes.append(
+            StateSize(
+                session,
+                type(state).__name__,
+                len(state._serialize()),
+                deep_size(own_vars[-1], seen),
+            )
+        )
+    return sizes
+
+
+class StateProfiler:
+    """Measures the sessions held in this process and warns about large ones.
+
+    ``run`` profiles every ``PROFILE_INTERVAL`` seconds (default 60), one
+    session at a time on the event loop so no handler mutates a state while
+    it is measured, yielding between sessions. A session is over
+    ``budget`` when either its serialized or its in-memory total is; it is
+    warned about once, and again only after dropping back under. The last
+    profile sets the ``admin_session_*`` gauges and is served as
+    ``report``. With the redis state manager the states are not held in
+    this process and nothing is profiled.
+    """
+
+    def __init__(self, budget: int = SESSION_BUDGET):
+        self.budget = budget
+        self.sizes: list[StateSize] = []
+        self.measured_at = 0.0
+        self._sessions: Optional[Callable[[], dict[str, BaseState]]] = None
+        self._warned: set[str] = set()
+
+    async def profile(self, sessions: dict[str, BaseState]) -> list[StateSize]:
+        sizes = []
+        for session, root in list(sessions.items()):
+            sizes += measure_session(session, root)
+            await asyncio.sleep(0)
+        self.sizes = sizes
+        self.measured_at = time.time()
+        self._publish()
+        self._warn()
+        return sizes
+
+    async def refresh(self) -> bool:
+        """Profile now, if ``run`` has been told where the sessions are."""
+        if self._sessions is None:
+            return False
+        await self.profile(self._sessions())
+        return True
+
+    def session_totals(self) -> dict[str, tuple[int, int]]:
+        """Serialized and in-memory bytes of each session."""
+        totals: dict[str, tuple[int, int]] = {}
+        for size in self.sizes:
+            serialized, in_memory = totals.get(size.session, (0, 0))
+            totals[size.session] = (
+                serialized + size.serialized,
+                in_memory + size.in_memory,
+            )
+        return totals
+
+    def over_budget(self) -> dict[str, tuple[int, int]]:
+        return {
+            session: total
+            for session, total in self.session_totals().items()
+            if max(total) > self.budget
+        }
+
+    def _publish(self):
+        largest: dict[tuple[str, str], int] = {}
+        for size in self.sizes:
+            for measure in ("serialized", "in_memory"):
+                key = (size.state, measure)
+                largest[key] = max(largest.get(key, 0), getattr(size, measure))
+        state_bytes.clear()
+        for (state, measure), value in largest.items():
+            state_bytes.set(value, state, measure)
+        totals = list(self.session_totals().values())
+        for index, measure in enumerate(("serialized", "in_memory")):
+            values = [total[index] for total in totals]
+            session_bytes.set(max(values, default=0), "max", measure)
+            session_bytes.set(sum(values), "total", measure)
+        profiled_sessions.set(len(totals))
+        over_budget_sessions.set(len(self.over_budget()))
+
+    def _warn(self):
+        over = self.over_budget()
+        for session in over.keys() - self._warned:
+            serialized, in_memory = over[session]
+            largest = max(
+                (s for s in self.sizes if s.session == session),
+                key=lambda s: max(s.serialized, s.in_memory),
+            )
+            console.warn(
+                f"Session {session[:8]} holds {serialized / 1024:.0f} KB serialized, "
+                f"{in_memory / 1024:.0f} KB in memory (budget "
+                f"{self.budget / 1024:.0f} KB); largest is {largest.state}."
+            )
+        self._warned = set(over)
+
+    def report(self, top: int = TOP) -> dict:
+        totals = self.session_totals()
+        largest = sorted(totals.items(), key=lambda item: -max(item[1]))[:top]
+        return {
+            "measured_at": self.measured_at,
+            "budget": self.budget,
+            "sessions": len(totals),
+            "over_budget": len(self.over_budget()),
+            "top_sessions": [
+                {"session": session, "serialized": s, "in_memory": m}
+                for session, (s, m) in largest
+            ],
+            "top_states": [
+                asdict(size)
+                for size in sorted(
+                    self.sizes, key=lambda s: -max(s.serialized, s.in_memory)
+                )[:top]
+            ],
+        }
+
+    async def run(
+        self,
+        sessions: Callable[[], dict[str, BaseState]],
+        interval: float = PROFILE_INTERVAL,
+    ):
+        """App lifespan task profiling ``sessions()`` every ``interval`` seconds."""
+        self._sessions = sessions
+        while True:
+            await asyncio.sleep(interval)
+            await self.profile(sessions())
+
+
+state_profiler = StateProfiler()
+
+
+def held_sessions(app: rx.App) -> dict[str, BaseState]:
+    """The root state of each session ``app`` keeps in this process."""
+    return getattr(app.state_manager, "states", {})
+
+
+def _print_report(report: dict):
+    age = time.time() - report["measured_at"]
+    print(
+        f"{report['sessions']} sessions, {report['over_budget']} over the "
+        f"{report['budget'] / 1024:.0f} KB budget (measured {age:.0f}s ago)"
+    )
+    print(f"\n{'session':>10} {'serialized KB':>14} {'in memory KB':>13}")
+    for row in report["top_sessions"]:
+        print(
+            f"{row['session'][:8]:>10} {row['serialized'] / 1024:>14.1f} "
+            f"{row['in_memory'] / 1024:>13.1f}"
+        )
+    print(f"\n{'session':>10} {'state':>20} {'serialized KB':>14} {'in memory KB':>13}")
+    for row in report["top_states"]:
+        print(
+            f"{row['session'][:8]:>10} {row['state']:>20} "
+            f"{row['serialized'] / 1024:>14.1f} {row['in_memory'] / 1024:>13.1f}"
+        )
+
+
+def main():
+    import httpx
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--top", type=int, default=TOP)
+    parser.add_argument(
+        "--cached", action="store_true", help="show the last periodic profile"
+    )
+    args = parser.parse_args()
+    params = {"top": args.top, "fresh": int(not args.cached)}
+    response = httpx.get(f"{args.url}/state-profile", params=params, timeout=60)
+    response.raise_for_status()
+    _print_report(response.json())
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,197 @@
+import reflex as rx
+from typing import Any, ClassVar
+from app.store.export import export_url
+from app.store.paging import page_window
+from app.store.record_store import RecordStore
+from app.store.scroll_window import (
+    chunk_rows,
+    scroll_pads,
+    scroll_row_top,
+    stream_chunks,
+)
+
+
+class TableState(rx.State, mixin=True):
+    """Search, paging and scrolling over one shared ``RecordStore``.
+
+    A section's state mixes this in, points ``_store`` at its table and
+    ``_selection`` at the var holding the selected key, and keeps only its
+    typed row vars (built on ``_page_rows``, ``_held_rows`` and
+    ``_selected_row``) and its entity handlers. Sessions hold the view
+    (query, page anchor, held scroll chunks) and the store versions their
+    computed vars depend on; rows are read from the store.
+    """
+
+    _store: ClassVar[RecordStore]
+    _selection: ClassVar[str]
+
+    search_query: str = ""
+    page: int = 1
+    items_per_page: int = 8
+    _data_version: int = 0
+    _shape_version: int = 0
+    _anchor: int = 0
+    scroll_mode: bool = False
+    scroll_offset: int = 0
+    _scroll_chunks: int = 0
+    _scroll_top: float = 0
+    _loaded: bool = False
+
+    def _sync_version(self):
+        if self._data_version != self._store.version:
+            self._data_version = self._store.version
+        if self._shape_version != self._store.shape_version:
+            self._shape_version = self._store.shape_version
+
+    def _session(self) -> str:
+        return self.router.session.client_token
+
+    def _reset_scroll(self):
+        self.scroll_offset = 0
+        self._scroll_chunks = int(self.scroll_mode)
+        self._scroll_top = 0
+
+    def _apply_search(self, query: str):
+        self._sync_version()
+        self.search_query = query
+        self.page = 1
+        self._anchor = 0
+        self._reset_scroll()
+
+    def _page_rows(self) -> list:
+        if not self._loaded:
+            return []
+        return self._store.window(
+            self._anchor, self.items_per_page, self.search_query, self._session()
+        )
+
+    def _held_rows(self) -> list:
+        if not self._loaded:
+            return []
+        return chunk_rows(
+            self._store,
+            self.scroll_offset,
+            self._scroll_chunks,
+            self.search_query,
+            self._session(),
+        )
+
+    def _selected_row(self, key: str) -> Any:
+        return self._store.get(key) or self._store.first() or {}
+
+    @rx.var(deps=["_loaded", "_shape_version"])
+    def has_rows(self) -> bool:
+        if not self._loaded:
+            return False
+        return len(self._store) > 0
+
+    @rx.var(deps=["_loaded", "_shape_version"])
+    def total_items(self) -> int:
+        if not self._loaded:
+            return 0
+        return self._store.count(self.search_query, self._session())
+
+    @rx.var
+    def total_pages(self) -> int:
+        return (self.total_items + self.items_per_page - 1) // self.items_per_page
+
+    @rx.var
+    def scroll_top_pad(self) -> int:
+        return scroll_pads(
+            self.scroll_offset,
+            len(self.scroll_rows),
+            self.total_items,
+            self._scroll_top,
+        )[0]
+
+    @rx.var
+    def scroll_bottom_pad(self) -> int:
+        return scroll_pads(
+            self.scroll_offset,
+            len(self.scroll_rows),
+            self.total_items,
+            self._scroll_top,
+        )[1]
+
+    @rx.var
+    def showing_text(self) -> str:
+        if self.total_items == 0:
+            return "No entries found"
+        start = (self.page - 1) * self.items_per_page + 1
+        end = min(start + self.items_per_page - 1, self.total_items)
+        return f"Showing {start} - {end} from {self.total_items} entries"
+
+    @rx.var
+    def page_numbers(self) -> list[int]:
+        return page_window(self.page, self.total_pages)
+
+    @rx.event
+    def load(self):
+        """Read the table in once this section's page is visited."""
+        self._loaded = True
+        if not getattr(self, self._selection):
+            setattr(self, self._selection, self._store.first_key())
+        self._sync_version()
+
+    @rx.event
+    def set_search(self, query: str):
+        self._apply_search(query)
+
+    @rx.event
+    def set_page(self, page: int):
+        self._sync_version()
+        self.page = page
+        self._anchor = self._store.nth(
+            (page - 1) * self.items_per_page, self.search_query, self._session()
+        )
+
+    @rx.event
+    def next_page(self):
+        self._sync_version()
+        if self.page < self.total_pages:
+            self._anchor = self._store.seek(
+                self._anchor, self.items_per_page, self.search_query, self._session()
+            )
+            self.page += 1
+
+    @rx.event
+    def prev_page(self):
+        self._sync_version()
+        if self.page > 1:
+            self.page -= 1
+            self._anchor = (
+                self._store.seek(
+                    self._anchor,
+                    -self.items_per_page,
+                    self.search_query,
+                    self._session(),
+                )
+                if self.page > 1
+                else 0
+            )
+
+    @rx.event
+    def toggle_scroll_mode(self):
+        self._sync_version()
+        self.scroll_mode = not self.scroll_mode
+        self._reset_scroll()
+
+    @rx.event
+    def scroll_to(self, scroll_top: float):
+        self._sync_version()
+        for offset, chunks in stream_chunks(
+            self.scroll_offset,
+            self._scroll_chunks,
+            scroll_row_top(scroll_top, self.total_items),
+            self.total_items,
+        ):
+            self.scroll_offset = offset
+            self._scroll_chunks = chunks
+            self._scroll_top = scroll_top
+            yield
+
+    @rx.event
+    def export(self, fmt: str):
+        return rx.redirect(
+            export_url(self._store.name, fmt, self.search_query), is_external=True
+        )
@@ -1,7 +1,10 @@
 import reflex as rx
-from typing import TypedDict
-import random
+from typing import ClassVar, Optional, TypedDict
 from datetime import datetime, timedelta
+from app.store.expiry import ExpiryScheduler, midnight_after
+from app.states.table_state import TableState
+from app.store.fixtures import fixture_seed
+from app.store.record_store import RecordStore
 
 
 class Trial(TypedDict):
@@ -14,163 +17,46 @@ class Trial(TypedDict):
     image: str
 
 
-def _generate_sample_trials() -> list[Trial]:
-    products = [
-        (
-            "Chanel No. 5 Eau de Parfum",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=chanel5",
-        ),
-        ("Dior Sauvage Elixir", "https://api.dicebear.com/9.x/thumbs/svg?seed=sauvage"),
-        ("YSL Black Opium", "https://api.dicebear.com/9.x/thumbs/svg?seed=yslblack"),
-        (
-            "La Mer Crème de la Mer",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=lamer",
-        ),
-        (
-            "Fenty Beauty Pro Filt'r Foundation",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=fentyfoundation",
-        ),
-        ("NARS Orgasm Blush", "https://api.dicebear.com/9.x/thumbs/svg?seed=narsblush"),
-        (
-            "Olaplex No. 3 Hair Perfector",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=olaplex",
-        ),
-        (
-            "Charlotte Tilbury Pillow Talk Lipstick",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=pillowtalk",
-        ),
-        (
-            "Sol de Janeiro Bum Bum Cream",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=bumbum",
-        ),
-        (
-            "Dyson Airwrap Multi-Styler",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=dyson",
-        ),
-        (
-            "Maison Francis Kurkdjian Baccarat Rouge 540",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=baccarat540",
-        ),
-        (
-            "Estée Lauder Advanced Night Repair",
-            "https://api.dicebear.com/9.x/thumbs/svg?seed=nightrepair",
-        ),
-    ]
-    statuses = ["Active", "Expired", "Converted", "Pending"]
-    customer_names = [
-        "Alice Smith",
-        "Bob Johnson",
-        "Carol Williams",
-        "David Brown",
-        "Eva Davis",
-        "Frank Miller",
-        "Grace Wilson",
-        "Henry Moore",
-        "Isabel Taylor",
-        "Jack Anderson",
-    ]
-    trials = []
-    for i in range(1, 46):
-        prod = random.choice(products)
-        customer = customer_names[i % len(customer_names)]
-        start_date = datetime.now() - timedelta(days=random.randint(0, 30))
-        duration = random.randint(7, 14)
-        end_date = start_date + timedelta(days=duration)
-        status = random.choice(statuses)
-        if end_date < datetime.now() and status == "Active":
-            status = "Expired"
-        trials.append(
-            {
-                "id": f"TRL-{1000 + i}",
-                "customer_name": customer,
-                "product_name": prod[0],
-                "image": prod[1],
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d"),
-                "status": status,
-            }
-        )
-    return trials
-
-
-_initial_trials = _generate_sample_trials()
-
-
-class TrialsState(rx.State):
-    trials: list[Trial] = _initial_trials
-    selected_trial_id: str = _initial_trials[0]["id"] if _initial_trials else ""
-    search_query: str = ""
-    page: int = 1
-    items_per_page: int = 8
-    is_add_modal_open: bool = False
+trials_store: RecordStore[Trial] = RecordStore(
+    "trials",
+    "id",
+    fixture_seed("trials"),
+    search_fields=("customer_name", "product_name", "id"),
+)
 
-    @rx.var
-    def filtered_trials(self) -> list[Trial]:
-        if not self.search_query:
-            return self.trials
-        query = self.search_query.lower()
-        return [
-            t
-            for t in self.trials
-            if query in t["customer_name"].lower()
-            or query in t["product_name"].lower()
-            or query in t["id"].lower()
-        ]
-
-    @rx.var
-    def total_items(self) -> int:
-        return len(self.filtered_trials)
-
-    @rx.var
-    def total_pages(self) -> int:
-        return (self.total_items + self.items_per_page - 1) // self.items_per_page
-
-    @rx.var
-    def current_page_trials(self) -> list[Trial]:
-        start = (self.page - 1) * self.items_per_page
-        end = start + self.items_per_page
-        return self.filtered_trials[start:end]
 
-    @rx.var
-    def selected_trial(self) -> Trial:
-        for t in self.trials:
-            if t["id"] == self.selected_trial_id:
-                return t
-        return self.trials[0] if self.trials else {}
-
-    @rx.var
-    def showing_text(self) -> str:
-        if self.total_items == 0:
-            return "No entries found"
-        start = (self.page - 1) * self.items_per_page + 1
-        end = min(start + self.items_per_page - 1, self.total_items)
-        return f"Showing {start} - {end} from {self.total_items} entries"
-
-    @rx.var
-    def page_numbers(self) -> list[int]:
-        return list(range(1, self.total_pages + 1))
+def _trial_deadline(trial: Trial) -> Optional[float]:
+    """Active trials expire at the midnight after their ``end_date``."""
+    if trial["status"] != "Active":
+        return None
+    return midnight_after(trial["end_date"])
 
-    @rx.event
-    def set_search(self, query: str):
-        self.search_query = query
-        self.page = 1
 
-    @rx.event
-    def set_page(self, page: int):
-        self.page = page
+trial_expiry = ExpiryScheduler(trials_store, _trial_deadline, {"status": "Expired"})
 
-    @rx.event
-    def next_page(self):
-        if self.page < self.total_pages:
-            self.page += 1
 
-    @rx.event
-    def prev_page(self):
-        if self.page > 1:
-            self.page -= 1
+class TrialsState(TableState, rx.State):
+    _store: ClassVar[RecordStore] = trials_store
+    _selection: ClassVar[str] = "selected_trial_id"
+
+    selected_trial_id: str = ""
+    is_add_modal_open: bool = False
+
+    @rx.var(deps=["_loaded", "_data_version"])
+    def current_page_trials(self) -> list[Trial]:
+        return self._page_rows()
+
+    @rx.var(deps=["_data_version"])
+    def selected_trial(self) -> Trial:
+        return self._selected_row(self.selected_trial_id)
+
+    @rx.var(deps=["_loaded", "_data_version", "_scroll_chunks"])
+    def scroll_rows(self) -> list[Trial]:
+        return self._held_rows()
 
     @rx.event
     def select_trial(self, trial_id: str):
+        self._sync_version()
         self.selected_trial_id = trial_id
 
     @rx.event
@@ -185,8 +71,9 @@ class TrialsState(rx.State):
             return rx.toast("Customer and Product are required")
         start_date = datetime.now()
         end_date = start_date + timedelta(days=14)
+        trial_id = trials_store.next_key("TRL-", 2000)
         new_trial: Trial = {
-            "id": f"TRL-{random.randint(2000, 9999)}",
+            "id": trial_id,
             "customer_name": customer,
             "product_name": product,
             "image": f"https://api.dicebear.com/9.x/thumbs/svg?seed={product}",
@@ -194,7 +81,8 @@ class TrialsState(rx.State):
             "end_date": end_date.strftime("%Y-%m-%d"),
             "status": "Pending",
         }
-        self.trials.insert(0, new_trial)
+        trials_store.insert(new_trial)
+        self._sync_version()
         self.selected_trial_id = new_trial["id"]
         self.is_add_modal_open = False
         rx.toast("Trial added successfully")
@@ -202,20 +90,13 @@ class TrialsState(rx.State):
     @rx.event
     def update_trial(self, form_data: dict):
         status = form_data.get("status", "")
-        updated_list = []
-        for t in self.trials:
-            if t["id"] == self.selected_trial_id:
-                updated_t = t.copy()
-                updated_t["status"] = status
-                updated_list.append(updated_t)
-            else:
-                updated_list.append(t)
-        self.trials = updated_list
+        trials_store.update(self.selected_trial_id, {"status": status})
+        self._sync_version()
         rx.toast("Trial updated successfully")
 
     @rx.event
     def delete_trial(self):
-        self.trials = [t for t in self.trials if t["id"] != self.selected_trial_id]
-        if self.trials:
-            self.selected_trial_id = self.trials[0]["id"]
+        trials_store.remove(self.selected_trial_id)
+        self.selected_trial_id = trials_store.first_key()
+        self._sync_version()
         rx.toast("Trial deleted")
\ No newline at end of file
@@ -0,0 +1,106 @@
+import asyncio
+import math
+import threading
+from typing import Any, Callable
+
+from reflex.utils import console
+
+from app.store.record_store import RecordStore, StoreListener
+
+CHECK_INTERVAL = 300.0
+
+_aggregates: dict[str, "Aggregate"] = {}
+
+
+class Aggregate(StoreListener):
+    """Running sum of ``measure(record)`` over every row of one store.
+
+    The store tells the aggregate about each write, so an insert, edit or
+    delete costs one or two calls to ``measure`` instead of a scan; reading
+    ``value`` is free. ``version`` moves whenever ``value`` does, for
+    states to key computed vars on. A count is a sum of 0/1 measures (see
+    ``count``).
+
+    Float sums pick up rounding drift and a bug in a write path could skip
+    a listener call, so ``verify`` recomputes the sum from the store and
+    resets ``value`` when the two disagree.
+    """
+
+    def __init__(self, name: str, store: RecordStore, measure: Callable[[Any], float]):
+        self.name = name
+        self.store = store
+        self.measure = measure
+        self.value = 0.0
+        self.version = 0
+        self._lock = threading.Lock()
+        _aggregates[name] = self
+        store.watch(self)
+
+    @classmethod
+    def count(
+        cls, name: str, store: RecordStore, predicate: Callable[[Any], bool]
+    ) -> "Aggregate":
+        """Number of rows of ``store`` for which ``predicate`` holds."""
+        return cls(name, store, lambda record: 1 if predicate(record) else 0)
+
+    def _add(self, delta: float):
+        if delta:
+            with self._lock:
+                self.value += delta
+                self.version += 1
+
+    def on_insert(self, records: list):
+        self._add(math.fsum(map(self.measure, records)))
+
+    def on_update(self, old: Any, new: Any):
+        self._add(self.measure(new) - self.measure(old))
+
+    def on_remove(self, record: Any):
+        self._add(-self.measure(record))
+
+    def on_reset(self, records: list):
+        with self._lock:
+            self.value = math.fsum(map(self.measure, records))
+            self.version += 1
+
+    def verify(self, tolerance: float = 1e-6) -> float:
+        """Compare ``value`` with a full recompute; return the drift.
+
+        The store is held still while it is scanned. Drift beyond
+        ``tolerance`` (relative to the recomputed sum, and at least
+        ``tolerance`` absolute) is corrected in place.
+        """
+        with self.store.locked():
+            expected = math.fsum(map(self.measure, self.store))
+            drift = self.value - expected
+            if abs(drift) > tolerance * max(1.0, abs(expected)):
+                self.on_reset(self.store.records)
+                return drift
+        return 0.0
+
+
+def get_aggregate(name: str) -> Aggregate:
+    return _aggregates[name]
+
+
+def all_aggregates() -> dict[str, Aggregate]:
+    return dict(_aggregates)
+
+
+def verify_aggregates() -> dict[str, float]:
+    """Verify every aggregate; the drift of each one that was corrected."""
+    drifts = {}
+    for name, aggregate in all_aggregates().items():
+        drift = aggregate.verify()
+        if drift:
+            drifts[name] = drift
+    return drifts
+
+
+async def check_aggregates(interval: float = CHECK_INTERVAL):
+    """App lifespan task re-verifying the aggregates every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        drifts = await asyncio.to_thread(verify_aggregates)
+        for name, drift in drifts.items():
+            console.warn(f"Aggregate {name!r} drifted by {drift:g}; recomputed.")
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from app.store.record_store import RecordStore
+
+BATCH_ROWS = 5_000
+MAX_ERRORS = 1_000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+@dataclass
+class ImportReport:
+    """Running totals of one import; ``errors`` keeps the first ``MAX_ERRORS``."""
+
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def fail(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+
+def format_of(filename: str) -> Optional[str]:
+    """``csv`` or ``jsonl`` from the file extension, None if unsupported."""
+    for suffix, fmt in FORMATS.items():
+        if filename.lower().endswith(suffix):
+            return fmt
+    return None
+
+
+def read_rows(
+    stream: BinaryIO, fmt: str
+) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Parse ``stream`` one row at a time as ``(line, row, error)``.
+
+    CSV files need a header row. A row that cannot be parsed comes back
+    with ``row`` None and the reason in ``error``; the rest of the file is
+    still read.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "too many fields"
+            else:
+                yield reader.line_num, row, None
+        return
+    for line, raw in enumerate(text, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError as e:
+            yield line, None, f"invalid JSON: {e}"
+            continue
+        if isinstance(row, dict):
+            yield line, row, None
+        else:
+            yield line, None, "expected a JSON object"
+
+
+def import_records(
+    store: RecordStore,
+    rows: Iterator[tuple[int, Optional[dict], Optional[str]]],
+    build: Callable[[dict], dict],
+    batch_rows: int = BATCH_ROWS,
+) -> Iterator[ImportReport]:
+    """Validate ``rows`` with ``build`` and insert them ``batch_rows`` at a time.
+
+    ``build`` turns a parsed row into a record or raises ``ValueError``.
+    Rows that fail, and rows whose key is already taken, are recorded in
+    the report and skipped. The report is yielded after every committed
+    batch, so at most one batch of records is held at a time.
+    """
+    report = ImportReport()
+    batch: dict = {}
+    for line, row, error in rows:
+        report.rows += 1
+        if error is None:
+            try:
+                record = build(row)
+            except (ValueError, TypeError) as e:
+                error = str(e)
+        if error is None:
+            key_value = record[store.key]
+            if key_value in store or key_value in batch:
+                error = f"duplicate {store.key} {key_value!r}"
+        if error is not None:
+            report.fail(line, error)
+            continue
+        batch[key_value] = record
+        if len(batch) >= batch_rows:
+            report.imported += store.insert_many(list(batch.values()))
+            batch = {}
+            yield report
+    if batch:
+        report.imported += store.insert_many(list(batch.values()))
+    yield report
@@ -0,0 +1,237 @@
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from app.store.record_store import RecordStore, StoreListener
+
+MAX_BLOCK = 50
+
+_NON_DIGITS = re.compile(r"\D")
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def normalize_email(email: str) -> str:
+    """Lowercased, with any ``+tag`` dropped from the local part."""
+    local, _, domain = email.strip().lower().partition("@")
+    return f"{local.split('+', 1)[0]}@{domain}" if domain else local
+
+
+def phone_digits(phone: str) -> str:
+    """The last ten digits of ``phone``; empty when it has fewer than seven."""
+    digits = _NON_DIGITS.sub("", phone)
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def name_key(name: str) -> str:
+    """Sorted lowercase name words, so "Smith, Alice" matches "alice smith"."""
+    return " ".join(sorted(_WORDS.findall(name.lower())))
+
+
+def blocking_keys(customer: Any) -> list[tuple[str, str]]:
+    keys = []
+    email = normalize_email(customer["email"])
+    if email:
+        keys.append(("email", email))
+    phone = phone_digits(customer.get("phone", ""))
+    if phone:
+        keys.append(("phone", phone))
+    name = name_key(customer["name"])
+    if name:
+        keys.append(("name", name))
+    return keys
+
+
+def is_duplicate(a: Any, b: Any) -> bool:
+    """Same email or phone, or the same name at the same company."""
+    email = normalize_email(a["email"])
+    if email and email == normalize_email(b["email"]):
+        return True
+    phone = phone_digits(a.get("phone", ""))
+    if phone and phone == phone_digits(b.get("phone", "")):
+        return True
+    company = a.get("company", "").strip().lower()
+    return (
+        bool(company)
+        and company == b.get("company", "").strip().lower()
+        and name_key(a["name"]) == name_key(b["name"])
+    )
+
+
+class EmailIndex(StoreListener):
+    """Keys of the rows of ``store`` by normalized email.
+
+    The store tells the index about every write, so ``find`` answers with
+    one dict lookup and matches ``zed+shop@corp.io`` for ``zed@corp.io``,
+    which a substring search for the normalized address misses. Rows
+    without an email are not indexed.
+    """
+
+    def __init__(self, store: RecordStore):
+        self.store = store
+        self._keys: dict[str, set] = defaultdict(set)
+        store.watch(self)
+
+    def _add(self, record: Any):
+        email = normalize_email(record["email"])
+        if email:
+            self._keys[email].add(record[self.store.key])
+
+    def _discard(self, record: Any):
+        email = normalize_email(record["email"])
+        keys = self._keys.get(email)
+        if keys is not None:
+            keys.discard(record[self.store.key])
+            if not keys:
+                del self._keys[email]
+
+    def on_insert(self, records: list):
+        for record in records:
+            self._add(record)
+
+    def on_update(self, old: Any, new: Any):
+        self._discard(old)
+        self._add(new)
+
+    def on_remove(self, record: Any):
+        self._discard(record)
+
+    def on_reset(self, records: list):
+        self._keys.clear()
+        self.on_insert(records)
+
+    def find(self, email: str) -> Optional[Any]:
+        """A row whose email normalizes like ``email``, or None."""
+        wanted = normalize_email(email)
+        if not wanted:
+            return None
+        with self.store.locked():
+            keys = self._keys.get(wanted)
+            return self.store.get(min(keys)) if keys else None
+
+
+class _Clusters:
+    """Union-find over row positions."""
+
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while i != root:
+            self.parent[i], i = root, self.parent.get(i, i)
+        return root
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            root = min(ri, rj)
+            self.parent[max(ri, rj)] = root
+            self.parent.setdefault(root, root)
+
+
+def find_duplicates(
+    customers: Iterable[Any], max_block: int = MAX_BLOCK
+) -> tuple[list[list[Any]], dict[str, int]]:
+    """Clusters of likely duplicate customers, each oldest first.
+
+    Customers sharing a blocking key (normalized email, phone digits or
+    name words) form a block, and only pairs inside a block are compared
+    with ``is_duplicate``, so the work grows with the table rather than its
+    square. Blocks over ``max_block`` rows (a common name) are skipped.
+    Duplicates link transitively into clusters. ``customers`` are taken to
+    be newest first, as the store lists them. Also returns counts of
+    customers, blocks, skipped blocks and compared pairs.
+    """
+    rows = list(customers)
+    blocks: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for i, customer in enumerate(rows):
+        for key in blocking_keys(customer):
+            blocks[key].append(i)
+    clusters = _Clusters()
+    stats = {"customers": len(rows), "blocks": 0, "skipped": 0, "pairs": 0}
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block:
+            stats["skipped"] += 1
+            continue
+        stats["blocks"] += 1
+        for x, i in enumerate(members):
+            for j in members[x + 1 :]:
+                stats["pairs"] += 1
+                if clusters.find(i) != clusters.find(j) and is_duplicate(
+                    rows[i], rows[j]
+                ):
+                    clusters.union(i, j)
+    grouped: dict[int, list[int]] = defaultdict(list)
+    for i in clusters.parent:
+        grouped[clusters.find(i)].append(i)
+    found = [
+        [rows[i] for i in sorted(members, reverse=True)]
+        for members in grouped.values()
+        if len(members) > 1
+    ]
+    found.sort(key=len, reverse=True)
+    return found, stats
+
+
+def merge_customers(
+    clusters: list[list[Any]],
+    customers: RecordStore,
+    orders: Optional[RecordStore] = None,
+    trials: Optional[RecordStore] = None,
+) -> dict[str, int]:
+    """Fold each cluster into its first (oldest) customer.
+
+    Orders placed under a duplicate's email and trials under a duplicate's
+    name move to the survivor, then the duplicates are removed. Related
+    rows are found through one pass over each table for all clusters.
+    Trials are matched by name only, so a name that another remaining
+    customer still carries is left alone.
+    """
+    survivors = {}
+    by_email = {}
+    by_name = {}
+    for cluster in clusters:
+        survivor = cluster[0]
+        for duplicate in cluster[1:]:
+            survivors[duplicate["id"]] = survivor
+            email = duplicate["email"].lower()
+            if email != survivor["email"].lower():
+                by_email[email] = survivor
+            if duplicate["name"] != survivor["name"]:
+                by_name[duplicate["name"]] = survivor
+    if by_name:
+        for customer in customers:
+            if customer["id"] not in survivors:
+                by_name.pop(customer["name"], None)
+    moved = {"orders": 0, "trials": 0, "customers": 0}
+    if orders is not None and by_email:
+        repoint = [
+            (order["id"], by_email[email])
+            for order in orders
+            if (email := order["customer_email"].lower()) in by_email
+        ]
+        for order_id, survivor in repoint:
+            orders.update(
+                order_id,
+                {
+                    "customer_name": survivor["name"],
+                    "customer_email": survivor["email"],
+                },
+            )
+        moved["orders"] = len(repoint)
+    if trials is not None and by_name:
+        repoint = [
+            (trial["id"], by_name[trial["customer_name"]])
+            for trial in trials
+            if trial["customer_name"] in by_name
+        ]
+        for trial_id, survivor in repoint:
+            trials.update(trial_id, {"customer_name": survivor["name"]})
+        moved["trials"] = len(repoint)
+    for key in survivors:
+        moved["customers"] += customers.remove(key)
+    return moved
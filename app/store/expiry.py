@@ -0,0 +1,147 @@
+import asyncio
+import functools
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from app.store.record_store import RecordStore, StoreListener
+
+BATCH_ROWS = 1_000
+MAX_SLEEP = 3600.0
+
+
+@functools.lru_cache(maxsize=4096)
+def midnight_after(day: str) -> float:
+    """The epoch second a ``YYYY-MM-DD`` date ends at, local time."""
+    return (datetime.fromisoformat(day) + timedelta(days=1)).timestamp()
+
+
+class ExpiryScheduler(StoreListener):
+    """Applies ``changes`` to each row of a store the moment it expires.
+
+    ``deadline(record)`` gives the epoch second a row expires at, or None
+    while it cannot expire (e.g. a trial that is not Active). Pending
+    deadlines sit in a min-heap; the store tells the scheduler about every
+    write, so an edit or delete only pushes a new entry and the superseded
+    one is dropped when it reaches the top (the heap is rebuilt once those
+    dominate). Finding what is due is a pop per expiring row and never a
+    scan of the table.
+
+    ``run`` sleeps until the earliest deadline, waking early when a write
+    brings in a sooner one, expires what is due in batches of
+    ``BATCH_ROWS`` and hands the expired keys to ``notify``.
+    """
+
+    def __init__(
+        self,
+        store: RecordStore,
+        deadline: Callable[[Any], Optional[float]],
+        changes: dict,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.deadline = deadline
+        self.changes = changes
+        self.clock = clock
+        self._heap: list[tuple[float, Any]] = []
+        self._due: dict[Any, float] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        store.watch(self)
+
+    def _schedule(self, record: Any):
+        key = record[self.store.key]
+        due = self.deadline(record)
+        if due is None:
+            self._due.pop(key, None)
+            return
+        if self._due.get(key) == due:
+            return
+        self._due[key] = due
+        sooner = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, key))
+        if len(self._heap) > 2 * len(self._due) + 1024:
+            self._heap = [(d, k) for k, d in self._due.items()]
+            heapq.heapify(self._heap)
+        if sooner and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def on_insert(self, records: list):
+        with self._lock:
+            for record in records:
+                self._schedule(record)
+
+    def on_update(self, old: Any, new: Any):
+        with self._lock:
+            if old[self.store.key] != new[self.store.key]:
+                self._due.pop(old[self.store.key], None)
+            self._schedule(new)
+
+    def on_remove(self, record: Any):
+        with self._lock:
+            self._due.pop(record[self.store.key], None)
+
+    def on_reset(self, records: list):
+        with self._lock:
+            self._due = {}
+            for record in records:
+                due = self.deadline(record)
+                if due is not None:
+                    self._due[record[self.store.key]] = due
+            self._heap = [(due, key) for key, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float, limit: int) -> list[Any]:
+        keys = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now and len(keys) < limit:
+                due, key = heapq.heappop(heap)
+                if self._due.get(key) == due:
+                    del self._due[key]
+                    keys.append(key)
+        return keys
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest pending deadline, if any."""
+        with self._lock:
+            heap = self._heap
+            while heap and self._due.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            return heap[0][0] if heap else None
+
+    def expire_due(self, now: Optional[float] = None) -> list[Any]:
+        """Apply ``changes`` to every row due by ``now``; their keys."""
+        now = self.clock() if now is None else now
+        expired = []
+        while True:
+            with self.store.locked():
+                batch = self._pop_due(now, BATCH_ROWS)
+                for key in batch:
+                    self.store.update(key, self.changes)
+            expired.extend(batch)
+            if len(batch) < BATCH_ROWS:
+                return expired
+
+    async def run(self, notify: Callable[[list], Awaitable[None]]):
+        """Lifespan task: expire rows as they fall due, then ``notify``."""
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._wake.clear()
+                expired = await asyncio.to_thread(self.expire_due)
+                if expired:
+                    await notify(expired)
+                due = self.next_deadline()
+                delay = MAX_SLEEP if due is None else due - self.clock()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), min(delay, MAX_SLEEP))
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self._loop = None
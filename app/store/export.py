@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+from urllib.parse import urlencode
+
+import reflex as rx
+
+CHUNK_ROWS = 1_000
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def export_chunks(rows: Iterable[dict], fmt: str) -> Iterator[str]:
+    """Encode ``rows`` as CSV or NDJSON, ``CHUNK_ROWS`` rows per chunk.
+
+    Rows are pulled from ``rows`` as chunks are consumed, so only one
+    chunk is buffered at a time. CSV columns are the keys of the first row.
+    """
+    buffer = io.StringIO()
+    writer = None
+    for n, row in enumerate(rows, start=1):
+        if fmt == "csv":
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row))
+            buffer.write("\n")
+        if n % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_url(store_name: str, fmt: str, query: str = "") -> str:
+    """Backend URL of the download for ``store_name`` filtered by ``query``."""
+    api_url = rx.config.get_config().api_url.rstrip("/")
+    suffix = f"?{urlencode({'q': query})}" if query else ""
+    return f"{api_url}/export/{store_name}.{fmt}{suffix}"
@@ -0,0 +1,355 @@
+import os
+import pickle
+import random
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+
+from app.store.ledger import stock_status
+from app.store.redemption import coupon_status
+
+FORMAT = 1
+CHUNK_ROWS = 100_000
+
+DEFAULT_ROWS = {
+    "customers": 20,
+    "products": 40,
+    "orders": 45,
+    "trials": 45,
+    "coupons": 25,
+}
+# Entities whose rows point at rows of others, so their cache depends on those sizes.
+REFERENCES = {
+    "orders": ("customers", "products"),
+    "trials": ("customers", "products"),
+}
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "David", "Eva", "Frank", "Grace", "Henry",
+    "Isabel", "Jack", "Kelly", "Liam", "Mia", "Noah", "Olivia", "Peter",
+    "Quinn", "Ryan", "Sophia", "Tyler",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Davis", "Miller", "Wilson",
+    "Moore", "Taylor", "Anderson", "Thomas", "Jackson", "White", "Harris",
+    "Martin", "Thompson", "Garcia", "Martinez", "Robinson", "Clark",
+]  # fmt: skip
+COMPANIES = [
+    "Acme Corp", "Globex", "Soylent Corp", "Initech", "Umbrella Corp",
+    "Stark Ind", "Wayne Ent", "Cyberdyne",
+]  # fmt: skip
+CUSTOMER_STATUSES = ["Active", "Inactive", "Pending", "VIP"]
+
+# (name, image seed, category, list price)
+PRODUCTS = [
+    ("Chanel No. 5 Eau de Parfum", "chanel5", "Fragrance", 135.0),
+    ("Dior Sauvage Elixir", "sauvage", "Fragrance", 155.0),
+    ("YSL Black Opium", "yslblack", "Fragrance", 130.0),
+    ("Estée Lauder Advanced Night Repair", "nightrepair", "Skincare", 105.0),
+    ("La Mer Crème de la Mer", "lamer", "Skincare", 380.0),
+    ("SK-II Facial Treatment Essence", "skii", "Skincare", 185.0),
+    ("Fenty Beauty Pro Filt'r Foundation", "fentyfoundation", "Makeup", 39.0),
+    ("Pat McGrath Mothership Palette", "pmglabs", "Makeup", 128.0),
+    ("NARS Orgasm Blush", "narsblush", "Makeup", 32.0),
+    ("Olaplex No. 3 Hair Perfector", "olaplex", "Hair Care", 30.0),
+    ("Dyson Airwrap Multi-Styler", "dyson", "Hair Care", 599.0),
+    ("Moroccanoil Treatment", "moroccanoil", "Hair Care", 44.0),
+    ("Sol de Janeiro Bum Bum Cream", "bumbum", "Bath & Body", 48.0),
+    ("L'Occitane Almond Shower Oil", "loccitane", "Bath & Body", 29.0),
+    ("Jo Malone Lime Basil & Mandarin", "jomalone", "Fragrance", 145.0),
+    ("Charlotte Tilbury Pillow Talk Lipstick", "pillowtalk", "Makeup", 34.0),
+    ("Tatcha The Dewy Skin Cream", "tatcha", "Skincare", 69.0),
+    ("Tom Ford Black Orchid", "tomford", "Fragrance", 150.0),
+    ("Anastasia Beverly Hills Brow Wiz", "abhbrow", "Makeup", 23.0),
+    ("Aesop Resurrection Hand Wash", "aesop", "Bath & Body", 40.0),
+    ("Kerastase Elixir Ultime Oil", "kerastase", "Hair Care", 52.0),
+    ("Urban Decay All Nighter Setting Spray", "urbandecay", "Makeup", 33.0),
+    ("Sunday Riley Good Genes", "sundayriley", "Skincare", 85.0),
+    ("Maison Francis Kurkdjian Baccarat Rouge 540", "baccarat540", "Fragrance", 325.0),
+]
+ORDER_STATUSES = ["Completed", "Pending", "Processing", "Refunded"]
+TRIAL_STATUSES = ["Active", "Expired", "Converted", "Pending"]
+COUPON_CODES = [
+    "BEAUTY20", "GLOW15", "SKINCARE10", "FRAGRANCE25", "LUXE50", "MAKEUP15",
+    "HAIRCARE10", "FIRSTORDER", "VIPBEAUTY", "SUMMERGLOW", "HOLIDAYSCENT",
+    "FREESHIP", "BDAYTREAT", "LOYALTY20",
+]  # fmt: skip
+
+
+def _initials(n: int) -> str:
+    """``n`` spelled as capital initials: 1 -> "A.", 27 -> "A.A."."""
+    letters = ""
+    while n:
+        n, digit = divmod(n - 1, 26)
+        letters = f"{chr(ord('A') + digit)}." + letters
+    return letters
+
+
+def customer_identity(i: int) -> tuple[str, str]:
+    """Name and email of customer ``i``, unique for every ``i``.
+
+    The first 400 customers get distinct first/last name pairs; later ones
+    repeat the pairs with middle initials.
+    """
+    cycle, pair = divmod(i, len(FIRST_NAMES) * len(LAST_NAMES))
+    turn, first = divmod(pair, len(FIRST_NAMES))
+    first = FIRST_NAMES[first]
+    last = LAST_NAMES[(pair + turn) % len(LAST_NAMES)]
+    name = f"{first} {_initials(cycle)} {last}" if cycle else f"{first} {last}"
+    return name, f"{first}.{last}{i}@example.com".lower()
+
+
+def product_identity(i: int) -> tuple[str, str, str, str, float]:
+    """Id, name, image, category and price of product ``i``.
+
+    Ids are a fixed permutation of eight-digit numbers, so they look random
+    but never collide below 90 million products.
+    """
+    name, image_seed, category, price = PRODUCTS[i % len(PRODUCTS)]
+    product_id = f"{10_000_000 + i * 7_919 % 90_000_000}-FE"
+    image = f"https://api.dicebear.com/9.x/thumbs/svg?seed={image_seed}{i}"
+    return product_id, name, image, category, price
+
+
+class Fixtures:
+    """Seeded sample data for every entity, from a few rows to millions.
+
+    Rows are generated ``CHUNK_ROWS`` at a time, each chunk from its own
+    random stream seeded with ``(seed, entity, chunk)``, so the output only
+    depends on ``seed``, ``rows`` and ``today`` and any chunk can be made
+    alone. Customers and products are a function of their position, which
+    lets orders and trials reference them without holding them in memory.
+    Rows come newest first, as the stores list them.
+
+    Each entity is written once to ``cache_dir`` as a stream of pickled
+    chunks and read back from there on later runs; nothing is generated or
+    read until ``records`` or ``chunks`` is called.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        rows: Optional[dict[str, int]] = None,
+        today: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        self.seed = seed
+        self.rows = {**DEFAULT_ROWS, **(rows or {})}
+        self.today = date.fromisoformat(today) if today else date.today()
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    def path(self, entity: str) -> str:
+        sizes = "-".join(
+            f"{name}{self.rows[name]}" for name in (entity, *REFERENCES.get(entity, ()))
+        )
+        return os.path.join(
+            self.cache_dir,
+            f"v{FORMAT}-seed{self.seed}-{self.today.isoformat()}",
+            f"{sizes}.pkl",
+        )
+
+    def _day(self, days_ago: int) -> str:
+        return (self.today - timedelta(days=days_ago)).isoformat()
+
+    def _customers(self, rng: random.Random, start: int, stop: int) -> list[dict]:
+        rows = []
+        for i in range(start, stop):
+            name, email = customer_identity(i)
+            rows.append(
+                {
+                    "id": f"CUST-{1000 + i}",
+                    "name": name,
+                    "email": email,
+                    "phone": f"+1 ({200 + i // 10_000_000}) "
+                    f"{i // 10_000 % 1000:03d}-{i % 10_000:04d}",
+                    "company": rng.choice(COMPANIES),
+                    "avatar": f"https://api.dicebear.com/9.x/notionists/svg?seed={name}",
+                    "status": rng.choice(CUSTOMER_STATUSES),
+                    "created_date": self._day(rng.randint(1, 365)),
+                }
+            )
+        return rows
+
+    def _products(self, rng: random.Random, start: int, stop: int) -> list[dict]:
+        rows = []
+        for i in range(start, stop):
+            product_id, name, image, category, price = product_identity(i)
+            stock = rng.randint(0, 150)
+            created = datetime.combine(self.today, time(9)) - timedelta(
+                days=rng.randint(1, 365), minutes=rng.randrange(600)
+            )
+            rows.append(
+                {
+                    "id": product_id,
+                    "name": name,
+                    "image": image,
+                    "price": price,
+                    "stock": stock,
+                    "category": category,
+                    "status": stock_status(stock),
+                    "created_date": created.strftime("%d %b %Y %I:%M %p"),
+                }
+            )
+        return rows
+
+    def _orders(self, rng: random.Random, start: int, stop: int) -> list[dict]:
+        customers, products = self.rows["customers"], self.rows["products"]
+        total = self.rows["orders"]
+        # One order a day for small sets, spread over two years for large ones.
+        span = min(total, 730)
+        rows = []
+        for i in range(start, stop):
+            name, email = customer_identity(rng.randrange(customers))
+            _, product, image, _, list_price = product_identity(rng.randrange(products))
+            quantity = rng.randint(1, 5)
+            price = round(list_price * rng.uniform(0.8, 1.1), 2)
+            rows.append(
+                {
+                    "id": f"ORD-{1001 + i}",
+                    "product_name": product,
+                    "image": image,
+                    "quantity": quantity,
+                    "price": price,
+                    "total": round(quantity * price, 2),
+                    "status": ORDER_STATUSES[i % len(ORDER_STATUSES)],
+                    "date": self._day(1 + i * span // total),
+                    "customer_name": name,
+                    "customer_email": email,
+                }
+            )
+        return rows
+
+    def _trials(self, rng: random.Random, start: int, stop: int) -> list[dict]:
+        customers, products = self.rows["customers"], self.rows["products"]
+        today = self.today.isoformat()
+        rows = []
+        for i in range(start, stop):
+            name, _ = customer_identity(rng.randrange(customers))
+            _, product, image, _, _ = product_identity(rng.randrange(products))
+            start_day = self.today - timedelta(days=rng.randint(0, 30))
+            end_day = (start_day + timedelta(days=rng.randint(7, 14))).isoformat()
+            status = rng.choice(TRIAL_STATUSES)
+            if status == "Active" and end_day < today:
+                status = "Expired"
+            rows.append(
+                {
+                    "id": f"TRL-{1001 + i}",
+                    "customer_name": name,
+                    "product_name": product,
+                    "image": image,
+                    "start_date": start_day.isoformat(),
+                    "end_date": end_day,
+                    "status": status,
+                }
+            )
+        return rows
+
+    def _coupons(self, rng: random.Random, start: int, stop: int) -> list[dict]:
+        today = self.today.isoformat()
+        rows = []
+        for i in range(start, stop):
+            cycle, base = divmod(i, len(COUPON_CODES))
+            code = COUPON_CODES[base] + (f"-{cycle}" if cycle else "")
+            coupon_type = rng.choice(["Percentage", "Fixed Amount"])
+            value = (
+                rng.randint(5, 40)
+                if coupon_type == "Percentage"
+                else rng.randint(10, 100)
+            )
+            limit = rng.randint(50, 500)
+            coupon = {
+                "code": code,
+                "type": coupon_type,
+                "value": float(value),
+                "used": rng.randint(0, limit),
+                "limit": limit,
+                "expiry_date": self._day(rng.randint(-120, 60)),
+                "status": "Active",
+            }
+            coupon["status"] = coupon_status(coupon, today)
+            rows.append(coupon)
+        return rows
+
+    def generate(self, entity: str) -> Iterator[list[dict]]:
+        """Fresh chunks of ``entity`` rows, bypassing the cache."""
+        make = getattr(self, f"_{entity}")
+        total = self.rows[entity]
+        for chunk, start in enumerate(range(0, total, CHUNK_ROWS)):
+            rng = random.Random(f"{self.seed}:{entity}:{chunk}")
+            yield make(rng, start, min(start + CHUNK_ROWS, total))
+
+    def _write(self, entity: str) -> str:
+        path = self.path(entity)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as f:
+            for chunk in self.generate(entity):
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        return path
+
+    def chunks(self, entity: str) -> Iterator[list[dict]]:
+        """Chunks of ``entity`` rows, generated into the cache on first use."""
+        if self.cache_dir is None:
+            yield from self.generate(entity)
+            return
+        path = self.path(entity)
+        with self._lock:
+            if not os.path.exists(path):
+                self._write(entity)
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def records(self, entity: str) -> list[dict]:
+        rows = []
+        for chunk in self.chunks(entity):
+            rows.extend(chunk)
+        return rows
+
+
+_fixtures: Optional[Fixtures] = None
+
+
+def _parse_rows(spec: str) -> dict[str, int]:
+    """``"100000"`` for every entity, or ``"orders=1000000,customers=50000"``."""
+    if not spec:
+        return {}
+    if "=" not in spec:
+        return dict.fromkeys(DEFAULT_ROWS, int(spec))
+    rows = {}
+    for part in spec.split(","):
+        entity, _, count = part.partition("=")
+        if entity.strip() not in DEFAULT_ROWS:
+            raise ValueError(f"Unknown fixture entity: {entity}")
+        rows[entity.strip()] = int(count)
+    return rows
+
+
+def get_fixtures() -> Fixtures:
+    """The process fixtures, configured by ``ADMIN_FIXTURE_*`` variables.
+
+    ``ADMIN_FIXTURE_SEED`` (default 0), ``ADMIN_FIXTURE_ROWS`` (see
+    ``_parse_rows``; the defaults are a small demo set),
+    ``ADMIN_FIXTURE_TODAY`` (the date the data is relative to, default
+    today) and ``ADMIN_FIXTURE_CACHE`` (cache directory, default
+    ``.fixtures``).
+    """
+    global _fixtures
+    if _fixtures is None:
+        _fixtures = Fixtures(
+            seed=int(os.environ.get("ADMIN_FIXTURE_SEED", "0")),
+            rows=_parse_rows(os.environ.get("ADMIN_FIXTURE_ROWS", "")),
+            today=os.environ.get("ADMIN_FIXTURE_TODAY") or None,
+            cache_dir=os.environ.get("ADMIN_FIXTURE_CACHE", ".fixtures"),
+        )
+    return _fixtures
+
+
+def fixture_seed(entity: str):
+    """A ``RecordStore`` seed that reads ``entity`` from the process fixtures."""
+    return lambda: get_fixtures().records(entity)
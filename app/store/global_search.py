@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, TypedDict
+
+from app.store.record_store import RecordStore
+from app.store.trigram_index import SearchCancelled
+
+MIN_QUERY = 2
+MAX_CANDIDATES = 500
+HITS_PER_GROUP = 5
+
+
+class SearchHit(TypedDict):
+    key: str
+    title: str
+    detail: str
+    score: int
+
+
+class SearchGroup(TypedDict):
+    entity: str
+    icon: str
+    hits: list[SearchHit]
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """One table searched from the header and how its rows are shown.
+
+    ``entity`` is the navigation label the results open, ``title`` the
+    field ranked first and shown in bold, ``detail`` the fields shown
+    under it.
+    """
+
+    entity: str
+    icon: str
+    store: RecordStore
+    title: str
+    detail: tuple[str, ...] = ()
+
+
+def score(query: str, source: SearchSource, row: Any) -> int:
+    """How well ``row`` matches ``query`` (already lowercased).
+
+    An exact key or title beats a title prefix, which beats a word in the
+    title starting with the query, which beats the query anywhere in the
+    title; rows matching only another search field come last.
+    """
+    title = str(row[source.title]).lower()
+    if query == title or query == str(row[source.store.key]).lower():
+        return 100
+    if title.startswith(query):
+        return 80
+    if any(word.startswith(query) for word in title.split()):
+        return 60
+    if query in title:
+        return 40
+    return 20
+
+
+class GlobalSearch:
+    """Searches every source at once, one search in flight per session.
+
+    Each source is searched on a worker thread with the store's indexed
+    ``matching``, through the session's search session so an extended
+    query narrows the previous matches; only the newest ``MAX_CANDIDATES``
+    matches are ranked. A new query from a session cancels that session's
+    previous search: the awaiting caller gets ``None`` and the worker
+    threads stop at their next check of the shared cancel flag, which the
+    index scan checks too, so a burst of keystrokes does not queue up full
+    searches behind each other.
+    """
+
+    def __init__(self, sources: list[SearchSource], limit: int = HITS_PER_GROUP):
+        self.sources = sources
+        self.limit = limit
+        self.cancelled = 0
+        self._inflight: dict[str, tuple[asyncio.Task, threading.Event]] = {}
+
+    def _search_source(
+        self, source: SearchSource, session: str, query: str, stop: threading.Event
+    ) -> Optional[SearchGroup]:
+        ranked = []
+        # Keyed apart from the session's table search on the same store, so
+        # the two do not evict each other's results.
+        session = f"{session}/header"
+        rows = source.store.iter_matching(query, session, batch=100, stop=stop)
+        try:
+            for position, row in enumerate(itertools.islice(rows, MAX_CANDIDATES)):
+                if position % 100 == 0 and stop.is_set():
+                    return None
+                # Newer rows (lower position) win ties.
+                ranked.append((score(query, source, row), -position, row))
+        except SearchCancelled:
+            return None
+        if not ranked or stop.is_set():
+            return None
+        top = heapq.nlargest(self.limit, ranked, key=lambda hit: hit[:2])
+        return {
+            "entity": source.entity,
+            "icon": source.icon,
+            "hits": [
+                {
+                    "key": str(row[source.store.key]),
+                    "title": str(row[source.title]),
+                    "detail": " · ".join(str(row[f]) for f in source.detail),
+                    "score": rank,
+                }
+                for rank, _, row in top
+            ],
+        }
+
+    async def _search_all(
+        self, session: str, query: str, stop: threading.Event
+    ) -> list[SearchGroup]:
+        found = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._search_source, source, session, query, stop)
+                for source in self.sources
+            )
+        )
+        groups = [group for group in found if group]
+        groups.sort(key=lambda group: group["hits"][0]["score"], reverse=True)
+        return groups
+
+    def cancel(self, session: str):
+        inflight = self._inflight.pop(session, None)
+        if inflight is not None:
+            task, stop = inflight
+            stop.set()
+            if task.cancel():
+                self.cancelled += 1
+
+    async def search(self, session: str, query: str) -> Optional[list[SearchGroup]]:
+        """Ranked groups for ``query``, or ``None`` if a newer search replaced it.
+
+        Groups are ordered by their best hit; queries shorter than
+        ``MIN_QUERY`` return no groups.
+        """
+        self.cancel(session)
+        query = query.strip().lower()
+        if len(query) < MIN_QUERY:
+            return []
+        stop = threading.Event()
+        task = asyncio.ensure_future(self._search_all(session, query, stop))
+        self._inflight[session] = (task, stop)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            return None
+        finally:
+            stop.set()
+            if self._inflight.get(session, (None,))[0] is task:
+                del self._inflight[session]
@@ -0,0 +1,84 @@
+from bisect import bisect_left
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+class KeyedCollection(Generic[R]):
+    """Ordered rows addressed by their key field.
+
+    Each appended row gets the next ``seq``; ``_seqs`` is the hash index from
+    key to seq and ``_rows`` holds the row for each live seq, so get,
+    replace and remove are dictionary operations. ``order`` lists the live
+    seqs ascending (oldest first) for ordered iteration and range reads;
+    removal takes the seq out of it by bisection.
+    """
+
+    def __init__(self, key: str, rows: Iterable[R] = ()):
+        self.key = key
+        self._seqs: dict[Any, int] = {}
+        self._rows: dict[int, R] = {}
+        self.order: list[int] = []
+        self._next_seq = 1
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, key_value: Any) -> bool:
+        return key_value in self._seqs
+
+    def __iter__(self) -> Iterator[R]:
+        rows = self._rows
+        for seq in self.order:
+            yield rows[seq]
+
+    def __reversed__(self) -> Iterator[R]:
+        rows = self._rows
+        for seq in reversed(self.order):
+            yield rows[seq]
+
+    def items(self) -> Iterator[tuple[int, R]]:
+        return iter(self._rows.items())
+
+    def append(self, row: R) -> int:
+        if row[self.key] in self._seqs:
+            raise ValueError(f"Duplicate key: {row[self.key]!r}")
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs[row[self.key]] = seq
+        self._rows[seq] = row
+        self.order.append(seq)
+        return seq
+
+    def at(self, seq: int) -> R:
+        return self._rows[seq]
+
+    def get_at(self, seq: int) -> Optional[R]:
+        return self._rows.get(seq)
+
+    def seq_of(self, key_value: Any) -> Optional[int]:
+        return self._seqs.get(key_value)
+
+    def get(self, key_value: Any) -> Optional[R]:
+        return self._rows.get(self._seqs.get(key_value))
+
+    def replace(self, key_value: Any, row: R) -> Optional[int]:
+        """Swap in ``row`` at the position of ``key_value``, keeping its seq."""
+        seq = self._seqs.get(key_value)
+        if seq is None:
+            return None
+        if row[self.key] != key_value:
+            del self._seqs[key_value]
+            self._seqs[row[self.key]] = seq
+        self._rows[seq] = row
+        return seq
+
+    def remove(self, key_value: Any) -> Optional[int]:
+        seq = self._seqs.pop(key_value, None)
+        if seq is None:
+            return None
+        del self._rows[seq]
+        del self.order[bisect_left(self.order, seq)]
+        return seq
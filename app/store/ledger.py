@@ -0,0 +1,218 @@
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from app.store.persistence import Backend, Change, get_backend
+from app.store.record_store import RecordStore, StoreListener
+
+KINDS = ("receipt", "sale", "adjustment")
+SNAPSHOT_EVERY = 64
+HISTORY_ROWS = 20
+
+
+def stock_status(stock: int) -> str:
+    if stock == 0:
+        return "Out of Stock"
+    return "Low Stock" if stock < 20 else "In Stock"
+
+
+class StockConflict(ValueError):
+    """Stock moved since the caller read it; ``stock`` is the current value."""
+
+    def __init__(self, product_id: str, stock: int):
+        self.product_id = product_id
+        self.stock = stock
+        super().__init__(f"Stock of {product_id} is now {stock}")
+
+
+class _Account:
+    __slots__ = ("snapshot", "snapshot_seq", "tail", "recent")
+
+    def __init__(self, snapshot: int, snapshot_seq: int):
+        self.snapshot = snapshot
+        self.snapshot_seq = snapshot_seq
+        self.tail: list[int] = []
+        self.recent: deque = deque(maxlen=HISTORY_ROWS)
+
+    @property
+    def stock(self) -> int:
+        return self.snapshot + sum(self.tail)
+
+
+class StockLedger(StoreListener):
+    """Append-only stock movements per product, with periodic snapshots.
+
+    Every receipt, sale or adjustment is a signed movement appended to the
+    ``<name>`` backend table and never rewritten. In memory each product
+    keeps its last snapshot and the deltas since (the tail); once the tail
+    reaches ``SNAPSHOT_EVERY`` it is folded into a new snapshot, which is
+    also written to ``<name>_snapshots``. Current stock is the snapshot
+    plus a tail of bounded length, so appends and reads cost the same
+    however long the history grows; only the last ``HISTORY_ROWS``
+    movements per product are kept in memory for display.
+
+    The ledger works under the products store lock, so concurrent
+    movements apply one after the other, and it writes the derived
+    ``fields(stock)`` (stock and status) back to the product row. Products
+    that arrive without history open with a snapshot of their ``stock``.
+    The history is read in along with the products, when the store loads.
+
+    On a shared backend the movements table is replicated with the store
+    (``RecordStore.follow``): movements other processes append are applied
+    to the accounts and folded the same way, without saving the snapshots
+    again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        store: RecordStore,
+        fields: Callable[[int], dict],
+        backend: Optional[Backend] = None,
+    ):
+        self.name = name
+        self.store = store
+        self.fields = fields
+        self.backend = backend or get_backend()
+        self.seq = 0
+        self._accounts: dict[str, _Account] = {}
+        self._following = False
+        store.watch(self)
+
+    def _load(self):
+        for row in self.backend.load(f"{self.name}_snapshots") or []:
+            account = _Account(row["stock"], row["seq"])
+            self._accounts[row["product_id"]] = account
+            self.seq = max(self.seq, row["seq"])
+        for row in reversed(self.backend.load(self.name) or []):
+            self.seq = max(self.seq, row["seq"])
+            account = self._accounts.get(row["product_id"])
+            if account is None:
+                account = self._accounts[row["product_id"]] = _Account(0, 0)
+            if row["seq"] > account.snapshot_seq:
+                account.tail.append(row["quantity"])
+            account.recent.appendleft(row)
+
+    def _replay(self, change: Change):
+        if change.op == "reset":
+            self.seq = 0
+            self._accounts.clear()
+            self._load()
+            return
+        if change.op != "insert":
+            return
+        movement = change.data
+        self.seq = max(self.seq, movement["seq"])
+        account = self._accounts.get(movement["product_id"])
+        if account is None:
+            account = self._accounts[movement["product_id"]] = _Account(0, 0)
+        account.tail.append(movement["quantity"])
+        account.recent.appendleft(movement)
+        if len(account.tail) >= SNAPSHOT_EVERY:
+            account.snapshot = account.stock
+            account.snapshot_seq = movement["seq"]
+            account.tail = []
+
+    def _save_snapshot(self, product_id: str, account: _Account):
+        self.backend.insert(
+            f"{self.name}_snapshots",
+            "product_id",
+            {
+                "product_id": product_id,
+                "stock": account.snapshot,
+                "seq": account.snapshot_seq,
+            },
+        )
+
+    def on_insert(self, records: list):
+        with self.backend.transaction():
+            for product in records:
+                product_id = product[self.store.key]
+                if product_id not in self._accounts:
+                    account = _Account(product["stock"], self.seq)
+                    self._accounts[product_id] = account
+                    if not self.store.replaying:
+                        self._save_snapshot(product_id, account)
+
+    def on_remove(self, record: Any):
+        self._accounts.pop(record[self.store.key], None)
+
+    def on_reset(self, records: list):
+        if not self._following:
+            self._following = True
+            self.store.follow(self.name, self._replay)
+        self.on_insert(records)
+
+    def stock(self, product_id: str) -> int:
+        with self.store.locked():
+            account = self._accounts.get(product_id)
+            return account.stock if account is not None else 0
+
+    def history(self, product_id: str) -> list[dict]:
+        """The latest movements of ``product_id``, newest first."""
+        with self.store.locked():
+            account = self._accounts.get(product_id)
+            return list(account.recent) if account is not None else []
+
+    def record(
+        self,
+        product_id: str,
+        kind: str,
+        quantity: int,
+        note: str = "",
+        expected: Optional[int] = None,
+    ) -> int:
+        """Append a movement of ``quantity`` (signed) and return the new stock.
+
+        With ``expected``, the movement only applies if the stock still
+        equals it; otherwise ``StockConflict`` is raised. Raises
+        ``ValueError`` for an unknown product or kind, or if stock would go
+        negative.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown movement kind: {kind}")
+        with self.store.locked():
+            account = self._accounts.get(product_id)
+            if account is None or product_id not in self.store:
+                raise ValueError(f"Unknown product: {product_id}")
+            current = account.stock
+            if expected is not None and current != expected:
+                raise StockConflict(product_id, current)
+            if current + quantity < 0:
+                raise ValueError(f"Only {current} of {product_id} in stock")
+            self.seq += 1
+            movement = {
+                "seq": self.seq,
+                "product_id": product_id,
+                "kind": kind,
+                "quantity": quantity,
+                "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "note": note,
+            }
+            self.backend.insert(self.name, "seq", movement)
+            account.tail.append(quantity)
+            account.recent.appendleft(movement)
+            stock = current + quantity
+            if len(account.tail) >= SNAPSHOT_EVERY:
+                account.snapshot = stock
+                account.snapshot_seq = self.seq
+                account.tail = []
+                self._save_snapshot(product_id, account)
+            self.store.update(product_id, self.fields(stock))
+            return stock
+
+    def set_stock(
+        self,
+        product_id: str,
+        stock: int,
+        expected: Optional[int] = None,
+        note: str = "",
+    ) -> int:
+        """Record the adjustment that brings ``product_id`` to ``stock``."""
+        with self.store.locked():
+            current = self.stock(product_id)
+            if expected is not None and current != expected:
+                raise StockConflict(product_id, current)
+            if stock == current:
+                return current
+            return self.record(product_id, "adjustment", stock - current, note)
@@ -0,0 +1,222 @@
+import threading
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.store.record_store import RecordStore, StoreListener
+
+DIMENSIONS = ("product", "status", "day", "week", "month")
+_CODES = ("product", "status", "day", "week", "month")
+_MEASURES = ("quantity", "price", "total")
+# 1900-01-01 was a Monday, so whole weeks counted from it start on Mondays.
+_DAY0 = np.datetime64("1900-01-01", "D")
+_MONTH0 = np.datetime64("1900-01", "M")
+
+
+class OrderColumns(StoreListener):
+    """NumPy column mirror of the orders store for revenue analytics.
+
+    Each order is one position in parallel arrays: a code per dimension
+    (product and status index label lists; day, week and month count from
+    1900) and quantity, price and total as floats. The mirror watches the
+    store, so it is kept current by the same writes, and a group-by is
+    three ``np.bincount`` passes over one code column: order counts, then
+    revenue and units as weights.
+
+    Code 0 is reserved for removed orders, whose measures are zeroed too,
+    so queries need no mask; the arrays are compacted once more than half
+    of them are removed. Growth and compaction swap in new arrays, so a
+    query keeps reading the arrays it started with.
+    """
+
+    def __init__(self, store: Optional[RecordStore] = None, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._reset()
+        self.key = store.key if store is not None else "id"
+        if store is not None:
+            store.watch(self)
+
+    def _reset(self):
+        self.size = 0
+        self.dead = 0
+        self.labels: dict[str, list[str]] = {"product": [""], "status": [""]}
+        self._codes: dict[str, dict[str, int]] = {"product": {}, "status": {}}
+        self._keys: list[Any] = []
+        self._pos: dict[Any, int] = {}
+        for name in _CODES:
+            setattr(self, name, np.zeros(self._capacity, np.intp))
+        for name in _MEASURES:
+            setattr(self, name, np.zeros(self._capacity, np.float64))
+
+    def _grow(self, needed: int):
+        capacity = len(self.total)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in _CODES + _MEASURES:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def _encode(self, dimension: str, values: Iterable[str]) -> np.ndarray:
+        codes = self._codes[dimension]
+        labels = self.labels[dimension]
+
+        def code(label: str) -> int:
+            found = codes.get(label)
+            if found is None:
+                found = codes[label] = len(labels)
+                labels.append(label)
+            return found
+
+        return np.fromiter(map(code, values), np.intp)
+
+    def _set_dates(self, at: Any, dates: Any):
+        days = np.asarray(dates, dtype="datetime64[D]")
+        day = (days - _DAY0).astype(np.intp)
+        self.day[at] = day + 1
+        self.week[at] = day // 7 + 1
+        months = days.astype("datetime64[M]") - _MONTH0
+        self.month[at] = months.astype(np.intp) + 1
+
+    def append(
+        self,
+        keys: Optional[Sequence[Any]],
+        products: Sequence[str],
+        statuses: Sequence[str],
+        dates: Any,
+        quantity: Any,
+        price: Any,
+        total: Any,
+    ):
+        """Add orders column-wise; ``dates`` are ISO strings or datetime64.
+
+        Rows added with ``keys=None`` cannot be updated or removed later.
+        """
+        count = len(products)
+        with self._lock:
+            start, end = self.size, self.size + count
+            self._grow(end)
+            rows = slice(start, end)
+            self.product[rows] = self._encode("product", products)
+            self.status[rows] = self._encode("status", statuses)
+            self._set_dates(rows, dates)
+            self.quantity[rows] = quantity
+            self.price[rows] = price
+            self.total[rows] = total
+            if keys is None:
+                self._keys.extend([None] * count)
+            else:
+                self._keys.extend(keys)
+                self._pos.update(zip(keys, range(start, end)))
+            self.size = end
+
+    def on_insert(self, records: list):
+        self.append(
+            [r[self.key] for r in records],
+            [r["product_name"] for r in records],
+            [r["status"] for r in records],
+            [r["date"] for r in records],
+            [r["quantity"] for r in records],
+            [r["price"] for r in records],
+            [r["total"] for r in records],
+        )
+
+    def on_update(self, old: Any, new: Any):
+        with self._lock:
+            pos = self._pos.pop(old[self.key], None)
+            if pos is None:
+                return
+            self._pos[new[self.key]] = pos
+            self._keys[pos] = new[self.key]
+            self.product[pos] = self._encode("product", [new["product_name"]])[0]
+            self.status[pos] = self._encode("status", [new["status"]])[0]
+            self._set_dates(pos, new["date"])
+            self.quantity[pos] = new["quantity"]
+            self.price[pos] = new["price"]
+            self.total[pos] = new["total"]
+
+    def on_remove(self, record: Any):
+        with self._lock:
+            pos = self._pos.pop(record[self.key], None)
+            if pos is None:
+                return
+            self._keys[pos] = None
+            for name in _CODES + _MEASURES:
+                getattr(self, name)[pos] = 0
+            self.dead += 1
+            if self.dead * 2 > self.size:
+                self._compact()
+
+    def on_reset(self, records: list):
+        with self._lock:
+            self._reset()
+        self.on_insert(records)
+
+    def _compact(self):
+        live = np.flatnonzero(self.product[: self.size])
+        for name in _CODES + _MEASURES:
+            column = getattr(self, name)
+            compacted = np.zeros(len(column), column.dtype)
+            compacted[: len(live)] = column[live]
+            setattr(self, name, compacted)
+        self._keys = [self._keys[i] for i in live]
+        self._pos = {k: i for i, k in enumerate(self._keys) if k is not None}
+        self.size = len(live)
+        self.dead = 0
+
+    def _snapshot(self, *names: str) -> tuple[int, list[np.ndarray]]:
+        """Live order count and the first ``size`` entries of ``names``."""
+        with self._lock:
+            n = self.size
+            return n - self.dead, [getattr(self, name)[:n] for name in names]
+
+    def totals(self) -> dict[str, float]:
+        """Revenue, units, order count and average order value overall."""
+        orders, (quantity, total) = self._snapshot("quantity", "total")
+        revenue = float(total.sum())
+        return {
+            "revenue": round(revenue, 2),
+            "units": int(quantity.sum()),
+            "orders": orders,
+            "aov": round(revenue / orders, 2) if orders else 0.0,
+        }
+
+    def group_by(self, dimension: str) -> list[dict[str, Any]]:
+        """Revenue, units, orders and AOV per product, status, day, week or month.
+
+        Product and status groups are sorted by revenue, descending; time
+        buckets are sorted oldest first and labelled by their first day
+        (``YYYY-MM`` for months). Weeks start on Monday.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+        _, (codes, quantity, total) = self._snapshot(dimension, "quantity", "total")
+        orders = np.bincount(codes)
+        orders[:1] = 0
+        revenue = np.bincount(codes, weights=total)
+        units = np.bincount(codes, weights=quantity)
+        present = np.flatnonzero(orders)
+        if dimension in ("product", "status"):
+            present = present[np.argsort(-revenue[present], kind="stable")]
+        return [
+            {
+                "key": label,
+                "revenue": round(float(revenue[i]), 2),
+                "units": int(units[i]),
+                "orders": int(orders[i]),
+                "aov": round(float(revenue[i] / orders[i]), 2),
+            }
+            for label, i in zip(self._labels(dimension, present), present)
+        ]
+
+    def _labels(self, dimension: str, codes: np.ndarray) -> list[str]:
+        if dimension in ("product", "status"):
+            return [self.labels[dimension][c] for c in codes]
+        if dimension == "month":
+            return [str(_MONTH0 + (int(c) - 1)) for c in codes]
+        step = 7 if dimension == "week" else 1
+        return [str(_DAY0 + (int(c) - 1) * step) for c in codes]
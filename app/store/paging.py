@@ -0,0 +1,6 @@
+def page_window(page: int, total_pages: int, width: int = 7) -> list[int]:
+    """Page buttons to render: at most ``width`` pages centred on ``page``."""
+    if total_pages <= width:
+        return list(range(1, total_pages + 1))
+    start = min(max(page - width // 2, 1), total_pages - width + 1)
+    return list(range(start, start + width))
@@ -0,0 +1,465 @@
+import asyncio
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, ContextManager, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class Change:
+    """One write to a shared table, as read back from its change feed.
+
+    ``op`` is ``insert``, ``insert_many``, ``update``, ``delete`` or
+    ``reset`` (the table was replaced, read it again); ``key`` is the key
+    value written and ``data`` the new row, or the list of rows for
+    ``insert_many``.
+    """
+
+    position: Optional[str]
+    op: str
+    key: Any = None
+    data: Any = None
+
+
+class StoreBusy(TimeoutError):
+    """Another process held a shared table's lock past the wait."""
+
+
+def feed_version(position: str) -> int:
+    """A feed position (a Redis stream ID, ``ms-seq``) as an increasing int."""
+    ms, _, seq = position.partition("-")
+    return int(ms) * 1_000_000 + int(seq or 0)
+
+
+class Backend:
+    """Durable home of the record stores.
+
+    The in-memory store stays the read path; the backend only sees single-row
+    writes, batched ``insert_many`` for imports and a bulk ``save_all`` used
+    for seeding.
+
+    A ``shared`` backend is written by other processes too. Each of its
+    tables then has a change feed: writes return their position in it,
+    ``changes`` reads the writes other processes made after a position, and
+    ``lock`` excludes the other processes from a table. ``errors`` are the
+    exceptions a lost connection to it raises.
+    """
+
+    shared = False
+    errors: tuple[type[Exception], ...] = (OSError,)
+
+    def load(self, table: str) -> Optional[list[dict]]:
+        """The rows of ``table``, oldest first.
+
+        ``None`` when the table was never saved (``save_all``), so the
+        caller seeds it; a table emptied since loads as ``[]``.
+        """
+        return None
+
+    def save_all(self, table: str, key: str, records: list[dict]) -> Optional[str]:
+        pass
+
+    def insert(self, table: str, key: str, record: dict) -> Optional[str]:
+        pass
+
+    def insert_many(self, table: str, key: str, records: list[dict]) -> Optional[str]:
+        with self.transaction():
+            for record in records:
+                self.insert(table, key, record)
+
+    def update(
+        self, table: str, key: str, key_value: Any, record: dict
+    ) -> Optional[str]:
+        pass
+
+    def delete(self, table: str, key_value: Any) -> Optional[str]:
+        pass
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        yield
+
+    def position(self, table: str) -> Optional[str]:
+        """The position of the last write in the feed of ``table``."""
+        return None
+
+    def changes(self, table: str, after: str) -> Optional[tuple[str, list[Change]]]:
+        """The new position and the writes of other processes since ``after``.
+
+        ``None`` when the feed no longer reaches back to ``after``.
+        """
+        return after, []
+
+    def lock(self, table: str, wait: Optional[float] = None) -> ContextManager:
+        """Exclude other processes from ``table``.
+
+        Waits up to ``wait`` seconds, or a short default that event
+        handlers can afford, then raises ``StoreBusy``.
+        """
+        return contextlib.nullcontext()
+
+    async def wait_for_changes(
+        self, positions: dict[str, str], timeout: float
+    ) -> set[str]:
+        """The tables written after ``positions``, waiting up to ``timeout``."""
+        await asyncio.sleep(timeout)
+        return set()
+
+
+class MemoryBackend(Backend):
+    """No persistence: data is regenerated on every start."""
+
+
+class SQLiteBackend(Backend):
+    """Embedded SQLite in WAL mode, one ``(key, seq, data)`` table per entity.
+
+    ``seq`` keeps the newest-first order of the stores: inserts take the
+    smallest ``seq`` minus one. Statements use fixed SQL with bound
+    parameters so sqlite3's statement cache reuses the prepared plans.
+    The ``_seeded`` table names the tables saved at least once, so an
+    emptied table is not seeded again.
+    """
+
+    BATCH_SIZE = 10_000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS "_seeded" (name TEXT PRIMARY KEY)'
+        )
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._tables: set[str] = set()
+
+    def _ensure_table(self, table: str):
+        if table in self._tables:
+            return
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" '
+            "(key TEXT PRIMARY KEY, seq INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "{table}_seq" ON "{table}" (seq)'
+        )
+        self._tables.add(table)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    def load(self, table: str) -> Optional[list[dict]]:
+        with self._lock:
+            self._ensure_table(table)
+            rows = self._conn.execute(
+                f'SELECT data FROM "{table}" ORDER BY seq'
+            ).fetchall()
+            if rows:
+                # Marks tables saved before ``_seeded`` existed.
+                self._mark_seeded(table)
+            else:
+                seeded = self._conn.execute(
+                    'SELECT 1 FROM "_seeded" WHERE name = ?', (table,)
+                ).fetchone()
+        if not rows:
+            return [] if seeded else None
+        return [json.loads(data) for (data,) in rows]
+
+    def _mark_seeded(self, table: str):
+        self._conn.execute(
+            'INSERT OR IGNORE INTO "_seeded" (name) VALUES (?)', (table,)
+        )
+
+    def save_all(self, table: str, key: str, records: list[dict]):
+        with self.transaction():
+            self._ensure_table(table)
+            self._conn.execute(f'DELETE FROM "{table}"')
+            self._mark_seeded(table)
+            for start in range(0, len(records), self.BATCH_SIZE):
+                chunk = records[start : start + self.BATCH_SIZE]
+                self._conn.executemany(
+                    f'INSERT INTO "{table}" (key, seq, data) VALUES (?, ?, ?)',
+                    ((r[key], start + i, json.dumps(r)) for i, r in enumerate(chunk)),
+                )
+
+    def insert(self, table: str, key: str, record: dict):
+        with self.transaction():
+            self._ensure_table(table)
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO "{table}" (key, seq, data) VALUES '
+                f'(?, (SELECT COALESCE(MIN(seq), 0) - 1 FROM "{table}"), ?)',
+                (record[key], json.dumps(record)),
+            )
+
+    def insert_many(self, table: str, key: str, records: list[dict]):
+        with self.transaction():
+            self._ensure_table(table)
+            (first,) = self._conn.execute(
+                f'SELECT COALESCE(MIN(seq), 0) FROM "{table}"'
+            ).fetchone()
+            for start in range(0, len(records), self.BATCH_SIZE):
+                chunk = records[start : start + self.BATCH_SIZE]
+                self._conn.executemany(
+                    f'INSERT OR REPLACE INTO "{table}" (key, seq, data) '
+                    "VALUES (?, ?, ?)",
+                    (
+                        (r[key], first - 1 - start - i, json.dumps(r))
+                        for i, r in enumerate(chunk)
+                    ),
+                )
+
+    def update(self, table: str, key: str, key_value: Any, record: dict):
+        with self.transaction():
+            self._ensure_table(table)
+            self._conn.execute(
+                f'UPDATE "{table}" SET key = ?, data = ? WHERE key = ?',
+                (record[key], json.dumps(record), key_value),
+            )
+
+    def delete(self, table: str, key_value: Any):
+        with self.transaction():
+            self._ensure_table(table)
+            self._conn.execute(f'DELETE FROM "{table}" WHERE key = ?', (key_value,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisBackend(Backend):
+    """Tables in Redis, shared by every worker process, with a change feed each.
+
+    A table is a hash of JSON rows by key and a sorted set ordering the
+    keys like ``SQLiteBackend``'s ``seq``: inserts take the lowest score
+    minus one, from a counter. The counter outlives the rows, so it also
+    marks a table as seeded once it has been saved. Each write changes the rows and appends to
+    the table's stream in one ``MULTI``, so the stream holds every write
+    once, in commit order. It keeps the last ``FEED_LENGTH`` writes; a reader
+    further behind than that is told to read the table again.
+
+    ``lock`` is a lease on a table across processes: ``SET NX`` with an
+    expiry of ``LOCK_SECONDS``, polled while another process holds it and
+    deleted only by its holder. ``load`` is consistent while it is held.
+    Writers wait at most ``LOCK_WAIT`` for it, since they usually run on the
+    event loop; the lease itself only bounds how long a crashed holder
+    keeps the table.
+    """
+
+    shared = True
+    BATCH_SIZE = 10_000
+    FEED_LENGTH = 10_000
+    LOCK_SECONDS = 60.0
+    LOCK_WAIT = 0.5
+    START = "0-0"
+
+    def __init__(self, url: str, prefix: str = "admin"):
+        from redis import Redis, RedisError
+
+        self.errors = (RedisError, OSError)
+        self.url = url
+        self.prefix = prefix
+        # Marks this process's writes in the feeds, to skip them on reading.
+        self.origin = uuid.uuid4().hex
+        self._client = Redis.from_url(url)
+        self._async_client = None
+
+    def _key(self, table: str, part: str) -> str:
+        return f"{self.prefix}:{table}:{part}"
+
+    def _append(self, pipe, table: str, op: str, key: Any = None, data: Any = None):
+        fields = {
+            "origin": self.origin,
+            "op": op,
+            "key": json.dumps(key),
+            "data": json.dumps(data),
+        }
+        pipe.xadd(self._key(table, "feed"), fields, maxlen=self.FEED_LENGTH)
+
+    @staticmethod
+    def _commit(pipe) -> str:
+        return pipe.execute()[-1].decode()
+
+    def load(self, table: str) -> Optional[list[dict]]:
+        keys = self._client.zrange(self._key(table, "order"), 0, -1)
+        if not keys:
+            return [] if self._client.exists(self._key(table, "head")) else None
+        rows = self._key(table, "rows")
+        records = []
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            values = self._client.hmget(rows, keys[start : start + self.BATCH_SIZE])
+            records += [json.loads(value) for value in values]
+        return records
+
+    def save_all(self, table: str, key: str, records: list[dict]) -> str:
+        rows, order = self._key(table, "rows"), self._key(table, "order")
+        with self._client.pipeline() as pipe:
+            pipe.delete(rows, order)
+            for start in range(0, len(records), self.BATCH_SIZE):
+                chunk = records[start : start + self.BATCH_SIZE]
+                pipe.hset(rows, mapping={str(r[key]): json.dumps(r) for r in chunk})
+                pipe.zadd(order, {str(r[key]): start + i for i, r in enumerate(chunk)})
+            pipe.set(self._key(table, "head"), 0)
+            self._append(pipe, table, "reset")
+            return self._commit(pipe)
+
+    def insert(self, table: str, key: str, record: dict) -> str:
+        seq = self._client.decr(self._key(table, "head"))
+        with self._client.pipeline() as pipe:
+            pipe.hset(self._key(table, "rows"), str(record[key]), json.dumps(record))
+            pipe.zadd(self._key(table, "order"), {str(record[key]): seq})
+            self._append(pipe, table, "insert", record[key], record)
+            return self._commit(pipe)
+
+    def insert_many(self, table: str, key: str, records: list[dict]) -> str:
+        rows, order = self._key(table, "rows"), self._key(table, "order")
+        first = self._client.decrby(self._key(table, "head"), len(records))
+        first += len(records)
+        with self._client.pipeline() as pipe:
+            for start in range(0, len(records), self.BATCH_SIZE):
+                chunk = records[start : start + self.BATCH_SIZE]
+                pipe.hset(rows, mapping={str(r[key]): json.dumps(r) for r in chunk})
+                pipe.zadd(
+                    order,
+                    {str(r[key]): first - 1 - start - i for i, r in enumerate(chunk)},
+                )
+            self._append(pipe, table, "insert_many", data=records)
+            return self._commit(pipe)
+
+    def update(self, table: str, key: str, key_value: Any, record: dict) -> str:
+        rows, order = self._key(table, "rows"), self._key(table, "order")
+        old, new = str(key_value), str(record[key])
+        seq = self._client.zscore(order, old) if new != old else None
+        with self._client.pipeline() as pipe:
+            if new != old:
+                pipe.hdel(rows, old)
+                pipe.zrem(order, old)
+                if seq is not None:
+                    pipe.zadd(order, {new: seq})
+            pipe.hset(rows, new, json.dumps(record))
+            self._append(pipe, table, "update", key_value, record)
+            return self._commit(pipe)
+
+    def delete(self, table: str, key_value: Any) -> str:
+        with self._client.pipeline() as pipe:
+            pipe.hdel(self._key(table, "rows"), str(key_value))
+            pipe.zrem(self._key(table, "order"), str(key_value))
+            self._append(pipe, table, "delete", key_value)
+            return self._commit(pipe)
+
+    def position(self, table: str) -> str:
+        last = self._client.xrevrange(self._key(table, "feed"), count=1)
+        return last[0][0].decode() if last else self.START
+
+    def changes(self, table: str, after: str) -> Optional[tuple[str, list[Change]]]:
+        feed = self._key(table, "feed")
+        with self._client.pipeline(transaction=False) as pipe:
+            pipe.xrange(feed, count=1)
+            pipe.xrange(feed, min="-" if after == self.START else f"({after}")
+            oldest, entries = pipe.execute()
+        if (
+            oldest
+            and after != self.START
+            and feed_version(oldest[0][0].decode()) > feed_version(after)
+        ):
+            return None
+        position, changes = after, []
+        for entry_id, fields in entries:
+            position = entry_id.decode()
+            if fields[b"origin"].decode() != self.origin:
+                changes.append(
+                    Change(
+                        position,
+                        fields[b"op"].decode(),
+                        json.loads(fields[b"key"]),
+                        json.loads(fields[b"data"]),
+                    )
+                )
+        return position, changes
+
+    @contextlib.contextmanager
+    def lock(self, table: str, wait: Optional[float] = None) -> Iterator[None]:
+        key, token = self._key(table, "lock"), uuid.uuid4().hex.encode()
+        lease = int(self.LOCK_SECONDS * 1000)
+        deadline = time.monotonic() + (self.LOCK_WAIT if wait is None else wait)
+        delay = 0.001
+        while not self._client.set(key, token, nx=True, px=lease):
+            if time.monotonic() > deadline:
+                raise StoreBusy(f"{table} is being changed by another worker")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.02)
+        try:
+            yield
+        finally:
+
+            def release(pipe):
+                if pipe.get(key) == token:
+                    pipe.multi()
+                    pipe.delete(key)
+
+            self._client.transaction(release, key)
+
+    async def wait_for_changes(
+        self, positions: dict[str, str], timeout: float
+    ) -> set[str]:
+        if not positions:
+            await asyncio.sleep(timeout)
+            return set()
+        if self._async_client is None:
+            from redis.asyncio import Redis
+
+            self._async_client = Redis.from_url(self.url)
+        streams = {self._key(table, "feed"): p for table, p in positions.items()}
+        reply = await self._async_client.xread(
+            streams, count=1, block=int(timeout * 1000)
+        )
+        prefix, suffix = len(self.prefix) + 1, len(":feed")
+        return {name.decode()[prefix:-suffix] for name, _ in reply or []}
+
+
+_backend: Optional[Backend] = None
+
+
+def get_backend() -> Backend:
+    """The process backend, chosen by ``ADMIN_STORE_BACKEND`` (memory|sqlite|redis).
+
+    The SQLite file defaults to ``admin.db`` and can be moved with
+    ``ADMIN_SQLITE_PATH``. Redis is found at ``ADMIN_REDIS_URL``, else at the
+    ``REFLEX_REDIS_URL`` the state manager uses.
+    """
+    global _backend
+    if _backend is None:
+        kind = os.environ.get("ADMIN_STORE_BACKEND", "memory").lower()
+        if kind == "sqlite":
+            _backend = SQLiteBackend(os.environ.get("ADMIN_SQLITE_PATH", "admin.db"))
+        elif kind == "redis":
+            _backend = RedisBackend(
+                os.environ.get("ADMIN_REDIS_URL")
+                or os.environ.get("REFLEX_REDIS_URL", "redis://localhost:6379/0")
+            )
+        elif kind == "memory":
+            _backend = MemoryBackend()
+        else:
+            raise ValueError(f"Unknown ADMIN_STORE_BACKEND: {kind}")
+    return _backend
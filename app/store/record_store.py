@@ -0,0 +1,585 @@
+import asyncio
+import contextlib
+import threading
+from bisect import bisect_left, bisect_right
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Generic,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from reflex.utils import console
+
+from app.store.keyed_collection import KeyedCollection
+from app.store.persistence import Backend, Change, feed_version, get_backend
+from app.store.result_cache import result_cache
+from app.store.search_session import SearchSessions
+from app.store.trigram_index import TrigramIndex
+
+R = TypeVar("R")
+
+FOLLOW_TIMEOUT = 1.0
+# Reading a table in may wait on another process seeding it.
+LOAD_LOCK_WAIT = 60.0
+
+_stores: dict[str, "RecordStore"] = {}
+
+
+class StoreListener:
+    """Told about every write to a ``RecordStore`` it watches.
+
+    Calls happen after the write is applied, while the store lock is held,
+    so listeners see writes in order and must stay quick.
+    """
+
+    def on_insert(self, records: list):
+        pass
+
+    def on_update(self, old: Any, new: Any):
+        pass
+
+    def on_remove(self, record: Any):
+        pass
+
+    def on_reset(self, records: list):
+        pass
+
+
+class _SharedLock:
+    """The lock of a store on a shared backend, held across processes.
+
+    Reentrant like the in-process lock it wraps. The outermost acquire
+    also takes the backend's lock on the table and then catches the store
+    up with the writes other processes made, so whatever runs under it
+    reads current rows and writes on top of them. Writers get the backend's
+    short wait and ``StoreBusy`` past it; reading the rows in waits longer.
+    """
+
+    def __init__(self, store: "RecordStore"):
+        self._store = store
+        self._depth = 0
+        self._held = contextlib.ExitStack()
+
+    def __enter__(self):
+        self._store._local.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                wait = LOAD_LOCK_WAIT if self._store._collection is None else None
+                self._held.enter_context(
+                    self._store.backend.lock(self._store.name, wait)
+                )
+                self._store._catch_up()
+            except BaseException:
+                self._held.close()
+                self._depth -= 1
+                self._store._local.release()
+                raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if self._depth == 1:
+                self._held.close()
+        finally:
+            self._depth -= 1
+            self._store._local.release()
+
+
+class RecordStore(Generic[R]):
+    """Holds one entity table once per process, shared by every session.
+
+    Session states keep only their view parameters (query, page, selection)
+    and read rows from here. Every mutation bumps ``version`` so states can
+    invalidate their computed vars; ``shape_version`` only moves when the
+    set of rows or their searchable text changes, which is all that counts
+    and search results depend on. Mutations are written through to the
+    backend as single-row statements. Rows are read in on first use (or by
+    ``load``) rather than when the store is created, and ``seed`` only runs
+    when the backend has never saved this table: a table emptied by its
+    users stays empty.
+
+    Rows live in a ``KeyedCollection`` and are listed newest first. Each row
+    gets an increasing ``seq`` when it is added and the live seqs are kept
+    sorted, so lookups by key are hashed and pages are fetched by keyset
+    (an anchor seq) instead of by offset.
+
+    A search query matches rows where it is a case-insensitive substring of
+    any of ``search_fields``; a trigram index answers queries of three or
+    more characters without scanning the table. Passing a ``session`` id
+    lets a query that extends that session's previous one narrow the
+    previous matches instead. Pages and counts are memoised in the shared
+    ``result_cache`` under the version they depend on.
+
+    Writes may come from worker threads (imports, merges, expiry), so
+    reads that walk the rows take the in-process lock as well: pages,
+    anchors and counts while they are computed, iteration batch by batch.
+
+    Derived in-process views of a table (column mirrors, aggregates)
+    ``watch`` the store and are told about each write as it happens, and
+    about the rows themselves once they are loaded.
+
+    On a ``shared`` backend, several processes hold the same table. The
+    store lock is then also a lock across them, and taking it first applies
+    the writes the others made since (``catch_up``); between writes the
+    ``follow_stores`` lifespan task applies them as they arrive. Versions
+    are the position of the last write in the table's change feed, so they
+    mean the same rows in every process. Listeners are told about replayed
+    writes like local ones, with ``replaying`` set: the process that made
+    the write already stored whatever they derive from it. Tables a
+    listener keeps of its own can be replicated along with the store's
+    through ``follow``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        seed: Callable[[], list[R]],
+        backend: Optional[Backend] = None,
+        search_fields: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.key = key
+        self.search_fields = search_fields
+        self.version = 0
+        self.shape_version = 0
+        self._index = TrigramIndex(search_fields)
+        self.searches = SearchSessions()
+        self.backend = backend or get_backend()
+        self._local = threading.RLock()
+        self._lock = _SharedLock(self) if self.backend.shared else self._local
+        self.replaying = False
+        # Feed position applied so far, per table: this one and those followed.
+        self._positions: dict[str, str] = {}
+        self._followers: dict[str, Callable[[Change], None]] = {}
+        self._listeners: list[StoreListener] = []
+        self._seed = seed
+        self._collection: Optional[KeyedCollection[R]] = None
+        # Next number ``next_key`` hands out, per key prefix.
+        self._counters: dict[str, int] = {}
+        _stores[name] = self
+
+    def load(self):
+        """Read the rows in from the backend, seeding it first if it never held them.
+
+        Runs once, on first use of the rows; listeners already watching
+        are then replayed the loaded rows.
+        """
+        if self._collection is not None:
+            return
+        with self._lock:
+            if self._collection is not None:
+                return
+            position = self.backend.position(self.name)
+            records = self.backend.load(self.name)
+            if records is None:
+                records = self._seed()
+                position = self.backend.save_all(self.name, self.key, records)
+            self._load(records)
+            if position is not None:
+                self.version = self.shape_version = self._at(position)
+            for listener in self._listeners:
+                listener.on_reset(records)
+
+    @property
+    def _rows(self) -> KeyedCollection[R]:
+        if self._collection is None:
+            self.load()
+        return self._collection
+
+    def _load(self, records: list[R]):
+        rows: KeyedCollection[R] = KeyedCollection(self.key, reversed(records))
+        self._index.rebuild(rows.items())
+        self._collection = rows
+
+    def _reindex(self):
+        if self._index.needs_rebuild:
+            self._index.rebuild(self._rows.items())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key_value: Any) -> bool:
+        return key_value in self._rows
+
+    def __iter__(self) -> Iterator[R]:
+        return self.iter_matching()
+
+    @property
+    def records(self) -> list[R]:
+        return list(self)
+
+    def first(self) -> Optional[R]:
+        with self._local:
+            order = self._rows.order
+            return self._rows.at(order[-1]) if order else None
+
+    def first_key(self) -> str:
+        first = self.first()
+        return first[self.key] if first else ""
+
+    def get(self, key_value: Any) -> Optional[R]:
+        return self._rows.get(key_value)
+
+    def next_key(self, prefix: str, first: int = 1) -> str:
+        """A free key ``<prefix><n>``, with ``n`` counting up per prefix.
+
+        The first call scans the keys once to start past the highest
+        ``<prefix><n>`` present (and at ``first`` at least); keys taken
+        since, such as by another process, are skipped.
+        """
+        with self._lock:
+            n = self._counters.get(prefix)
+            if n is None:
+                n = first
+                for record in self._rows:
+                    suffix = str(record[self.key])[len(prefix) :]
+                    if str(record[self.key]).startswith(prefix) and suffix.isdigit():
+                        n = max(n, int(suffix) + 1)
+            while f"{prefix}{n}" in self._rows:
+                n += 1
+            self._counters[prefix] = n + 1
+            return f"{prefix}{n}"
+
+    def locked(self) -> ContextManager:
+        """The store lock, for reading rows consistently with a listener.
+
+        Loads the rows first, so listeners have been replayed them.
+        """
+        self.load()
+        return self._lock
+
+    def watch(self, listener: StoreListener):
+        """Register ``listener`` for writes, replaying the rows if loaded."""
+        with self._local:
+            if self._collection is not None:
+                listener.on_reset(self.records)
+            self._listeners.append(listener)
+
+    def follow(self, table: str, replay: Callable[[Change], None]):
+        """Replicate the backend ``table`` kept alongside this store.
+
+        ``replay`` is called with a ``reset`` change now, to read the table
+        in, and on a shared backend with each write other processes make to
+        it, while the store lock is held.
+        """
+        with self._lock:
+            position = self.backend.position(table)
+            replay(Change(position, "reset"))
+            if position is not None:
+                self._positions[table] = position
+                self._followers[table] = replay
+
+    def positions(self) -> dict[str, str]:
+        """The feed position applied so far of each table replicated here."""
+        return dict(self._positions)
+
+    def _at(self, position: Optional[str]) -> Optional[int]:
+        """Record ``position`` as applied; the version it stands for."""
+        if position is None:
+            return None
+        self._positions[self.name] = position
+        return feed_version(position)
+
+    def _bump(self, shape: bool = True, version: Optional[int] = None):
+        self.version = self.version + 1 if version is None else version
+        if shape:
+            self.shape_version = self.version
+
+    def _inserted(self, records: list[R], position: Optional[str]):
+        self._bump(version=self._at(position))
+        for listener in self._listeners:
+            listener.on_insert(records)
+
+    def _updated(self, current: R, updated: R, position: Optional[str]):
+        shape = any(current[f] != updated[f] for f in self.search_fields)
+        self._bump(shape, self._at(position))
+        for listener in self._listeners:
+            listener.on_update(current, updated)
+
+    def _removed(self, record: R, position: Optional[str]):
+        self._bump(version=self._at(position))
+        for listener in self._listeners:
+            listener.on_remove(record)
+
+    def _reset(self, records: list[R], position: Optional[str]):
+        self._bump(version=self._at(position))
+        for listener in self._listeners:
+            listener.on_reset(records)
+
+    def _replay(self, change: Change):
+        """Apply a write another process made to this table.
+
+        Tolerant of writes already reflected in the rows, as after reading
+        the table in again: an insert of a present key updates it, and
+        updates and deletes of missing keys are dropped.
+        """
+        if change.op == "reset":
+            records = self.backend.load(self.name) or []
+            self._load(records)
+            self._reset(records, change.position)
+            return
+        if change.op in ("insert", "insert_many"):
+            records = [change.data] if change.op == "insert" else change.data
+            added = []
+            for record in records:
+                current = self._rows.get(record[self.key])
+                if current is None:
+                    self._index.add(self._rows.append(record), record)
+                    added.append(record)
+                else:
+                    self._replace(record[self.key], record)
+                    self._updated(current, record, change.position)
+            if added:
+                self._inserted(added, change.position)
+            return
+        current = self._rows.get(change.key)
+        if current is None:
+            return
+        if change.op == "update":
+            self._replace(change.key, change.data)
+            self._updated(current, change.data, change.position)
+        elif change.op == "delete":
+            self._drop(change.key)
+            self._removed(current, change.position)
+
+    def _follow(self, table: str, replay: Callable[[Change], None]) -> bool:
+        read = self.backend.changes(table, self._positions[table])
+        if read is None:
+            # Too far behind for the feed: read the whole table again.
+            position = self.backend.position(table)
+            read = position, [Change(position, "reset")]
+        position, changes = read
+        self.replaying = True
+        try:
+            for change in changes:
+                replay(change)
+        finally:
+            self.replaying = False
+        self._positions[table] = position
+        return bool(changes)
+
+    def _catch_up(self) -> bool:
+        changed = False
+        if self._collection is not None and self.name in self._positions:
+            changed = self._follow(self.name, self._replay)
+        for table, replay in self._followers.items():
+            self._follow(table, replay)
+        return changed
+
+    def catch_up(self) -> bool:
+        """Apply the writes other processes made; whether the rows changed."""
+        with self._local:
+            return self._catch_up()
+
+    def _replace(self, key_value: Any, updated: R):
+        seq = self._rows.replace(key_value, updated)
+        self._index.update(seq, updated)
+        self._reindex()
+
+    def _drop(self, key_value: Any):
+        self._index.remove(self._rows.remove(key_value))
+        self._reindex()
+
+    def insert(self, record: R) -> R:
+        with self._lock:
+            self._index.add(self._rows.append(record), record)
+            position = self.backend.insert(self.name, self.key, record)
+            self._inserted([record], position)
+        return record
+
+    def insert_many(self, records: list[R]) -> int:
+        """Insert ``records`` in one write; the last one ends up newest.
+
+        Raises ``ValueError`` without inserting anything if a key is
+        already taken or repeated.
+        """
+        with self._lock:
+            keys = {record[self.key] for record in records}
+            if len(keys) < len(records) or any(k in self._rows for k in keys):
+                raise ValueError(f"Duplicate key in batch for {self.name}")
+            for record in records:
+                self._index.add(self._rows.append(record), record)
+            position = self.backend.insert_many(self.name, self.key, records)
+            self._inserted(records, position)
+        return len(records)
+
+    def update(self, key_value: Any, changes: dict) -> Optional[R]:
+        with self._lock:
+            current = self._rows.get(key_value)
+            if current is None:
+                return None
+            updated = current.copy()
+            updated.update(changes)
+            self._replace(key_value, updated)
+            position = self.backend.update(self.name, self.key, key_value, updated)
+            self._updated(current, updated, position)
+            return updated
+
+    def remove(self, key_value: Any) -> bool:
+        with self._lock:
+            record = self._rows.get(key_value)
+            if record is None:
+                return False
+            self._drop(key_value)
+            self._removed(record, self.backend.delete(self.name, key_value))
+            return True
+
+    def replace_all(self, records: list[R]):
+        with self._lock:
+            self._load(records)
+            self._reset(records, self.backend.save_all(self.name, self.key, records))
+
+    def matching(
+        self,
+        query: str = "",
+        session: str = "",
+        stop: Optional[threading.Event] = None,
+    ) -> list[int]:
+        """Sorted seqs of the rows matching ``query`` (all rows when empty).
+
+        Without a query this is the live seq list, which writes change in
+        place; read it under the store lock. Setting ``stop`` cuts the
+        search short with ``SearchCancelled``.
+        """
+        with self._local:
+            order = self._rows.order
+            if not query:
+                return order
+            if not session:
+                return self._index.search(query, order, stop=stop)
+            return self.searches.matching(
+                session,
+                query.lower(),
+                self.shape_version,
+                lambda within: self._index.search(query, order, within, stop),
+            )
+
+    def iter_matching(
+        self,
+        query: str = "",
+        session: str = "",
+        batch: int = 1000,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[R]:
+        """Every row matching ``query``, newest first, read lazily.
+
+        Rows are fetched ``batch`` at a time by keyset, so memory does not
+        grow with the result. Rows added after the walk started are not
+        included and rows removed before they are reached are skipped.
+        """
+        seqs = self.matching(query, session, stop)
+        anchor = None
+        while True:
+            with self._local:
+                end = len(seqs) if anchor is None else bisect_left(seqs, anchor)
+                chunk = seqs[max(end - batch, 0) : end]
+                rows = [self._rows.get_at(seq) for seq in reversed(chunk)]
+            if not chunk:
+                return
+            anchor = chunk[0]
+            for row in rows:
+                if row is not None:
+                    yield row
+
+    def window(
+        self, anchor: int, limit: int, query: str = "", session: str = ""
+    ) -> list[R]:
+        """Up to ``limit`` rows at or older than ``anchor``, newest first.
+
+        An anchor of 0 means the newest row.
+        """
+
+        def compute() -> list[R]:
+            seqs = self.matching(query, session)
+            end = bisect_right(seqs, anchor) if anchor else len(seqs)
+            at = self._rows.at
+            return [at(seq) for seq in reversed(seqs[max(end - limit, 0) : end])]
+
+        with self._local:
+            key = (self.name, self.version, query.lower(), "newest", anchor, limit)
+            return result_cache.get_or_compute(key, compute)
+
+    def seek(self, anchor: int, steps: int, query: str = "", session: str = "") -> int:
+        """The anchor ``steps`` rows older (positive) or newer (negative).
+
+        Moving newer past the newest row returns 0 (the top); moving older
+        past the oldest row keeps ``anchor``.
+        """
+        with self._local:
+            seqs = self.matching(query, session)
+            end = bisect_right(seqs, anchor) if anchor else len(seqs)
+            target = end - 1 - steps
+            if target >= len(seqs) - 1 or not seqs:
+                return 0
+            if target < 0:
+                return anchor
+            return seqs[target]
+
+    def nth(self, offset: int, query: str = "", session: str = "") -> int:
+        """Anchor of the row ``offset`` positions below the newest (0 = top)."""
+        if offset <= 0:
+            return 0
+        with self._local:
+            seqs = self.matching(query, session)
+            if not seqs:
+                return 0
+            return seqs[max(len(seqs) - 1 - offset, 0)]
+
+    def count(self, query: str = "", session: str = "") -> int:
+        with self._local:
+            key = (self.name, self.shape_version, query.lower(), "count")
+            return result_cache.get_or_compute(
+                key, lambda: len(self.matching(query, session))
+            )
+
+
+def get_store(name: str) -> RecordStore:
+    return _stores[name]
+
+
+def all_stores() -> dict[str, RecordStore]:
+    return dict(_stores)
+
+
+async def load_stores():
+    """Load every store on a worker thread, so the first request need not."""
+    for store in all_stores().values():
+        await asyncio.to_thread(store.load)
+
+
+async def follow_stores(notify: Callable[[set[str]], Awaitable[None]]):
+    """Lifespan task applying other processes' writes to the shared stores.
+
+    Waits on the change feeds of every table the shared stores replicate,
+    catches up the stores written to and passes ``notify`` the names of
+    those whose rows changed. Returns at once when no store is shared.
+    Connection errors of the backend are logged and retried; anything else
+    ends the task with its traceback.
+    """
+    stores = [store for store in all_stores().values() if store.backend.shared]
+    if not stores:
+        return
+    backend = stores[0].backend
+    while True:
+        try:
+            owners, positions = {}, {}
+            for store in stores:
+                for table, position in store.positions().items():
+                    owners[table], positions[table] = store, position
+            written = await backend.wait_for_changes(positions, FOLLOW_TIMEOUT)
+            changed = set()
+            for store in {owners[table] for table in written}:
+                if await asyncio.to_thread(store.catch_up):
+                    changed.add(store.name)
+            if changed:
+                await notify(changed)
+        except backend.errors as error:
+            console.error(f"Following the shared stores failed, retrying: {error!r}")
+            await asyncio.sleep(FOLLOW_TIMEOUT)
@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Any, Optional
+
+from app.store.record_store import RecordStore
+
+
+class RedemptionError(ValueError):
+    """A coupon code that cannot be redeemed; ``status`` says why."""
+
+    def __init__(self, code: str, status: str):
+        self.code = code
+        self.status = status
+        super().__init__(f"Coupon {code} is {status.lower()}")
+
+
+def coupon_status(coupon: Any, today: Optional[str] = None) -> str:
+    """Active, Expired (past ``expiry_date``) or Exhausted (``used`` at ``limit``)."""
+    today = today or date.today().isoformat()
+    if coupon["expiry_date"] < today:
+        return "Expired"
+    if coupon["used"] >= coupon["limit"]:
+        return "Exhausted"
+    return "Active"
+
+
+class CouponRedeemer:
+    """Validates and redeems coupon codes against the coupons store.
+
+    The store is keyed by code, so each lookup is one hash probe. A
+    redemption checks expiry and usage and increments ``used`` while
+    holding the store lock, which makes the check-and-increment atomic
+    against concurrent redeemers and against every other write to the
+    table: ``limit`` is never overrun. Status is derived from the fields
+    rather than trusted, and written back the moment it changes: the
+    redemption that reaches ``limit`` marks the coupon Exhausted, and an
+    attempt after ``expiry_date`` marks it Expired if the coupons'
+    ``ExpiryScheduler`` has not yet.
+    """
+
+    def __init__(self, store: RecordStore):
+        self.store = store
+
+    def validate(self, code: str, today: Optional[str] = None) -> Any:
+        """The coupon for ``code`` if it can be redeemed now.
+
+        Raises ``KeyError`` for an unknown code and ``RedemptionError``
+        otherwise.
+        """
+        coupon = self.store.get(code.strip().upper())
+        if coupon is None:
+            raise KeyError(code)
+        status = coupon_status(coupon, today)
+        if status != "Active":
+            raise RedemptionError(coupon["code"], status)
+        return coupon
+
+    def redeem(self, code: str, today: Optional[str] = None) -> Any:
+        """Use ``code`` once and return the updated coupon.
+
+        Raises like ``validate``; a refused redemption still records a
+        status change it discovered.
+        """
+        with self.store.locked():
+            try:
+                coupon = self.validate(code, today)
+            except RedemptionError as error:
+                if self.store.get(error.code)["status"] != error.status:
+                    self.store.update(error.code, {"status": error.status})
+                raise
+            used = coupon["used"] + 1
+            changes = {"used": used}
+            status = "Exhausted" if used >= coupon["limit"] else "Active"
+            if status != coupon["status"]:
+                changes["status"] = status
+            return self.store.update(coupon["code"], changes)
@@ -0,0 +1,66 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.store.metrics import Gauge, registry
+
+
+class ResultCache:
+    """Bounded LRU of query results shared by every session and store.
+
+    Keys carry the store's data version, so a write makes every older entry
+    unreachable; those entries then age out of the LRU. ``hits`` and
+    ``misses`` are kept for sizing ``capacity``, and served with the size
+    on ``/metrics`` as ``admin_result_cache``.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+            }
+
+
+result_cache = ResultCache(int(os.environ.get("ADMIN_RESULT_CACHE_SIZE", "4096")))
+
+
+def _collect(gauge: Gauge):
+    for stat, value in result_cache.stats().items():
+        gauge.set(value, stat)
+
+
+registry.gauge(
+    "admin_result_cache",
+    "Hits and misses since start, entries held and capacity of the result cache.",
+    ("stat",),
+    _collect,
+)
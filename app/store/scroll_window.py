@@ -0,0 +1,100 @@
+from typing import Iterator
+
+from app.store.record_store import RecordStore
+
+ROW_HEIGHT = 73
+VIEWPORT_ROWS = 8
+OVERSCAN_ROWS = 8
+CHUNK_ROWS = 25
+MAX_CHUNKS = 4
+# Browsers cap element heights (about 17.9M px in Firefox, 33.5M px in
+# Chrome); longer results are squeezed into this many pixels.
+MAX_SCROLL_HEIGHT = 10_000_000
+
+
+def chunk_rows(
+    store: RecordStore, offset: int, chunks: int, query: str = "", session: str = ""
+) -> list:
+    """Rows of ``chunks`` consecutive chunks from ``offset``, newest first.
+
+    Each chunk is read as its own window, so chunks a session already holds
+    are served from the result cache.
+    """
+    rows = []
+    for start in range(offset, offset + chunks * CHUNK_ROWS, CHUNK_ROWS):
+        anchor = store.nth(start, query, session)
+        rows.extend(store.window(anchor, CHUNK_ROWS, query, session))
+    return rows
+
+
+def scroll_scale(total: int) -> float:
+    """Rows scrolled per row of scrollbar for a result of ``total`` rows.
+
+    1 while the rows fit in ``MAX_SCROLL_HEIGHT``. Past that the spacers
+    shrink the table to ``MAX_SCROLL_HEIGHT`` and a scroll position stands
+    for one ``scale`` times further down, picked so the bottom of the
+    scrollbar still reaches the last rows.
+    """
+    height = total * ROW_HEIGHT
+    if height <= MAX_SCROLL_HEIGHT:
+        return 1.0
+    view = VIEWPORT_ROWS * ROW_HEIGHT
+    return (height - view) / (MAX_SCROLL_HEIGHT - view)
+
+
+def scroll_row_top(scroll_top: float, total: int) -> int:
+    """The unscaled position of the rows shown at ``scroll_top``."""
+    return int(scroll_top * scroll_scale(total))
+
+
+def scroll_pads(
+    offset: int, held: int, total: int, scroll_top: float
+) -> tuple[int, int]:
+    """Heights of the spacers above and below ``held`` rows from ``offset``.
+
+    Unscaled the spacers are as tall as the rows they stand for. Scaled,
+    the held rows are placed so the row belonging to ``scroll_top`` sits at
+    ``scroll_top``, and the bottom spacer ends the table at
+    ``MAX_SCROLL_HEIGHT``.
+    """
+    scale = scroll_scale(total)
+    top = max(round(offset * ROW_HEIGHT - scroll_top * (scale - 1)), 0)
+    height = min(total * ROW_HEIGHT, MAX_SCROLL_HEIGHT)
+    return top, max(height - top - held * ROW_HEIGHT, 0)
+
+
+def stream_chunks(
+    offset: int, chunks: int, scroll_top: int, total: int
+) -> Iterator[tuple[int, int]]:
+    """Grow the held chunks one at a time until they cover the viewport.
+
+    A session holds ``chunks`` consecutive chunks of ``CHUNK_ROWS`` rows
+    from row ``offset``. For each chunk missing around the viewport at
+    ``scroll_top`` (unscaled, see ``scroll_row_top``), plus
+    ``OVERSCAN_ROWS`` either side, the new ``(offset, chunks)`` is yielded,
+    so callers can push every chunk as it arrives. At most ``MAX_CHUNKS`` are held: the chunk on the far side
+    from the one just added is dropped, and a jump past the held range
+    starts over. Yields nothing when the viewport is already covered.
+    """
+    top = max(scroll_top // ROW_HEIGHT - OVERSCAN_ROWS, 0)
+    bottom = min(scroll_top // ROW_HEIGHT + VIEWPORT_ROWS + OVERSCAN_ROWS, total)
+    if top >= bottom:
+        return
+    first, last = top // CHUNK_ROWS, (bottom - 1) // CHUNK_ROWS
+    held_first = offset // CHUNK_ROWS
+    held_last = held_first + chunks - 1
+    if not chunks or last < held_first - 1 or first > held_last + 1:
+        held_first, held_last = first, first - 1
+    wanted = range(first, last + 1)
+    if first < held_first:
+        wanted = reversed(wanted)
+    for chunk in wanted:
+        if held_first <= chunk <= held_last:
+            continue
+        if chunk < held_first:
+            held_first = chunk
+            held_last = min(held_last, held_first + MAX_CHUNKS - 1)
+        else:
+            held_last = chunk
+            held_first = max(held_first, held_last - MAX_CHUNKS + 1)
+        yield held_first * CHUNK_ROWS, held_last - held_first + 1
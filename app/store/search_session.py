@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class SearchStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, elapsed: float):
+        self.calls += 1
+        self.seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.seconds / self.calls * 1000 if self.calls else 0.0
+
+
+class SearchSessions:
+    """Remembers the last search of each session on one store.
+
+    When a session's new query extends its previous one and the table is
+    unchanged, the new matches are a subset of the old ones, so only those
+    are re-checked. A shortened or unrelated query, or any write to the
+    table, runs a full indexed search instead. ``stats`` times every lookup
+    by how it was answered (hit / refine / full).
+
+    Memory is bounded by size as well as by count: results over
+    ``max_rows`` are not kept, and the least recently used sessions are
+    dropped once more than ``capacity`` sessions or ``max_total`` rows are
+    held.
+    """
+
+    def __init__(
+        self, capacity: int = 256, max_rows: int = 20_000, max_total: int = 200_000
+    ):
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self.max_total = max_total
+        self._entries: OrderedDict[str, tuple[str, int, list[int]]] = OrderedDict()
+        self._total = 0
+        self.stats = {kind: SearchStats() for kind in ("hit", "refine", "full")}
+
+    def matching(
+        self,
+        session: str,
+        query: str,
+        version: int,
+        search: Callable[[Optional[list[int]]], list[int]],
+    ) -> list[int]:
+        start = time.perf_counter()
+        entry = self._entries.get(session)
+        if entry is not None and entry[1] == version and entry[0] == query:
+            kind, seqs = "hit", entry[2]
+        elif entry is not None and entry[1] == version and query.startswith(entry[0]):
+            kind, seqs = "refine", search(entry[2])
+        else:
+            kind, seqs = "full", search(None)
+        self._drop(session)
+        if len(seqs) <= self.max_rows:
+            self._entries[session] = (query, version, seqs)
+            self._total += len(seqs)
+            while len(self._entries) > self.capacity or self._total > self.max_total:
+                self._drop(next(iter(self._entries)))
+        self.stats[kind].record(time.perf_counter() - start)
+        return seqs
+
+    def _drop(self, session: str):
+        entry = self._entries.pop(session, None)
+        if entry is not None:
+            self._total -= len(entry[2])
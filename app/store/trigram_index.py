@@ -0,0 +1,129 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, Optional
+
+STOP_CHECK_EVERY = 4096
+
+
+class SearchCancelled(Exception):
+    """A search was stopped through its ``stop`` event before it finished."""
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from every 3-character substring of some fields to seqs.
+
+    Posting lists are sorted ``array("I")`` runs of seqs. New rows always get
+    the largest seq so adding is an append. Deletes and edits are lazy: old
+    entries stay in place and fail verification against ``_texts`` (the
+    lowercased, NUL-joined search fields of each live row), and the postings
+    are rebuilt once stale entries dominate.
+    """
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = fields
+        self._postings: dict[str, array] = {}
+        self._texts: dict[int, str] = {}
+        self._entries = 0
+        self._stale = 0
+
+    def _text(self, record: Any) -> str:
+        return "\0".join(str(record[field]).lower() for field in self.fields)
+
+    def _insert(self, gram: str, seq: int):
+        posting = self._postings.get(gram)
+        if posting is None:
+            posting = self._postings[gram] = array("I")
+        if not posting or posting[-1] < seq:
+            posting.append(seq)
+        else:
+            i = bisect_left(posting, seq)
+            if i < len(posting) and posting[i] == seq:
+                return
+            posting.insert(i, seq)
+        self._entries += 1
+
+    def add(self, seq: int, record: Any):
+        text = self._texts[seq] = self._text(record)
+        postings = self._postings
+        appended = 0
+        for gram in trigrams(text):
+            if "\0" in gram:
+                continue
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array("I", (seq,))
+            elif posting[-1] < seq:
+                posting.append(seq)
+            else:
+                self._insert(gram, seq)
+                continue
+            appended += 1
+        self._entries += appended
+
+    def update(self, seq: int, record: Any):
+        old_grams = trigrams(self._texts.get(seq, ""))
+        text = self._texts[seq] = self._text(record)
+        new_grams = trigrams(text)
+        for gram in new_grams - old_grams:
+            if "\0" not in gram:
+                self._insert(gram, seq)
+        self._stale += len(old_grams - new_grams)
+
+    def remove(self, seq: int):
+        self._stale += len(trigrams(self._texts.pop(seq, "")))
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self._stale > 1024 and self._stale * 2 > self._entries
+
+    def rebuild(self, rows: Iterable[tuple[int, Any]]):
+        self._postings = {}
+        self._texts = {}
+        self._entries = 0
+        self._stale = 0
+        for seq, record in rows:
+            self.add(seq, record)
+
+    def search(
+        self,
+        query: str,
+        order: list[int],
+        within: Optional[list[int]] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> list[int]:
+        """Sorted seqs whose fields contain ``query`` as a substring.
+
+        Candidates come from the rarest trigram's posting list, or from
+        ``within`` (a previous, broader result) when that is smaller, and
+        each one is verified against its text. The cost therefore follows
+        the candidate list rather than the table. Queries shorter than a
+        trigram with no ``within`` scan ``order``.
+
+        With ``stop``, the candidates are verified ``STOP_CHECK_EVERY`` at a
+        time and ``SearchCancelled`` is raised once it is set.
+        """
+        query = query.lower()
+        texts = self._texts
+        candidates = within
+        for gram in trigrams(query):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        if candidates is None:
+            candidates = order
+        if stop is None:
+            return [seq for seq in candidates if query in texts.get(seq, "")]
+        found = []
+        for start in range(0, len(candidates), STOP_CHECK_EVERY):
+            if stop.is_set():
+                raise SearchCancelled(query)
+            block = candidates[start : start + STOP_CHECK_EVERY]
+            found.extend(seq for seq in block if query in texts.get(seq, ""))
+        return found
@@ -0,0 +1,42 @@
+import random
+
+from app.store.record_store import RecordStore
+
+
+def scale_store(store: RecordStore, rows: int, seed_records: list | None = None):
+    """Refill ``store`` with ``rows`` copies of its seed rows under unique keys."""
+    seed = seed_records or list(store.records)
+    scaled = []
+    for i in range(rows):
+        record = dict(seed[i % len(seed)])
+        record[store.key] = f"{record[store.key]}-{i}"
+        scaled.append(record)
+    store.replace_all(scaled)
+    return seed
+
+
+FIRST = ["alice", "bob", "carol", "david", "eva", "frank", "grace", "henry", "isabel"]
+LAST = ["smith", "johnson", "williams", "brown", "davis", "miller", "wilson", "moore"]
+COMPANIES = ["Acme Corp", "Globex", "Soylent Corp", "Initech", "Umbrella Corp"]
+
+
+def synthetic_customers(rows: int, seed: int = 0) -> list[dict]:
+    """Customers with varied names/emails so searches have realistic selectivity."""
+    rng = random.Random(seed)
+    customers = []
+    for i in range(rows):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        tag = f"{rng.randrange(36**4):04x}"
+        customers.append(
+            {
+                "id": f"CUST-{i}",
+                "name": f"{first.title()} {last.title()}{tag}",
+                "email": f"{first}.{last}{i}@example.com",
+                "phone": f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                "company": rng.choice(COMPANIES),
+                "avatar": "",
+                "status": "Active",
+                "created_date": "2024-01-01",
+            }
+        )
+    return customers
@@ -0,0 +1,841 @@
+"""An in-process stand-in for a Redis server, to run several workers locally.
+
+``running()`` serves it on a local port from a background thread and yields
+its ``redis://`` URL; ``python -m benchmarks._redis [--port 6379]`` serves it
+in the foreground, so a ``reflex run`` with ``REFLEX_REDIS_URL`` and
+``ADMIN_STORE_BACKEND=redis`` can use it too.
+
+It speaks RESP2 and keeps everything in memory. It implements the commands
+used by the app's ``RedisBackend`` and by Reflex's redis state and token
+managers:
+- strings with expiry
+- sets, hashes, sorted sets by rank, and streams with blocking reads
+- ``MULTI``/``EXEC`` with ``WATCH``
+- pub/sub, with keyspace notifications
+
+Commands run one at a time on a single event loop, so each is atomic as in
+Redis. There is no persistence, eviction, auth or cluster support.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+OK = "OK"
+QUEUED = "QUEUED"
+SWEEP_SECONDS = 0.1
+
+
+class _Status(str):
+    """A simple-string reply."""
+
+
+class _Error(str):
+    """An error reply."""
+
+
+class _NullArray:
+    """The nil array reply, e.g. of an ``EXEC`` aborted by ``WATCH``."""
+
+
+# Returned by commands that write their own replies, such as SUBSCRIBE.
+_NO_REPLY = object()
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, _NullArray):
+        return b"*-1\r\n"
+    if isinstance(value, _Status):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, _Error):
+        return b"-" + value.encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, float):
+        value = _score(value)
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+
+
+def _score(value: float) -> bytes:
+    return b"%d" % value if value.is_integer() else repr(value).encode()
+
+
+def _match(pattern: bytes, key: bytes) -> bool:
+    return fnmatch.fnmatchcase(key.decode(errors="replace"), pattern.decode())
+
+
+class CommandError(Exception):
+    pass
+
+
+class _Stream:
+    __slots__ = ("entries", "last")
+
+    def __init__(self):
+        self.entries: list[tuple[tuple[int, int], list[bytes]]] = []
+        self.last = (0, 0)
+
+
+def _stream_id(value: bytes, default_seq: int) -> tuple[int, int]:
+    if value == b"-":
+        return (0, 0)
+    if value == b"+":
+        return (2**64, 2**64)
+    ms, _, seq = value.partition(b"-")
+    try:
+        return (int(ms), int(seq) if seq else default_seq)
+    except ValueError:
+        raise CommandError("ERR Invalid stream ID specified as stream command argument")
+
+
+def _format_id(entry_id: tuple[int, int]) -> bytes:
+    return b"%d-%d" % entry_id
+
+
+class _Client:
+    __slots__ = ("writer", "queue", "watched", "channels", "patterns", "failed")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.queue: Optional[list[list[bytes]]] = None
+        self.failed = False
+        self.watched: dict[bytes, int] = {}
+        self.channels: set[bytes] = set()
+        self.patterns: set[bytes] = set()
+
+    def send(self, value: Any):
+        self.writer.write(_encode(value))
+
+
+class MiniRedis:
+    """The keyspace and command set; ``serve`` accepts clients for it."""
+
+    def __init__(self):
+        self.data: dict[bytes, Any] = {}
+        self.expires: dict[bytes, float] = {}
+        # Bumped on every write to a key, for WATCH.
+        self.versions: dict[bytes, int] = {}
+        self.config: dict[bytes, bytes] = {b"notify-keyspace-events": b""}
+        self.subscribers: dict[bytes, set[_Client]] = {}
+        self.psubscribers: dict[bytes, set[_Client]] = {}
+        self._stream_written = asyncio.Event()
+        self._counter = 0
+
+    # Keyspace
+
+    def _alive(self, key: bytes) -> bool:
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._drop(key)
+            self._notify(b"expired", key, b"x")
+            return False
+        return key in self.data
+
+    def _get(self, key: bytes, kind: type) -> Any:
+        if not self._alive(key):
+            return None
+        value = self.data[key]
+        if not isinstance(value, kind):
+            raise CommandError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return value
+
+    def _create(self, key: bytes, kind: type) -> Any:
+        value = self._get(key, kind)
+        if value is None:
+            value = self.data[key] = kind()
+        return value
+
+    def _touch(self, key: bytes):
+        self._counter += 1
+        self.versions[key] = self._counter
+
+    def _drop(self, key: bytes) -> bool:
+        self.expires.pop(key, None)
+        if self.data.pop(key, None) is None:
+            return False
+        self._touch(key)
+        return True
+
+    def _drop_if_empty(self, key: bytes):
+        if not self.data.get(key):
+            self._drop(key)
+
+    def _notify(self, event: bytes, key: bytes, kind: bytes):
+        flags = self.config[b"notify-keyspace-events"]
+        if b"K" in flags and (kind in flags or b"A" in flags and kind not in b"xe"):
+            self.publish(b"__keyspace@0__:" + key, event)
+
+    def sweep(self):
+        now = time.monotonic()
+        for key in [k for k, deadline in self.expires.items() if deadline <= now]:
+            self._alive(key)
+
+    # Pub/sub
+
+    def publish(self, channel: bytes, message: bytes) -> int:
+        receivers = 0
+        for client in self.subscribers.get(channel, ()):
+            client.send([b"message", channel, message])
+            receivers += 1
+        for pattern, clients in self.psubscribers.items():
+            if _match(pattern, channel):
+                for client in clients:
+                    client.send([b"pmessage", pattern, channel, message])
+                    receivers += 1
+        return receivers
+
+    def _subscribe(self, client: _Client, names: list[bytes], pattern: bool):
+        kind, owned, table = (
+            (b"psubscribe", client.patterns, self.psubscribers)
+            if pattern
+            else (b"subscribe", client.channels, self.subscribers)
+        )
+        for name in names:
+            owned.add(name)
+            table.setdefault(name, set()).add(client)
+            client.send([kind, name, len(client.channels) + len(client.patterns)])
+
+    def _unsubscribe(
+        self, client: _Client, names: list[bytes], pattern: bool, reply: bool = True
+    ):
+        kind, owned, table = (
+            (b"punsubscribe", client.patterns, self.psubscribers)
+            if pattern
+            else (b"unsubscribe", client.channels, self.subscribers)
+        )
+        for name in names or list(owned) or [None]:
+            if name is not None:
+                owned.discard(name)
+                clients = table.get(name)
+                if clients is not None:
+                    clients.discard(client)
+                    if not clients:
+                        del table[name]
+            if reply:
+                count = len(client.channels) + len(client.patterns)
+                client.send([kind, name, count])
+
+    def disconnect(self, client: _Client):
+        self._unsubscribe(client, [], False, reply=False)
+        self._unsubscribe(client, [], True, reply=False)
+
+    # Dispatch
+
+    async def execute(self, client: _Client, args: list[bytes]) -> Any:
+        name = args[0].upper().decode()
+        if client.queue is not None and name not in ("EXEC", "DISCARD", "MULTI"):
+            if name == "WATCH":
+                return _Error("ERR WATCH inside MULTI is not allowed")
+            if not hasattr(self, f"cmd_{name.lower()}"):
+                client.failed = True
+                return _Error(f"ERR unknown command '{name}'")
+            client.queue.append(args)
+            return _Status(QUEUED)
+        if name in ("SUBSCRIBE", "PSUBSCRIBE", "UNSUBSCRIBE", "PUNSUBSCRIBE"):
+            pattern = name.startswith("P")
+            if name.endswith("UNSUBSCRIBE"):
+                self._unsubscribe(client, args[1:], pattern)
+            else:
+                self._subscribe(client, args[1:], pattern)
+            return _NO_REPLY
+        if name == "PING" and (client.channels or client.patterns):
+            return [b"pong", args[1] if len(args) > 1 else b""]
+        if name == "XREAD":
+            return await self.xread(args[1:])
+        return self.call(client, name, args[1:])
+
+    def call(self, client: _Client, name: str, args: list[bytes]) -> Any:
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return _Error(f"ERR unknown command '{name}'")
+        try:
+            return handler(client, args)
+        except CommandError as error:
+            return _Error(str(error))
+        except (IndexError, ValueError):
+            return _Error(f"ERR syntax error in '{name}'")
+
+    # Connection and server
+
+    def cmd_ping(self, client, args):
+        return args[0] if args else _Status("PONG")
+
+    def cmd_echo(self, client, args):
+        return args[0]
+
+    def cmd_select(self, client, args):
+        return _Status(OK)
+
+    def cmd_client(self, client, args):
+        return _Status(OK)
+
+    def cmd_info(self, client, args):
+        return b"# Server\r\nredis_version:7.2.0\r\nredis_mode:standalone\r\n"
+
+    def cmd_config(self, client, args):
+        action = args[0].upper()
+        if action == b"SET":
+            for key, value in zip(args[1::2], args[2::2]):
+                self.config[key.lower()] = value
+            return _Status(OK)
+        if action == b"GET":
+            return [
+                item
+                for key, value in self.config.items()
+                if _match(args[1].lower(), key)
+                for item in (key, value)
+            ]
+        return _Status(OK)
+
+    def cmd_flushall(self, client, args):
+        for key in list(self.data):
+            self._drop(key)
+        return _Status(OK)
+
+    cmd_flushdb = cmd_flushall
+
+    def cmd_dbsize(self, client, args):
+        return sum(1 for key in list(self.data) if self._alive(key))
+
+    def cmd_publish(self, client, args):
+        return self.publish(args[0], args[1])
+
+    # Transactions
+
+    def cmd_multi(self, client, args):
+        if client.queue is not None:
+            return _Error("ERR MULTI calls can not be nested")
+        client.queue = []
+        client.failed = False
+        return _Status(OK)
+
+    def cmd_discard(self, client, args):
+        if client.queue is None:
+            return _Error("ERR DISCARD without MULTI")
+        client.queue = None
+        client.watched = {}
+        return _Status(OK)
+
+    def cmd_exec(self, client, args):
+        if client.queue is None:
+            return _Error("ERR EXEC without MULTI")
+        queue, client.queue = client.queue, None
+        watched, client.watched = client.watched, {}
+        if client.failed:
+            return _Error("EXECABORT Transaction discarded because of previous errors.")
+        for key, version in watched.items():
+            self._alive(key)
+            if self.versions.get(key, 0) != version:
+                return _NullArray()
+        return [self.call(client, a[0].upper().decode(), a[1:]) for a in queue]
+
+    def cmd_watch(self, client, args):
+        for key in args:
+            self._alive(key)
+            client.watched[key] = self.versions.get(key, 0)
+        return _Status(OK)
+
+    def cmd_unwatch(self, client, args):
+        client.watched = {}
+        return _Status(OK)
+
+    # Generic keys
+
+    def cmd_del(self, client, args):
+        deleted = 0
+        for key in args:
+            if self._alive(key) and self._drop(key):
+                self._notify(b"del", key, b"g")
+                deleted += 1
+        return deleted
+
+    cmd_unlink = cmd_del
+
+    def cmd_exists(self, client, args):
+        return sum(1 for key in args if self._alive(key))
+
+    def cmd_type(self, client, args):
+        if not self._alive(args[0]):
+            return _Status("none")
+        names = {
+            bytes: "string",
+            set: "set",
+            dict: "hash",
+            _ZSet: "zset",
+            _Stream: "stream",
+        }
+        return _Status(names[type(self.data[args[0]])])
+
+    def cmd_keys(self, client, args):
+        return [k for k in list(self.data) if self._alive(k) and _match(args[0], k)]
+
+    def cmd_scan(self, client, args):
+        pattern = b"*"
+        for option, value in zip(args[1::2], args[2::2]):
+            if option.upper() == b"MATCH":
+                pattern = value
+        return [b"0", self.cmd_keys(client, [pattern])]
+
+    def _expire_at(self, key: bytes, deadline: float, options: list[bytes]) -> int:
+        if not self._alive(key):
+            return 0
+        current = self.expires.get(key)
+        flags = {option.upper() for option in options}
+        if (
+            (b"NX" in flags and current is not None)
+            or (b"XX" in flags and current is None)
+            or (b"GT" in flags and (current is None or deadline <= current))
+            or (b"LT" in flags and current is not None and deadline >= current)
+        ):
+            return 0
+        self.expires[key] = deadline
+        self._touch(key)
+        self._notify(b"expire", key, b"g")
+        return 1
+
+    def cmd_expire(self, client, args):
+        deadline = time.monotonic() + int(args[1])
+        return self._expire_at(args[0], deadline, args[2:])
+
+    def cmd_pexpire(self, client, args):
+        deadline = time.monotonic() + int(args[1]) / 1000
+        return self._expire_at(args[0], deadline, args[2:])
+
+    def cmd_persist(self, client, args):
+        if self._alive(args[0]) and self.expires.pop(args[0], None) is not None:
+            self._touch(args[0])
+            return 1
+        return 0
+
+    def cmd_pttl(self, client, args):
+        if not self._alive(args[0]):
+            return -2
+        deadline = self.expires.get(args[0])
+        if deadline is None:
+            return -1
+        return max(int((deadline - time.monotonic()) * 1000), 0)
+
+    def cmd_ttl(self, client, args):
+        ttl = self.cmd_pttl(client, args)
+        return ttl if ttl < 0 else (ttl + 500) // 1000
+
+    # Strings
+
+    def cmd_get(self, client, args):
+        return self._get(args[0], bytes)
+
+    def cmd_mget(self, client, args):
+        values = [self.data.get(key) if self._alive(key) else None for key in args]
+        return [value if isinstance(value, bytes) else None for value in values]
+
+    def cmd_set(self, client, args):
+        key, value = args[0], args[1]
+        deadline, keep_ttl, condition, get = None, False, None, False
+        options = iter(args[2:])
+        for option in options:
+            option = option.upper()
+            if option == b"EX":
+                deadline = time.monotonic() + int(next(options))
+            elif option == b"PX":
+                deadline = time.monotonic() + int(next(options)) / 1000
+            elif option in (b"NX", b"XX"):
+                condition = option
+            elif option == b"KEEPTTL":
+                keep_ttl = True
+            elif option == b"GET":
+                get = True
+            else:
+                raise CommandError("ERR syntax error")
+        exists = self._alive(key)
+        previous = self._get(key, bytes) if get else None
+        if (condition == b"NX" and exists) or (condition == b"XX" and not exists):
+            return previous if get else None
+        ttl = self.expires.get(key) if keep_ttl else None
+        self._drop(key)
+        self.data[key] = value
+        self._touch(key)
+        if deadline is not None or ttl is not None:
+            self.expires[key] = deadline if deadline is not None else ttl
+        self._notify(b"set", key, b"$")
+        return previous if get else _Status(OK)
+
+    def cmd_getdel(self, client, args):
+        value = self._get(args[0], bytes)
+        if value is not None:
+            self._drop(args[0])
+            self._notify(b"del", args[0], b"g")
+        return value
+
+    def _incr(self, key: bytes, amount: int) -> int:
+        value = int(self._get(key, bytes) or 0) + amount
+        self.data[key] = b"%d" % value
+        self._touch(key)
+        self._notify(b"incrby", key, b"$")
+        return value
+
+    def cmd_incr(self, client, args):
+        return self._incr(args[0], 1)
+
+    def cmd_decr(self, client, args):
+        return self._incr(args[0], -1)
+
+    def cmd_incrby(self, client, args):
+        return self._incr(args[0], int(args[1]))
+
+    def cmd_decrby(self, client, args):
+        return self._incr(args[0], -int(args[1]))
+
+    # Sets
+
+    def cmd_sadd(self, client, args):
+        members = self._create(args[0], set)
+        added = len(set(args[1:]) - members)
+        members.update(args[1:])
+        self._touch(args[0])
+        self._notify(b"sadd", args[0], b"s")
+        return added
+
+    def cmd_srem(self, client, args):
+        members = self._get(args[0], set)
+        if members is None:
+            return 0
+        removed = len(members & set(args[1:]))
+        members.difference_update(args[1:])
+        if removed:
+            self._touch(args[0])
+            self._notify(b"srem", args[0], b"s")
+        self._drop_if_empty(args[0])
+        return removed
+
+    def cmd_scard(self, client, args):
+        return len(self._get(args[0], set) or ())
+
+    def cmd_smembers(self, client, args):
+        return list(self._get(args[0], set) or ())
+
+    def cmd_sismember(self, client, args):
+        return int(args[1] in (self._get(args[0], set) or ()))
+
+    # Hashes
+
+    def cmd_hset(self, client, args):
+        fields = self._create(args[0], dict)
+        added = 0
+        for field, value in zip(args[1::2], args[2::2]):
+            added += field not in fields
+            fields[field] = value
+        self._touch(args[0])
+        self._notify(b"hset", args[0], b"h")
+        return added
+
+    def cmd_hget(self, client, args):
+        return (self._get(args[0], dict) or {}).get(args[1])
+
+    def cmd_hmget(self, client, args):
+        fields = self._get(args[0], dict) or {}
+        return [fields.get(field) for field in args[1:]]
+
+    def cmd_hgetall(self, client, args):
+        fields = self._get(args[0], dict) or {}
+        return [item for pair in fields.items() for item in pair]
+
+    def cmd_hdel(self, client, args):
+        fields = self._get(args[0], dict)
+        if fields is None:
+            return 0
+        removed = sum(fields.pop(field, None) is not None for field in args[1:])
+        if removed:
+            self._touch(args[0])
+            self._notify(b"hdel", args[0], b"h")
+        self._drop_if_empty(args[0])
+        return removed
+
+    def cmd_hlen(self, client, args):
+        return len(self._get(args[0], dict) or {})
+
+    def cmd_hexists(self, client, args):
+        return int(args[1] in (self._get(args[0], dict) or {}))
+
+    # Sorted sets, read by rank
+
+    def cmd_zadd(self, client, args):
+        scores = self._create(args[0], _ZSet)
+        options = []
+        rest = args[1:]
+        while rest and rest[0].upper() in (b"NX", b"XX", b"GT", b"LT", b"CH"):
+            options.append(rest[0].upper())
+            rest = rest[1:]
+        added = 0
+        for score, member in zip(rest[::2], rest[1::2]):
+            exists = member in scores
+            if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                continue
+            added += not exists
+            scores[member] = float(score)
+        scores.ranked = None
+        self._touch(args[0])
+        self._notify(b"zadd", args[0], b"z")
+        self._drop_if_empty(args[0])
+        return added
+
+    def cmd_zscore(self, client, args):
+        score = (self._get(args[0], _ZSet) or {}).get(args[1])
+        return None if score is None else _score(score)
+
+    def cmd_zrem(self, client, args):
+        scores = self._get(args[0], _ZSet)
+        if scores is None:
+            return 0
+        removed = sum(scores.pop(member, None) is not None for member in args[1:])
+        if removed:
+            scores.ranked = None
+            self._touch(args[0])
+            self._notify(b"zrem", args[0], b"z")
+        self._drop_if_empty(args[0])
+        return removed
+
+    def cmd_zcard(self, client, args):
+        return len(self._get(args[0], _ZSet) or {})
+
+    def cmd_zrange(self, client, args):
+        scores = self._get(args[0], _ZSet)
+        if scores is None:
+            return []
+        ranked = scores.rank()
+        start, stop = int(args[1]), int(args[2])
+        start = max(start + len(ranked) if start < 0 else start, 0)
+        stop = stop + len(ranked) if stop < 0 else stop
+        selected = ranked[start : stop + 1]
+        if any(option.upper() == b"WITHSCORES" for option in args[3:]):
+            return [item for m in selected for item in (m, _score(scores[m]))]
+        return selected
+
+    # Streams
+
+    def cmd_xadd(self, client, args):
+        key, rest = args[0], args[1:]
+        maxlen = None
+        if rest[0].upper() == b"NOMKSTREAM":
+            if not self._alive(key):
+                return None
+            rest = rest[1:]
+        if rest[0].upper() == b"MAXLEN":
+            rest = rest[1:]
+            if rest[0] in (b"~", b"="):
+                rest = rest[1:]
+            maxlen, rest = int(rest[0]), rest[1:]
+        stream = self._create(key, _Stream)
+        if rest[0] == b"*":
+            now = int(time.time() * 1000)
+            if now > stream.last[0]:
+                entry_id = (now, 0)
+            else:
+                entry_id = (stream.last[0], stream.last[1] + 1)
+        else:
+            entry_id = _stream_id(rest[0], 0)
+            if entry_id <= stream.last:
+                raise CommandError(
+                    "ERR The ID specified in XADD is equal or smaller than the "
+                    "target stream top item"
+                )
+        stream.entries.append((entry_id, list(rest[1:])))
+        stream.last = entry_id
+        if maxlen is not None and len(stream.entries) > maxlen:
+            del stream.entries[: len(stream.entries) - maxlen]
+        self._touch(key)
+        self._notify(b"xadd", key, b"t")
+        self._stream_written.set()
+        self._stream_written = asyncio.Event()
+        return _format_id(entry_id)
+
+    @staticmethod
+    def _entries(entries) -> list:
+        return [[_format_id(entry_id), fields] for entry_id, fields in entries]
+
+    def _range(self, key: bytes, low: bytes, high: bytes) -> list:
+        stream = self._get(key, _Stream)
+        if stream is None:
+            return []
+        low_open, high_open = low.startswith(b"("), high.startswith(b"(")
+        first = _stream_id(low.lstrip(b"("), 0)
+        last = _stream_id(high.lstrip(b"("), 2**64)
+        return [
+            (entry_id, fields)
+            for entry_id, fields in stream.entries
+            if (first < entry_id if low_open else first <= entry_id)
+            and (entry_id < last if high_open else entry_id <= last)
+        ]
+
+    @staticmethod
+    def _count(args: list[bytes]) -> Optional[int]:
+        if len(args) >= 2 and args[0].upper() == b"COUNT":
+            return int(args[1])
+        return None
+
+    def cmd_xrange(self, client, args):
+        entries = self._range(args[0], args[1], args[2])
+        count = self._count(args[3:])
+        return self._entries(entries[:count] if count is not None else entries)
+
+    def cmd_xrevrange(self, client, args):
+        entries = self._range(args[0], args[2], args[1])[::-1]
+        count = self._count(args[3:])
+        return self._entries(entries[:count] if count is not None else entries)
+
+    def cmd_xlen(self, client, args):
+        stream = self._get(args[0], _Stream)
+        return len(stream.entries) if stream else 0
+
+    def _read(self, after: dict[bytes, tuple[int, int]], count: Optional[int]):
+        reply = []
+        for key, position in after.items():
+            stream = self._get(key, _Stream)
+            if stream is None:
+                continue
+            entries = [(i, f) for i, f in stream.entries if i > position][:count]
+            if entries:
+                reply.append([key, self._entries(entries)])
+        return reply
+
+    async def xread(self, args: list[bytes]) -> Any:
+        count, block = None, None
+        while args[0].upper() != b"STREAMS":
+            option, value, args = args[0].upper(), args[1], args[2:]
+            if option == b"COUNT":
+                count = int(value)
+            elif option == b"BLOCK":
+                block = int(value)
+        keys = args[1:]
+        half = len(keys) // 2
+        after = {}
+        try:
+            for key, position in zip(keys[:half], keys[half:]):
+                if position == b"$":
+                    stream = self._get(key, _Stream)
+                    after[key] = stream.last if stream else (0, 0)
+                else:
+                    after[key] = _stream_id(position, 0)
+            reply = self._read(after, count)
+            deadline = None if not block else time.monotonic() + block / 1000
+            while not reply and block is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stream_written.wait(), remaining)
+                reply = self._read(after, count)
+        except CommandError as error:
+            return _Error(str(error))
+        return reply or _NullArray()
+
+
+class _ZSet(dict):
+    """Member to score, with the members ranked lazily for ``ZRANGE``."""
+
+    ranked: Optional[list[bytes]] = None
+
+    def rank(self) -> list[bytes]:
+        if self.ranked is None:
+            self.ranked = sorted(self, key=lambda member: (self[member], member))
+        return self.ranked
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[list[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        length = int(header[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6379, ready=None):
+    """Serve a fresh ``MiniRedis`` until cancelled; ``ready(port)`` once bound."""
+    server_state = MiniRedis()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(writer)
+        try:
+            while (args := await _read_command(reader)) is not None:
+                if args:
+                    reply = await server_state.execute(client, args)
+                    if reply is not _NO_REPLY:
+                        client.send(reply)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            server_state.disconnect(client)
+            writer.close()
+
+    async def sweep():
+        while True:
+            await asyncio.sleep(SWEEP_SECONDS)
+            server_state.sweep()
+
+    server = await asyncio.start_server(handle, host, port)
+    sweeper = asyncio.create_task(sweep())
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+@contextlib.contextmanager
+def running(host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Serve a stand-in on a background thread; yields its URL."""
+    bound = threading.Event()
+    started = []
+
+    def ready(actual: int):
+        started.append((asyncio.get_running_loop(), asyncio.current_task(), actual))
+        bound.set()
+
+    def run():
+        with contextlib.suppress(asyncio.CancelledError):
+            asyncio.run(serve(host, port, ready))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    if not bound.wait(10):
+        raise RuntimeError("Redis stand-in did not start")
+    loop, task, actual = started[0]
+    try:
+        yield f"redis://{host}:{actual}/0"
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    print(f"serving redis://{args.host}:{args.port}/0")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
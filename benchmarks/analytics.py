@@ -0,0 +1,72 @@
+"""Group-by latency of the NumPy order column store.
+
+Run with ``python -m benchmarks.analytics [--rows 5000000]``. Orders are
+appended column-wise in 1M-row batches (no per-row dicts), then every
+``group_by`` dimension and ``totals`` is timed as the median of
+``--repeat`` runs and checked against the 100 ms budget.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from app.store.order_columns import DIMENSIONS, OrderColumns
+
+PRODUCTS = [f"Product {i}" for i in range(40)]
+STATUSES = ["Completed", "Pending", "Processing", "Refunded"]
+BUDGET_MS = 100.0
+
+
+def _fill(columns: OrderColumns, rows: int, batch: int = 1_000_000):
+    rng = np.random.default_rng(0)
+    pick = random.Random(0)
+    start_day = np.datetime64("2022-01-01")
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        quantity = rng.integers(1, 6, count)
+        price = np.round(rng.uniform(25.0, 350.0, count), 2)
+        columns.append(
+            None,
+            pick.choices(PRODUCTS, k=count),
+            pick.choices(STATUSES, k=count),
+            start_day + rng.integers(0, 3 * 365, count),
+            quantity,
+            price,
+            np.round(quantity * price, 2),
+        )
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    columns = OrderColumns(capacity=args.rows)
+    start = time.perf_counter()
+    _fill(columns, args.rows)
+    print(f"loaded {args.rows} orders in {time.perf_counter() - start:.1f} s")
+    print(f"{'query':>10} {'groups':>7} {'median ms':>10}")
+    for dimension in DIMENSIONS:
+        groups = len(columns.group_by(dimension))
+        ms = _median_ms(lambda d=dimension: columns.group_by(d), args.repeat)
+        flag = "" if ms < BUDGET_MS else "  over budget"
+        print(f"{dimension:>10} {groups:>7} {ms:>10.1f}{flag}")
+    ms = _median_ms(columns.totals, args.repeat)
+    print(f"{'totals':>10} {1:>7} {ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Bulk import throughput for a large customer CSV.
+
+Run with ``python -m benchmarks.bulk_import [--rows 1000000] [--sqlite PATH]``.
+The CSV is written to a temporary file row by row (every 1000th row is
+invalid), then streamed through ``import_records`` into an empty store.
+Progress is printed per 100k rows, followed by rows/s and the peak RSS.
+"""
+
+import argparse
+import csv
+import os
+import resource
+import tempfile
+import time
+
+from app.states.customers_state import customer_from_row
+from app.store.bulk_import import read_rows, import_records
+from app.store.persistence import MemoryBackend, SQLiteBackend
+from app.store.record_store import RecordStore
+from benchmarks._data import synthetic_customers
+
+
+def _write_csv(path: str, rows: int):
+    with open(path, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["id", "name", "email", "phone", "company"])
+        for start in range(0, rows, 10_000):
+            for i, c in enumerate(synthetic_customers(min(10_000, rows - start))):
+                n = start + i
+                email = "not-an-email" if n % 1000 == 999 else c["email"]
+                writer.writerow(
+                    [f"CUST-{n}", c["name"], email, c["phone"], c["company"]]
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sqlite", help="import into a SQLite file instead of memory")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        _write_csv(path, args.rows)
+        print(f"csv: {os.path.getsize(path) / 2**20:.1f} MB, {args.rows} rows")
+        backend = SQLiteBackend(args.sqlite) if args.sqlite else MemoryBackend()
+        store = RecordStore(
+            "bench_import",
+            "id",
+            list,
+            backend,
+            search_fields=("name", "email", "company"),
+        )
+        start = time.perf_counter()
+        next_report = 100_000
+        with open(path, "rb") as stream:
+            for report in import_records(
+                store, read_rows(stream, "csv"), customer_from_row
+            ):
+                if report.rows >= next_report:
+                    print(
+                        f"{report.rows:>9} read {time.perf_counter() - start:>7.1f} s"
+                    )
+                    next_report += 100_000
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"imported {report.imported}, failed {report.failed} in {elapsed:.1f} s "
+            f"({report.rows / elapsed:,.0f} rows/s), peak RSS {peak:.0f} MB"
+        )
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
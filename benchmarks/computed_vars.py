@@ -0,0 +1,261 @@
+"""Time of every computed var of the table states, with a regression gate.
+
+Run with ``python -m benchmarks.computed_vars [--rows 1000 100000 1000000]
+[--states Orders Customers] [--save BASELINE.json] [--baseline BASELINE.json
+--threshold 0.25]``. Each table store is filled with ``--rows`` fixture
+rows and a loaded session is searched at four selectivities: no query
+(``all``), the first three letters of a row's first search field
+(``broad``), the value of a row's most distinctive search field, such as
+its key or email (``narrow``), and a query nothing matches (``none``),
+then moved to the middle page of its results. Every computed var body is
+then run on its own, its dependencies already cached: ``cold`` after
+clearing the shared ``result_cache`` (the first session to render after
+a write), ``warm`` with it (every other session).
+
+The median microseconds per call are printed per var and selectivity as
+``cold/warm``. ``--save`` writes them as a baseline; ``--baseline``
+compares against one and exits non-zero when a var got slower by more than
+``--threshold`` (a fraction) and ``--min-delta-us``, so the run can gate a
+change. Timings of unchanged code drift between runs on a busy host, so
+the gate takes at least ``MIN_GATE_REPEAT`` samples per var and widens the
+threshold by a noise allowance: ``NOISE_MADS`` median absolute deviations
+of the log ratios of all vars against the baseline, as most vars do not
+change in one run. The allowance adds at most ``--max-noise`` (a fraction
+of ``--threshold``, 0 to turn it off) and is printed with the result; a
+run noisier than that is reported as such. The states with a var over
+the margins are measured once more, and a var only counts as slower when
+the faster of its two medians still is.
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import reflex as rx
+
+from app.states.coupons_state import CouponsState, coupons_store
+from app.states.customers_state import CustomersState, customers_store
+from app.states.orders_state import OrdersState, orders_store
+from app.states.products_state import ProductsState, products_store
+from app.states.trials_state import TrialsState, trials_store
+from app.store.fixtures import Fixtures
+from app.store.result_cache import result_cache
+
+STATES = {
+    "Orders": (OrdersState, orders_store, "orders"),
+    "Customers": (CustomersState, customers_store, "customers"),
+    "Products": (ProductsState, products_store, "products"),
+    "Trials": (TrialsState, trials_store, "trials"),
+    "Coupons": (CouponsState, coupons_store, "coupons"),
+}
+SELECTIVITIES = ("all", "broad", "narrow", "none")
+SAMPLE_SECONDS = 0.01
+MIN_GATE_REPEAT = 7
+NOISE_MADS = 3
+
+
+def _queries(store, records: list[dict]) -> dict[str, str]:
+    middle = records[len(records) // 2]
+    sample = records[:1000]
+    # The search field with the most distinct values names about one row.
+    unique = max(store.search_fields, key=lambda f: len({r[f] for r in sample}))
+    return {
+        "all": "",
+        "broad": str(middle[store.search_fields[0]])[:3].lower(),
+        "narrow": str(middle[unique]).lower(),
+        "none": "~no match~",
+    }
+
+
+def _session(state_cls: type[rx.State], query: str) -> rx.State:
+    """A loaded session searching ``query``, on the middle page of the results."""
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(state_cls.get_full_name().split(".")[1:])
+    handlers = state_cls.event_handlers
+    handlers["load"].fn(state)
+    handlers["toggle_scroll_mode"].fn(state)
+    handlers["set_search"].fn(state, query)
+    handlers["set_page"].fn(state, max(state.total_pages // 2, 1))
+    return state
+
+
+def _median_call(state: rx.State, name: str, cold: bool, repeat: int) -> float:
+    """Median seconds to recompute var ``name`` on ``state``, batched like timeit."""
+    compute = type(state).computed_vars[name].fget
+    for dependency in type(state).computed_vars:
+        getattr(state, dependency)
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            if cold:
+                result_cache.clear()
+            compute(state)
+        return time.perf_counter() - start
+
+    number = 1
+    while (elapsed := run(number)) < SAMPLE_SECONDS and number < 10_000:
+        number *= 10
+    samples = [elapsed / number] + [run(number) / number for _ in range(repeat - 1)]
+    return statistics.median(samples)
+
+
+def measure(name: str, rows: int, fixtures: Fixtures, repeat: int) -> dict:
+    state_cls, store, entity = STATES[name]
+    records = fixtures.records(entity)
+    seed = store.records[:]
+    store.replace_all(records)
+    timings = {}
+    try:
+        for selectivity, query in _queries(store, records).items():
+            state = _session(state_cls, query)
+            matches = store.count(query)
+            for var_name in state_cls.computed_vars:
+                for mode in ("cold", "warm"):
+                    seconds = _median_call(state, var_name, mode == "cold", repeat)
+                    timings[f"{name}.{var_name}@{rows}/{selectivity}/{mode}"] = seconds
+            timings[f"{name}@{rows}/{selectivity}/matches"] = matches
+    finally:
+        store.replace_all(seed)
+        result_cache.clear()
+    return timings
+
+
+def _print_table(name: str, rows: int, timings: dict):
+    state_cls = STATES[name][0]
+    matches = " ".join(
+        f"{s}={timings[f'{name}@{rows}/{s}/matches']}" for s in SELECTIVITIES
+    )
+    print(f"\n{name} at {rows:,} rows, matches {matches}")
+    print(f"{'var':>24}" + "".join(f"{s:>18}" for s in SELECTIVITIES))
+    for var_name in state_cls.computed_vars:
+        cells = []
+        for selectivity in SELECTIVITIES:
+            key = f"{name}.{var_name}@{rows}/{selectivity}"
+            cold, warm = timings[f"{key}/cold"], timings[f"{key}/warm"]
+            cells.append(f"{cold * 1e6:.1f}/{warm * 1e6:.1f}")
+        print(f"{var_name:>24}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+def _ratios(timings: dict, baseline: dict) -> dict[str, float]:
+    return {
+        key: seconds / baseline[key]
+        for key, seconds in timings.items()
+        if not key.endswith("/matches") and baseline.get(key) and seconds
+    }
+
+
+def noise(timings: dict, baseline: dict) -> float:
+    """Median absolute deviation of the log ratios of ``timings`` to ``baseline``."""
+    logs = [math.log(ratio) for ratio in _ratios(timings, baseline).values()]
+    if not logs:
+        return 0.0
+    centre = statistics.median(logs)
+    return statistics.median(abs(log - centre) for log in logs)
+
+
+def regressions(
+    timings: dict,
+    baseline: dict,
+    threshold: float,
+    min_delta: float,
+    allowance: float = 0.0,
+) -> list[tuple[str, float, float]]:
+    """Timings slower than ``baseline`` by more than both margins.
+
+    ``allowance`` (a log ratio) widens ``threshold`` for noise.
+    """
+    limit = (1 + threshold) * math.exp(allowance)
+    slower = []
+    for key, ratio in _ratios(timings, baseline).items():
+        before, seconds = baseline[key], timings[key]
+        if ratio > limit and seconds - before > min_delta:
+            slower.append((key, before, seconds))
+    return slower
+
+
+def _confirm(
+    slower: list[tuple[str, float, float]], timings: dict, allowance: float, args
+) -> list[tuple[str, float, float]]:
+    """The regressions in ``slower`` that a second measurement repeats."""
+    again = {}
+    for name, rows in sorted({_group(key) for key, _, _ in slower}):
+        sizes = {entity: rows for _, _, entity in STATES.values()}
+        fixtures = Fixtures(args.seed, sizes, "2025-01-01", args.cache_dir)
+        again.update(measure(name, rows, fixtures, args.repeat))
+    fastest = {key: min(timings[key], again[key]) for key, _, _ in slower}
+    baseline = {key: before for key, before, _ in slower}
+    return regressions(
+        fastest, baseline, args.threshold, args.min_delta_us / 1e6, allowance
+    )
+
+
+def _group(key: str) -> tuple[str, int]:
+    """The state name and row count a timing key was measured at."""
+    name, _, rest = key.partition(".")
+    return name, int(rest.partition("@")[2].partition("/")[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--states", nargs="+", choices=STATES, default=list(STATES))
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=".fixtures")
+    parser.add_argument("--save", help="write the timings as a baseline file")
+    parser.add_argument("--baseline", help="fail on regressions against this file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta-us", type=float, default=20.0)
+    parser.add_argument("--max-noise", type=float, default=0.5)
+    args = parser.parse_args()
+    if args.baseline:
+        args.repeat = max(args.repeat, MIN_GATE_REPEAT)
+
+    timings = {}
+    for rows in args.rows:
+        sizes = {entity: rows for _, _, entity in STATES.values()}
+        fixtures = Fixtures(args.seed, sizes, "2025-01-01", args.cache_dir)
+        for name in args.states:
+            measured = measure(name, rows, fixtures, args.repeat)
+            _print_table(name, rows, measured)
+            timings.update(measured)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(timings, indent=2, sort_keys=True))
+        print(f"\nbaseline written to {args.save}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        measured = NOISE_MADS * noise(timings, baseline)
+        widest = args.threshold * (1 + args.max_noise)
+        allowance = min(measured, math.log((1 + widest) / (1 + args.threshold)))
+        flagged = regressions(
+            timings, baseline, args.threshold, args.min_delta_us / 1e6, allowance
+        )
+        slower = _confirm(flagged, timings, allowance, args) if flagged else []
+        limit = (1 + args.threshold) * math.exp(allowance) - 1
+        print(
+            f"\n{len(slower)} regressions beyond {limit:.0%} "
+            f"({args.threshold:.0%} plus {limit - args.threshold:.0%} for noise) "
+            f"against {args.baseline} ({len(flagged)} before measuring again)"
+        )
+        if measured > allowance:
+            noisy = (1 + args.threshold) * math.exp(measured) - 1
+            print(
+                f"  this run was noisier than the allowance covers (it would "
+                f"take {noisy:.0%}); a failure may be noise, run it again"
+            )
+        for key, before, after in slower:
+            print(f"  {key}: {before * 1e6:.1f} -> {after * 1e6:.1f} us")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
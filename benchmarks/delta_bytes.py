@@ -0,0 +1,117 @@
+"""Serialized state-delta bytes per event: list-replacing vs. store-backed orders.
+
+Run with ``python -m benchmarks.delta_bytes [--rows 50000]``. ``LegacyOrdersState``
+replays the old ``OrdersState`` (the table as a list var, edits rebuilding
+it) next to the current store-backed ``OrdersState``; each event is applied
+to a fresh session and the JSON size of the resulting delta is reported.
+"""
+
+import argparse
+
+import reflex as rx
+from reflex.utils.format import json_dumps
+
+from app.states.orders_state import Order, OrdersState, orders_store
+from benchmarks._data import scale_store
+
+
+class LegacyOrdersState(rx.State):
+    orders: list[Order] = []
+    selected_order_id: str = ""
+    search_query: str = ""
+    page: int = 1
+    items_per_page: int = 8
+
+    @rx.var
+    def filtered_orders(self) -> list[Order]:
+        if not self.search_query:
+            return self.orders
+        query = self.search_query.lower()
+        return [o for o in self.orders if query in o["product_name"].lower()]
+
+    @rx.var
+    def total_items(self) -> int:
+        return len(self.filtered_orders)
+
+    @rx.var
+    def current_page_orders(self) -> list[Order]:
+        start = (self.page - 1) * self.items_per_page
+        return self.filtered_orders[start : start + self.items_per_page]
+
+    @rx.var
+    def selected_order(self) -> Order:
+        for order in self.orders:
+            if order["id"] == self.selected_order_id:
+                return order
+        return self.orders[0] if self.orders else {}
+
+    @rx.event
+    def set_search(self, query: str):
+        self.search_query = query
+        self.page = 1
+
+    @rx.event
+    def set_page(self, page: int):
+        self.page = page
+
+    @rx.event
+    def select_order(self, order_id: str):
+        self.selected_order_id = order_id
+
+    @rx.event
+    def delete_order(self):
+        self.orders = [o for o in self.orders if o["id"] != self.selected_order_id]
+        if self.orders:
+            self.selected_order_id = self.orders[0]["id"]
+
+    @rx.event
+    def update_order(self, form_data: dict):
+        updated_orders = []
+        for order in self.orders:
+            if order["id"] == self.selected_order_id:
+                order = order.copy()
+                order["quantity"] = int(form_data["quantity"])
+                order["price"] = float(form_data["price"])
+            updated_orders.append(order)
+        self.orders = updated_orders
+
+
+def _delta_bytes(state_cls: type[rx.State], event: str, *args, rows=None) -> int:
+    root = rx.State(_reflex_internal_init=True)
+    state = root.get_substate(state_cls.get_full_name().split(".")[1:])
+    if rows is not None:
+        state.orders = rows
+        state.selected_order_id = rows[0]["id"]
+    else:
+        state_cls.event_handlers["load"].fn(state)
+    for name in state_cls.computed_vars:
+        getattr(state, name)
+    root._clean()
+    state_cls.event_handlers[event].fn(state, *args)
+    return len(json_dumps(root.get_delta()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    seed = scale_store(orders_store, args.rows)
+    rows = orders_store.records
+    events = [
+        ("select_order", rows[3]["id"]),
+        ("update_order", {"quantity": "2", "price": "10"}),
+        ("set_page", 2),
+        ("set_search", "chanel"),
+        ("delete_order",),
+    ]
+    print(f"{'event':>14} {'list bytes':>12} {'store bytes':>12}")
+    for event, *event_args in events:
+        legacy = _delta_bytes(LegacyOrdersState, event, *event_args, rows=list(rows))
+        current = _delta_bytes(OrdersState, event, *event_args)
+        print(f"{event:>14} {legacy:>12} {current:>12}")
+    orders_store.replace_all(seed)
+
+
+if __name__ == "__main__":
+    main()
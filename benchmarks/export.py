@@ -0,0 +1,46 @@
+"""Streaming export throughput and memory at growing table sizes.
+
+Run with ``python -m benchmarks.export [--rows 10000 100000 500000]``. The
+orders store is scaled to each size and exported in full through
+``export_chunks``, as the ``/export`` endpoint does. Peak traced memory
+during the export should stay flat while the output grows with the table.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from app.states.orders_state import orders_store
+from app.store.export import export_chunks
+from benchmarks._data import scale_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 500_000]
+    )
+    args = parser.parse_args()
+
+    seed = list(orders_store.records)
+    print(f"{'rows':>9} {'fmt':>7} {'MB out':>8} {'seconds':>8} {'peak MB':>8}")
+    for rows in args.rows:
+        scale_store(orders_store, rows, seed)
+        for fmt in ("csv", "ndjson"):
+            tracemalloc.start()
+            start = time.perf_counter()
+            size = 0
+            for chunk in export_chunks(orders_store.iter_matching(), fmt):
+                size += len(chunk)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{rows:>9} {fmt:>7} {size / 2**20:>8.1f} {elapsed:>8.2f} "
+                f"{peak / 2**20:>8.2f}"
+            )
+    orders_store.replace_all(seed)
+
+
+if __name__ == "__main__":
+    main()
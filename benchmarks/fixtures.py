@@ -0,0 +1,91 @@
+"""Fixture generation, cache write and cache load rates.
+
+Run with ``python -m benchmarks.fixtures [--rows 1000000] [--seed 0]
+[--cache-dir DIR]``. Every entity is generated at ``--rows`` into an empty
+cache, then read back from it; both rates and the cache size are printed.
+A second generator with the same seed must produce identical chunks, and
+the rows are checked for coherence: orders and trials point at existing
+customers, and coupon usage and status agree with their limits and dates.
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import resource
+import tempfile
+import time
+
+from app.store.fixtures import DEFAULT_ROWS, Fixtures
+from app.store.redemption import coupon_status
+
+
+def _digest(chunks) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(pickle.dumps(chunk, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", help="defaults to a temporary directory")
+    args = parser.parse_args()
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="fixtures-")
+    rows = dict.fromkeys(DEFAULT_ROWS, args.rows)
+    fixtures = Fixtures(args.seed, rows, "2025-01-01", cache_dir)
+    print(f"{'entity':>10} {'write rows/s':>13} {'load rows/s':>12} {'MB':>7}")
+    for entity in DEFAULT_ROWS:
+        start = time.perf_counter()
+        fixtures._write(entity)
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = sum(len(chunk) for chunk in fixtures.chunks(entity))
+        read = time.perf_counter() - start
+        size = os.path.getsize(fixtures.path(entity)) / 2**20
+        print(
+            f"{entity:>10} {loaded / written:>13,.0f} {loaded / read:>12,.0f} "
+            f"{size:>7.1f}"
+        )
+
+    again = Fixtures(args.seed, rows, "2025-01-01")
+    same = all(
+        _digest(fixtures.chunks(entity)) == _digest(again.generate(entity))
+        for entity in ("customers", "coupons")
+    )
+    print(f"same seed reproduces the cache: {same}")
+
+    emails, names = set(), set()
+    for chunk in fixtures.chunks("customers"):
+        for customer in chunk:
+            emails.add(customer["email"])
+            names.add(customer["name"])
+    orphans = sum(
+        order["customer_email"] not in emails
+        for chunk in fixtures.chunks("orders")
+        for order in chunk
+    )
+    orphans += sum(
+        trial["customer_name"] not in names
+        for chunk in fixtures.chunks("trials")
+        for trial in chunk
+    )
+    inconsistent = sum(
+        coupon["used"] > coupon["limit"]
+        or coupon["status"] != coupon_status(coupon, "2025-01-01")
+        for chunk in fixtures.chunks("coupons")
+        for coupon in chunk
+    )
+    print(
+        f"{len(emails)} distinct customer emails, {orphans} orphan orders/trials, "
+        f"{inconsistent} inconsistent coupons"
+    )
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS {peak:.0f} MB, cache in {cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Per-keystroke search latency with and without the session refinement.
+
+Run with ``python -m benchmarks.keystrokes [--rows 1000000]``. Each word is
+typed one character at a time, as ``CustomersState.set_search`` receives
+it, and answered three ways: the old full-table rescan, a stateless
+indexed search, and an indexed search through a search session. The
+session's ``SearchStats`` are printed at the end.
+"""
+
+import argparse
+import time
+
+from app.store.persistence import MemoryBackend
+from app.store.record_store import RecordStore
+from benchmarks._data import synthetic_customers
+from benchmarks.search import _scan
+
+WORDS = ["alice.smith1", "williams42", "grace wilson", "globex"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = synthetic_customers(args.rows)
+    store = RecordStore(
+        "bench_customers",
+        "id",
+        lambda: rows,
+        MemoryBackend(),
+        search_fields=("name", "email", "company"),
+    )
+    # Read the rows in and index them before timing, or the first search
+    # would pay for it.
+    start = time.perf_counter()
+    store.load()
+    print(f"loaded {args.rows} customers in {time.perf_counter() - start:.1f} s")
+    print(
+        f"{'query':>14} {'matches':>9} {'scan ms':>9} {'full ms':>9} {'session ms':>11}"
+    )
+    totals = [0.0, 0.0, 0.0]
+    for word in WORDS:
+        for end in range(1, len(word) + 1):
+            query = word[:end]
+            start = time.perf_counter()
+            _scan(rows, query)
+            scan = time.perf_counter() - start
+            start = time.perf_counter()
+            expected = store.matching(query)
+            full = time.perf_counter() - start
+            start = time.perf_counter()
+            seqs = store.matching(query, session="bench")
+            session = time.perf_counter() - start
+            assert seqs == expected
+            for i, elapsed in enumerate((scan, full, session)):
+                totals[i] += elapsed
+            print(
+                f"{query:>14} {len(seqs):>9} {scan * 1000:>9.2f} "
+                f"{full * 1000:>9.2f} {session * 1000:>11.2f}"
+            )
+    scan, full, session = (t * 1000 for t in totals)
+    print(f"{'total':>14} {'':>9} {scan:>9.1f} {full:>9.1f} {session:>11.1f}")
+    for kind, stats in store.searches.stats.items():
+        print(
+            f"{kind:>8}: {stats.calls} calls, mean {stats.mean_ms:.2f} ms, "
+            f"max {stats.max_seconds * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
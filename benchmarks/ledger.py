@@ -0,0 +1,70 @@
+"""Stock ledger append and read cost as movement history grows.
+
+Run with ``python -m benchmarks.ledger [--movements 1000000] [--products 100]
+[--sqlite PATH]``. Random receipts and sales are appended across the
+products; at every tenfold of history the mean cost of a further 10k
+appends and 10k current-stock reads is printed. Both should stay flat.
+"""
+
+import argparse
+import random
+import time
+
+from app.states.products_state import stock_status
+from app.store.ledger import StockLedger
+from app.store.persistence import MemoryBackend, SQLiteBackend
+from app.store.record_store import RecordStore
+
+SAMPLE = 10_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movements", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--sqlite", help="append to a SQLite file instead of memory")
+    args = parser.parse_args()
+
+    backend = SQLiteBackend(args.sqlite) if args.sqlite else MemoryBackend()
+    ids = [f"P{i}" for i in range(args.products)]
+    store = RecordStore(
+        "bench_products",
+        "id",
+        lambda: [{"id": i, "stock": 1_000, "status": "In Stock"} for i in ids],
+        backend,
+    )
+    ledger = StockLedger(
+        "bench_movements",
+        store,
+        lambda stock: {"stock": stock, "status": stock_status(stock)},
+        backend,
+    )
+    rng = random.Random(0)
+
+    def append(count: int):
+        for _ in range(count):
+            product = rng.choice(ids)
+            if rng.random() < 0.5 or ledger.stock(product) < 5:
+                ledger.record(product, "receipt", rng.randint(1, 5))
+            else:
+                ledger.record(product, "sale", -rng.randint(1, 5))
+
+    print(f"{'history':>10} {'append us':>10} {'read us':>8}")
+    history = 0
+    checkpoint = SAMPLE
+    while checkpoint <= args.movements:
+        append(checkpoint - history)
+        start = time.perf_counter()
+        append(SAMPLE)
+        append_us = (time.perf_counter() - start) / SAMPLE * 1e6
+        start = time.perf_counter()
+        for _ in range(SAMPLE):
+            ledger.stock(rng.choice(ids))
+        read_us = (time.perf_counter() - start) / SAMPLE * 1e6
+        history = checkpoint + SAMPLE
+        print(f"{checkpoint:>10} {append_us:>10.1f} {read_us:>8.2f}")
+        checkpoint *= 10
+
+
+if __name__ == "__main__":
+    main()
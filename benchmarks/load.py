@@ -0,0 +1,530 @@
+"""Event round-trip latency, delta bytes and server RSS under concurrent sessions.
+
+Run with ``python -m benchmarks.load [--clients 1 10 100 1000] [--duration 20]
+[--rows 100000] [--think 0.5] [--out load.json] [--compare OLD.json]``.
+For every client count a fresh backend is started with granian on a local
+port (``--rows`` fixture rows per table, memory state manager) and that
+many websocket sessions are opened against it, speaking Socket.IO like a
+browser tab. Each session hydrates ``/orders`` and then repeats an
+admin's usual work until ``--duration`` runs out: pick a page and an
+order, type a header search one keystroke at a time, edit the selected
+customer and delete the selected trial, pausing about ``--think`` seconds
+between actions.
+
+An event's round trip runs from sending it to the last update it causes:
+its ``final`` update, the updates of the events it queues (a visit's
+``on_load``) and, for the last keystroke of a search, the update that
+clears ``is_searching`` (reported as ``search``). Per client count the
+p50/p95/p99 latency, the mean delta bytes per event and the peak RSS of
+the server processes are printed, per event kind as well, and everything
+is written to ``--out``; ``--compare`` prints the change against an
+earlier file. The clients run on the same machine as the server, so on
+small hosts their own CPU time is part of the measured latency.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import reflex as rx
+from reflex import constants
+from reflex.environment import environment
+from reflex.event import get_hydrate_event
+from reflex.utils.exec import get_app_instance_from_file
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Ping,
+    RejectConnection,
+    Request,
+    TextMessage,
+)
+
+from app.states.customers_state import CustomersState
+from app.states.nav_state import NavState
+from app.states.orders_state import OrdersState
+from app.states.trials_state import TrialsState
+
+HOST = "127.0.0.1"
+NAMESPACE = "/_event"
+HYDRATE = get_hydrate_event(rx.State)
+ON_LOAD = f"{rx.State.get_full_name()}.{constants.CompileVars.ON_LOAD_INTERNAL}"
+QUERIES = ["acme", "chanel", "smith", "ord-1", "serum", "globex"]
+KEYSTROKE_GAP = 0.12
+TIMEOUT = 60.0
+
+
+def _event(state_cls: type[rx.State], handler: str) -> str:
+    return f"{state_cls.get_full_name()}.{handler}"
+
+
+def _field(state_cls: type[rx.State], name: str) -> tuple[str, str]:
+    """The delta keys of ``state_cls.name``: state full name and var key."""
+    key = getattr(state_cls, name)._js_expr.rpartition(".")[2]
+    return state_cls.get_full_name(), key
+
+
+class Session:
+    """One browser tab: an Engine.IO v4 websocket carrying Socket.IO events.
+
+    Deltas are merged into ``view`` (state full name -> var key -> value) so
+    the next action can pick rows the tab is actually showing.
+    """
+
+    def __init__(self, port: int, route: str):
+        self.port = port
+        self.token = str(uuid.uuid4())
+        self.route = route
+        self.view: dict[str, dict] = {}
+        self._ws = WSConnection(ConnectionType.CLIENT)
+        self._updates: asyncio.Queue = asyncio.Queue()
+        self._connected = asyncio.Event()
+        self._pump = None
+        self._writer = None
+
+    async def _send(self, data: str):
+        self._writer.write(self._ws.send(TextMessage(data=data)))
+        await self._writer.drain()
+
+    async def connect(self):
+        reader, self._writer = await asyncio.open_connection(HOST, self.port)
+        target = f"{NAMESPACE}/?EIO=4&transport=websocket&token={self.token}"
+        self._writer.write(
+            self._ws.send(Request(host=f"{HOST}:{self.port}", target=target))
+        )
+        self._pump = asyncio.create_task(self._receive(reader))
+        await asyncio.wait_for(self._connected.wait(), TIMEOUT)
+
+    async def close(self):
+        if self._pump is not None:
+            self._pump.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _packet(self, text: str):
+        if text.startswith("0"):  # Engine.IO open: join the event namespace.
+            await self._send(f"40{NAMESPACE},")
+        elif text == "2":  # Engine.IO ping.
+            await self._send("3")
+        elif text.startswith(f"40{NAMESPACE},"):
+            self._connected.set()
+        elif text.startswith(f"42{NAMESPACE},"):
+            name, update = json.loads(text[len(NAMESPACE) + 3 :])
+            await self._updates.put((name, update, len(text)))
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        buffer = []
+        while True:
+            data = await reader.read(65536)
+            self._ws.receive_data(data or None)
+            for event in self._ws.events():
+                if isinstance(event, AcceptConnection):
+                    continue
+                if isinstance(event, (RejectConnection, CloseConnection)):
+                    await self._updates.put(("closed", None, 0))
+                    return
+                if isinstance(event, Ping):
+                    self._writer.write(self._ws.send(event.response()))
+                elif isinstance(event, TextMessage):
+                    buffer.append(event.data)
+                    if event.message_finished:
+                        await self._packet("".join(buffer))
+                        buffer.clear()
+            if not data:
+                await self._updates.put(("closed", None, 0))
+                return
+
+    async def _next_update(self) -> tuple[dict, int]:
+        name, update, size = await asyncio.wait_for(self._updates.get(), TIMEOUT)
+        if name != str(constants.SocketEvent.EVENT):
+            raise ConnectionError(f"session {self.token}: {name}")
+        for state, delta in update.get("delta", {}).items():
+            self.view.setdefault(state, {}).update(delta)
+        return update, size
+
+    async def call(self, name: str, until=None, **payload) -> tuple[float, int]:
+        """Send ``name`` and wait out its round trip; seconds and bytes received.
+
+        Events the update queues for the backend are sent in turn, as the
+        frontend's event queue does; ``until(view)`` must then also hold.
+        """
+        start = time.perf_counter()
+        received = 0
+        queue = [(name, payload)]
+        while queue:
+            name, payload = queue.pop(0)
+            event = {
+                "name": name,
+                "payload": payload,
+                "token": self.token,
+                "router_data": {
+                    "pathname": self.route,
+                    "query": {},
+                    "asPath": self.route,
+                },
+            }
+            await self._send(f"42{NAMESPACE}," + json.dumps(["event", event]))
+            while True:
+                update, size = await self._next_update()
+                received += size
+                queue += [
+                    (e["name"], e.get("payload", {}))
+                    for e in update.get("events", [])
+                    if not e["name"].startswith("_")
+                ]
+                if update.get("final"):
+                    break
+        if until is not None:
+            received += await self.wait_for(until)
+        return time.perf_counter() - start, received
+
+    async def wait_for(self, until) -> int:
+        """Take updates until ``until(view)`` holds; the bytes received."""
+        received = 0
+        while not until(self.view):
+            _, size = await self._next_update()
+            received += size
+        return received
+
+    def get(self, state_cls: type[rx.State], name: str, default=None):
+        state, key = _field(state_cls, name)
+        return self.view.get(state, {}).get(key, default)
+
+
+class Workload:
+    """The admin actions a session repeats, with their samples per event kind."""
+
+    def __init__(self, think: float, seed: int):
+        self.think = think
+        self.rng = random.Random(seed)
+        self.samples: dict[str, list[tuple[float, int]]] = {}
+        self.errors = 0
+
+    async def run(self, session: Session, name: str, kind: str, until=None, **payload):
+        self.samples.setdefault(kind, []).append(
+            await session.call(name, until, **payload)
+        )
+
+    async def visit(self, session: Session, route: str):
+        session.route = route
+        await self.run(session, ON_LOAD, "visit")
+
+    async def pause(self):
+        await asyncio.sleep(self.rng.expovariate(1 / self.think) if self.think else 0)
+
+    async def open(self, session: Session):
+        await session.connect()
+        await self.run(session, HYDRATE, "hydrate")
+        await self.run(session, ON_LOAD, "visit")
+
+    async def orders(self, session: Session):
+        await self.visit(session, "/orders")
+        await self.pause()
+        pages = session.get(OrdersState, "total_pages", 1) or 1
+        page = self.rng.randint(1, pages)
+        await self.run(session, _event(OrdersState, "set_page"), "set_page", page=page)
+        await self.pause()
+        rows = session.get(OrdersState, "current_page_orders", [])
+        if rows:
+            order_id = self.rng.choice(rows)["id"]
+            await self.run(
+                session,
+                _event(OrdersState, "select_order"),
+                "select_order",
+                order_id=order_id,
+            )
+
+    async def search(self, session: Session):
+        query = self.rng.choice(QUERIES)
+        name = _event(NavState, "set_search")
+        for typed in range(1, len(query)):
+            await self.run(session, name, "set_search", query=query[:typed])
+            await asyncio.sleep(KEYSTROKE_GAP)
+
+        def answered(view) -> bool:
+            return session.get(NavState, "search_query") == query and not session.get(
+                NavState, "is_searching", True
+            )
+
+        await self.run(session, name, "search", until=answered, query=query)
+        await self.pause()
+        await self.run(session, _event(NavState, "clear_search"), "clear_search")
+
+    async def customers(self, session: Session):
+        await self.visit(session, "/customers")
+        await self.pause()
+        customer = session.get(CustomersState, "selected_customer", {}) or {}
+        form = {f: customer.get(f, "") for f in ("name", "email", "company")}
+        form["phone"] = (
+            f"+1 (555) {self.rng.randint(100, 999)}-{self.rng.randint(1000, 9999)}"
+        )
+        await self.run(
+            session,
+            _event(CustomersState, "update_customer"),
+            "update_customer",
+            form_data=form,
+        )
+
+    async def trials(self, session: Session):
+        await self.visit(session, "/trials")
+        await self.pause()
+        await self.run(session, _event(TrialsState, "delete_trial"), "delete_trial")
+
+    async def loop(self, session: Session, deadline: float):
+        actions = [self.orders, self.search, self.customers, self.trials]
+        try:
+            while time.perf_counter() < deadline:
+                for action in actions:
+                    if time.perf_counter() >= deadline:
+                        break
+                    await action(session)
+                    await self.pause()
+        except (TimeoutError, ConnectionError, OSError):
+            self.errors += 1
+
+
+def _tree_rss(pid: int) -> int:
+    """Resident bytes of ``pid`` and all of its descendants."""
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        with contextlib.suppress(OSError):
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+            for task in Path(f"/proc/{current}/task").iterdir():
+                pending += map(int, (task / "children").read_text().split())
+    return total
+
+
+@contextlib.contextmanager
+def backend(port: int, rows: int, workers: int = 1, redis_url: Optional[str] = None):
+    """A granian backend of the app on ``port``, without compiling the frontend.
+
+    With ``redis_url`` the ``workers`` processes keep session state and the
+    stores in that Redis; otherwise both stay in process memory.
+    """
+    web_dir = Path(tempfile.mkdtemp(prefix="load-"))
+    (web_dir / constants.Dirs.BACKEND).mkdir()
+    env = {
+        **os.environ,
+        environment.REFLEX_SKIP_COMPILE.name: "true",
+        environment.REFLEX_WEB_WORKDIR.name: str(web_dir),
+        "REFLEX_STATE_MANAGER_MODE": "memory",
+        "GRANIAN_WORKERS": str(workers),
+        "ADMIN_FIXTURE_ROWS": str(rows),
+    }
+    if redis_url is not None:
+        env.update(
+            {
+                "REFLEX_STATE_MANAGER_MODE": "redis",
+                "REFLEX_REDIS_URL": redis_url,
+                "ADMIN_STORE_BACKEND": "redis",
+                "ADMIN_REDIS_URL": redis_url,
+            }
+        )
+    log = (web_dir / "backend.log").open("w")
+    process = subprocess.Popen(
+        [
+            "granian",
+            *("--log-level", "warning"),
+            *("--host", HOST),
+            *("--port", str(port)),
+            *("--interface", "asgi"),
+            *("--factory", get_app_instance_from_file()),
+        ],
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        for _ in range(600):
+            if process.poll() is not None:
+                raise RuntimeError(f"backend exited, see {log.name}")
+            with contextlib.suppress(httpx.HTTPError):
+                if httpx.get(f"http://{HOST}:{port}/ping").is_success:
+                    break
+            time.sleep(0.2)
+        else:
+            raise RuntimeError(f"backend did not start, see {log.name}")
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        log.close()
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    last = len(ordered) - 1
+    return {
+        f"p{p}": round(ordered[min(last, p * len(ordered) // 100)] * 1000, 2)
+        for p in (50, 95, 99)
+    }
+
+
+def _summary(samples: list[tuple[float, int]]) -> dict:
+    return {
+        "count": len(samples),
+        **_percentiles([seconds for seconds, _ in samples]),
+        "mean_bytes": round(sum(b for _, b in samples) / max(1, len(samples))),
+    }
+
+
+async def measure(clients: int, args, process: subprocess.Popen) -> dict:
+    # Touch every page once so the lazily loaded tables count as idle memory.
+    warm = Session(args.port, "/orders")
+    await Workload(0, -1).open(warm)
+    for route in ("/customers", "/trials"):
+        warm.route = route
+        await warm.call(ON_LOAD)
+    await warm.close()
+    idle = _tree_rss(process.pid)
+
+    sessions = [Session(args.port, "/orders") for _ in range(clients)]
+    workloads = [Workload(args.think, seed) for seed in range(clients)]
+    opening = asyncio.Semaphore(64)
+
+    async def open_one(workload, session):
+        async with opening:
+            await workload.open(session)
+
+    peak = idle
+    sampling = True
+
+    async def sample_rss():
+        nonlocal peak
+        while sampling:
+            peak = max(peak, _tree_rss(process.pid))
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.create_task(sample_rss())
+    await asyncio.gather(*map(open_one, workloads, sessions))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(w.loop(s, start + args.duration) for w, s in zip(workloads, sessions))
+    )
+    elapsed = time.perf_counter() - start
+    sampling = False
+    await sampler
+    peak = max(peak, _tree_rss(process.pid))
+    for session in sessions:
+        await session.close()
+
+    kinds: dict[str, list[tuple[float, int]]] = {}
+    for workload in workloads:
+        for kind, samples in workload.samples.items():
+            kinds.setdefault(kind, []).extend(samples)
+    looped = [
+        s for kind, samples in kinds.items() if kind != "hydrate" for s in samples
+    ]
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 2),
+        "events": len(looped),
+        "events_per_s": round(len(looped) / elapsed, 1),
+        **_summary(looped),
+        "by_event": {
+            kind: _summary(samples) for kind, samples in sorted(kinds.items())
+        },
+        "rss_mb": {"idle": round(idle / 2**20, 1), "peak": round(peak / 2**20, 1)},
+        "errors": sum(w.errors for w in workloads),
+    }
+
+
+def _print_level(level: dict):
+    print(
+        f"{level['clients']:>7} {level['events_per_s']:>8.1f} {level['p50']:>8.1f} "
+        f"{level['p95']:>8.1f} {level['p99']:>8.1f} {level['mean_bytes']:>9} "
+        f"{level['rss_mb']['idle']:>8.1f} {level['rss_mb']['peak']:>8.1f} "
+        f"{level['errors']:>6}"
+    )
+
+
+def _print_compare(levels: list[dict], path: str):
+    earlier = {
+        level["clients"]: level
+        for level in json.loads(Path(path).read_text())["levels"]
+    }
+    print(f"\nchange against {path}:")
+    print(
+        f"{'clients':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'bytes':>8} {'peak MB':>9}"
+    )
+    for level in levels:
+        old = earlier.get(level["clients"])
+        if old is None:
+            continue
+        print(
+            f"{level['clients']:>7} {level['p50'] - old['p50']:>+9.1f} "
+            f"{level['p95'] - old['p95']:>+9.1f} {level['p99'] - old['p99']:>+9.1f} "
+            f"{level['mean_bytes'] - old['mean_bytes']:>+8} "
+            f"{level['rss_mb']['peak'] - old['rss_mb']['peak']:>+9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--think", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--out", default="load.json")
+    parser.add_argument("--compare", help="an earlier --out file")
+    args = parser.parse_args()
+
+    levels = []
+    print(
+        f"{'clients':>7} {'events/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'bytes/ev':>9} {'idle MB':>8} {'peak MB':>8} {'errors':>6}"
+    )
+    for clients in args.clients:
+        with backend(args.port, args.rows) as process:
+            level = asyncio.run(measure(clients, args, process))
+        levels.append(level)
+        _print_level(level)
+
+    slowest = levels[-1]
+    print(f"\nper event at {slowest['clients']} clients:")
+    print(
+        f"{'event':>16} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bytes':>8}"
+    )
+    for kind, row in slowest["by_event"].items():
+        print(
+            f"{kind:>16} {row['count']:>7} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+            f"{row['p99']:>8.1f} {row['mean_bytes']:>8}"
+        )
+
+    Path(args.out).write_text(
+        json.dumps(
+            {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "args": vars(args),
+                "levels": levels,
+            },
+            indent=2,
+        )
+    )
+    print(f"\nresults written to {args.out}")
+    if args.compare:
+        _print_compare(levels, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-event cost of the ``/metrics`` instrumentation.
+
+Run with ``python -m benchmarks.metrics_overhead [--events 5000]
+[--orders 100000]``. Events go through the app's own ``process`` loop,
+state manager and middleware included, once with ``EventMetrics`` installed
+as the app runs it and once with the original handlers put back and the
+middleware removed. The median microseconds per event of each and the
+time to render the metrics page are printed.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import statistics
+import time
+
+from reflex.app import process
+from reflex.event import Event
+
+from app.app import app
+from app.states.instrumentation import EventMetrics
+from app.states.orders_state import OrdersState, orders_store
+from app.store.metrics import registry
+from benchmarks._data import scale_store
+
+ROUTER = {"pathname": "/orders", "query": {}, "asPath": "/orders"}
+
+
+def _uninstrument(state_cls):
+    for name, handler in state_cls.event_handlers.items():
+        original = getattr(handler.fn, "__wrapped__", None)
+        if original is not None:
+            state_cls.event_handlers[name] = dataclasses.replace(handler, fn=original)
+
+
+async def _run(token: str, name: str, **payload):
+    event = Event(token=token, name=name, router_data=dict(ROUTER), payload=payload)
+    async for _ in process(app, event, "sid", {}, "127.0.0.1"):
+        pass
+
+
+async def _median_us(events: int) -> float:
+    token = f"bench-{time.perf_counter_ns()}"
+    await _run(token, "reflex___state____state.hydrate")
+    await _run(token, f"{OrdersState.get_full_name()}.load")
+    ids = [order["id"] for order in orders_store.window(0, 50)]
+    samples = []
+    for i in range(events):
+        start = time.perf_counter()
+        if i % 2:
+            await _run(
+                token, f"{OrdersState.get_full_name()}.set_page", page=i % 40 + 1
+            )
+        else:
+            await _run(
+                token,
+                f"{OrdersState.get_full_name()}.select_order",
+                order_id=ids[i % len(ids)],
+            )
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    scale_store(orders_store, args.orders)
+    app._enable_state()
+    instrumented = asyncio.run(_median_us(args.events))
+
+    app._middlewares[:] = [
+        m for m in app._middlewares if not isinstance(m, EventMetrics)
+    ]
+    _uninstrument(OrdersState)
+    plain = asyncio.run(_median_us(args.events))
+
+    start = time.perf_counter()
+    page = registry.render()
+    rendered = time.perf_counter() - start
+    print(f"without metrics {plain:8.1f} us/event")
+    print(f"with metrics    {instrumented:8.1f} us/event ({instrumented - plain:+.1f})")
+    print(f"/metrics page   {len(page) / 1024:8.1f} KB in {rendered * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
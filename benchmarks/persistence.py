@@ -0,0 +1,93 @@
+"""Write latency and restart time: list rebuilds vs. the SQLite backend.
+
+Run with ``python -m benchmarks.persistence [--rows 100000] [--ops 200]``.
+The "list" columns replay what the states did before the record store
+existed (copy the whole list to touch one row, regenerate the seeded
+orders on start); the "sqlite" columns go through a ``RecordStore`` backed
+by a WAL database, restarting by reading the rows back in.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.store.fixtures import Fixtures
+from app.store.persistence import SQLiteBackend
+from app.store.record_store import RecordStore
+
+
+def _list_update(rows: list, key_value: str) -> list:
+    updated = []
+    for row in rows:
+        if row["id"] == key_value:
+            row = row.copy()
+            row["quantity"] = 2
+            updated.append(row)
+        else:
+            updated.append(row)
+    return updated
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(rows: int, ops: int) -> dict:
+    fixtures = Fixtures(rows={"orders": rows}, today="2025-01-01")
+    data = fixtures.records("orders")
+    picks = [data[random.randrange(rows)]["id"] for _ in range(ops)]
+
+    list_rows = list(data)
+    list_update = sum(_timed(_list_update, list_rows, k) for k in picks) / ops
+    list_delete = (
+        sum(_timed(lambda k: [r for r in list_rows if r["id"] != k], k) for k in picks)
+        / ops
+    )
+    list_restart = _timed(fixtures.records, "orders")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        backend = SQLiteBackend(path)
+        store = RecordStore("bench_orders", "id", lambda: list(data), backend)
+        sqlite_update = (
+            sum(_timed(store.update, k, {"quantity": 2}) for k in picks) / ops
+        )
+        sqlite_delete = sum(_timed(store.remove, k) for k in picks) / ops
+        backend.close()
+
+        start = time.perf_counter()
+        reopened = SQLiteBackend(path)
+        RecordStore("bench_orders", "id", list, reopened).load()
+        sqlite_restart = time.perf_counter() - start
+        reopened.close()
+
+    return {
+        "rows": rows,
+        "list_update_ms": list_update * 1000,
+        "sqlite_update_ms": sqlite_update * 1000,
+        "list_delete_ms": list_delete * 1000,
+        "sqlite_delete_ms": sqlite_delete * 1000,
+        "list_restart_s": list_restart,
+        "sqlite_restart_s": sqlite_restart,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+    for name, value in run(args.rows, args.ops).items():
+        print(
+            f"{name:>18}: {value:.3f}"
+            if isinstance(value, float)
+            else f"{name:>18}: {value}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Coupon redemption throughput and correctness under concurrent redeemers.
+
+Run with ``python -m benchmarks.redemption [--coupons 1000] [--threads 8]
+[--attempts 400000] [--sqlite PATH]``. A fresh coupons table is filled
+with coupons of random limits (every 10th already expired), then the
+threads redeem random codes until the attempts are used up. Afterwards no
+coupon may be over its limit, every success must be counted in ``used``,
+and each coupon's status must match its counters.
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+from app.store.persistence import MemoryBackend, SQLiteBackend
+from app.store.record_store import RecordStore
+from app.store.redemption import CouponRedeemer, RedemptionError, coupon_status
+
+
+def _coupons(count: int, rng: random.Random) -> list[dict]:
+    today = date.today()
+    coupons = []
+    for i in range(count):
+        days = -1 if i % 10 == 9 else rng.randint(1, 90)
+        coupons.append(
+            {
+                "code": f"LOAD{i:06d}",
+                "type": "Percentage",
+                "value": 10.0,
+                "used": 0,
+                "limit": rng.randint(50, 500),
+                "expiry_date": (today + timedelta(days=days)).isoformat(),
+                "status": "Active",
+            }
+        )
+    return coupons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--coupons", type=int, default=1_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=400_000)
+    parser.add_argument("--sqlite", help="redeem against a SQLite file instead")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    backend = SQLiteBackend(args.sqlite) if args.sqlite else MemoryBackend()
+    store = RecordStore("bench_coupons", "code", list, backend, ("code",))
+    store.replace_all(_coupons(args.coupons, rng))
+    redeemer = CouponRedeemer(store)
+    codes = [coupon["code"] for coupon in store]
+    per_thread = args.attempts // args.threads
+    results = []
+
+    def redeem(seed: int):
+        pick = random.Random(seed)
+        redeemed = refused = 0
+        for _ in range(per_thread):
+            try:
+                redeemer.redeem(pick.choice(codes))
+                redeemed += 1
+            except RedemptionError:
+                refused += 1
+        results.append((redeemed, refused))
+
+    threads = [threading.Thread(target=redeem, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    redeemed = sum(r for r, _ in results)
+    refused = sum(f for _, f in results)
+    coupons = list(store)
+    over = [c["code"] for c in coupons if c["used"] > c["limit"]]
+    wrong = [c["code"] for c in coupons if c["status"] != coupon_status(c)]
+    used = sum(c["used"] for c in coupons)
+    print(
+        f"{redeemed + refused} attempts by {args.threads} threads in {elapsed:.2f} s "
+        f"({(redeemed + refused) / elapsed:,.0f}/s): "
+        f"{redeemed} redeemed, {refused} refused"
+    )
+    print(f"exhausted {sum(c['status'] == 'Exhausted' for c in coupons)}")
+    print(f"over limit {len(over)}, status mismatches {len(wrong)}")
+    if over or wrong or used != redeemed:
+        raise SystemExit(f"FAILED: used {used} != redeemed {redeemed}")
+
+
+if __name__ == "__main__":
+    main()
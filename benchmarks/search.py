@@ -0,0 +1,67 @@
+"""Customer substring search: linear scan vs. the trigram index.
+
+Run with ``python -m benchmarks.search [--rows 1000000]``. The scan column
+replays the old ``filtered_customers`` comprehension; the index column is
+``RecordStore.matching`` on the same rows.
+"""
+
+import argparse
+import time
+
+from app.store.persistence import MemoryBackend
+from app.store.record_store import RecordStore
+from benchmarks._data import synthetic_customers
+
+QUERIES = ["alice.smith12", "initech", "williams4", "@example", "globex", "9f3a", "zz"]
+
+
+def _scan(rows: list[dict], query: str) -> list[dict]:
+    query = query.lower()
+    return [
+        c
+        for c in rows
+        if query in c["name"].lower()
+        or query in c["email"].lower()
+        or query in c["company"].lower()
+    ]
+
+
+def _best_ms(fn, *args, repeat: int = 3) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = synthetic_customers(args.rows)
+    start = time.perf_counter()
+    store = RecordStore(
+        "bench_customers",
+        "id",
+        lambda: rows,
+        MemoryBackend(),
+        search_fields=("name", "email", "company"),
+    )
+    print(f"indexed {args.rows} customers in {time.perf_counter() - start:.1f}s")
+    print(
+        f"{'query':>16} {'matches':>9} {'scan ms':>10} {'index ms':>10} {'speedup':>8}"
+    )
+    for query in QUERIES:
+        scan_ms, expected = _best_ms(_scan, rows, query)
+        index_ms, seqs = _best_ms(store.matching, query)
+        assert len(seqs) == len(expected)
+        print(
+            f"{query:>16} {len(seqs):>9} {scan_ms:>10.1f} {index_ms:>10.1f} "
+            f"{scan_ms / max(index_ms, 1e-6):>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
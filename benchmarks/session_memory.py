@@ -0,0 +1,79 @@
+"""Per-session memory of the entity states as the shared tables grow.
+
+Run with ``python -m benchmarks.session_memory [--rows 1000 10000 100000]``.
+For every row count the shared stores are refilled, a fresh session is
+created and rendered, and its serialized / traced size is reported next to
+what a per-session copy of the tables used to cost.
+"""
+
+import argparse
+import pickle
+import tracemalloc
+
+import reflex as rx
+
+from app.states.coupons_state import CouponsState, coupons_store
+from app.states.customers_state import CustomersState, customers_store
+from app.states.orders_state import OrdersState, orders_store
+from app.states.products_state import ProductsState, products_store
+from app.states.trials_state import TrialsState, trials_store
+from benchmarks._data import scale_store
+
+ENTITIES = [
+    (OrdersState, orders_store),
+    (CustomersState, customers_store),
+    (ProductsState, products_store),
+    (TrialsState, trials_store),
+    (CouponsState, coupons_store),
+]
+
+
+def _new_session() -> rx.State:
+    root = rx.State(_reflex_internal_init=True)
+    for state_cls, _ in ENTITIES:
+        substate = root.get_substate(state_cls.get_full_name().split(".")[1:])
+        state_cls.event_handlers["load"].fn(substate)
+        for name in state_cls.computed_vars:
+            getattr(substate, name)
+    return root
+
+
+def measure(rows: int) -> dict:
+    seeds = {store.name: store.records[:] for _, store in ENTITIES}
+    for _, store in ENTITIES:
+        scale_store(store, rows, seeds[store.name])
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = _new_session()
+    traced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    serialized = sum(
+        len(root.get_substate(cls.get_full_name().split(".")[1:])._serialize())
+        for cls, _ in ENTITIES
+    )
+    legacy = sum(len(pickle.dumps(store.records)) for _, store in ENTITIES)
+    for _, store in ENTITIES:
+        store.replace_all(seeds[store.name])
+    return {
+        "rows": rows,
+        "session_serialized_bytes": serialized,
+        "session_traced_bytes": traced,
+        "per_session_copy_bytes": legacy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    print(f"{'rows':>10} {'serialized':>12} {'traced':>12} {'old copy':>14}")
+    for rows in args.rows:
+        r = measure(rows)
+        print(
+            f"{r['rows']:>10} {r['session_serialized_bytes']:>12} "
+            f"{r['session_traced_bytes']:>12} {r['per_session_copy_bytes']:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""First-load cost of each route against the old single-page layout.
+
+Run with ``python -m benchmarks.startup [--orders 1000000] [--customers 200000]
+[--repeat 5]``. The old layout put every view under one ``rx.match`` on the
+index page and hydrated the whole state tree on load; it is rebuilt here
+with ``LegacyNavState`` holding the active section. For each page the
+compiled page module is measured (raw and gzipped bytes, a proxy for its
+share of the bundle), then a fresh session is hydrated and the page's
+``on_load`` run: the median server time and the JSON bytes sent before the
+page is interactive are reported. Browser parse and render time is not
+measured.
+"""
+
+import argparse
+import gzip
+import statistics
+import time
+
+import reflex as rx
+from reflex.compiler.compiler import compile_page
+from reflex.utils.format import json_dumps
+
+from app.app import PAGES, dashboard_placeholder, layout, page
+from app.components.coupons_view import coupons_view
+from app.components.customers_view import customers_view
+from app.components.orders_view import orders_view
+from app.components.products_view import products_view
+from app.components.trials_view import trials_view
+from app.states.customers_state import customers_store
+from app.states.orders_state import orders_store
+from benchmarks._data import scale_store
+
+
+class LegacyNavState(rx.State):
+    active_item: str = "Customers"
+
+
+def legacy_index() -> rx.Component:
+    return layout(
+        "/",
+        rx.match(
+            LegacyNavState.active_item,
+            ("Customers", customers_view()),
+            ("Orders", orders_view()),
+            ("Products", products_view()),
+            ("Trials", trials_view()),
+            ("Coupons", coupons_view()),
+            dashboard_placeholder(),
+        ),
+    )
+
+
+def _module_bytes(route: str, render) -> tuple[int, int]:
+    _, code = compile_page(route, render())
+    data = code.encode()
+    return len(data), len(gzip.compress(data))
+
+
+def _first_load(on_load) -> tuple[float, int]:
+    """Server seconds and JSON bytes to hydrate a new session and run ``on_load``."""
+    start = time.perf_counter()
+    root = rx.State(_reflex_internal_init=True)
+    sent = len(json_dumps(root.dict()))
+    root._clean()
+    for handler in on_load:
+        state = root.get_substate(handler.state_full_name.split(".")[1:])
+        handler.fn(state)
+    sent += len(json_dumps(root.get_delta()))
+    return time.perf_counter() - start, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scale_store(orders_store, args.orders)
+    scale_store(customers_store, args.customers)
+    # The old index hydrated every section at once, as if all were loaded.
+    rows = [("legacy /", legacy_index, [on_load for _, _, on_load in PAGES])]
+    rows += [(route, page(route, view), [on_load]) for route, view, on_load in PAGES]
+
+    print(f"{'page':>12} {'module KB':>10} {'gzip KB':>8} {'load ms':>8} {'sent KB':>8}")
+    for name, render, on_load in rows:
+        raw, packed = _module_bytes(name.split()[-1], render)
+        _first_load(on_load)
+        samples = [_first_load(on_load) for _ in range(args.repeat)]
+        seconds = statistics.median(s for s, _ in samples)
+        print(
+            f"{name:>12} {raw / 1024:>10.1f} {packed / 1024:>8.1f} "
+            f"{seconds * 1000:>8.1f} {samples[-1][1] / 1024:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Throughput from 1 to 8 worker processes sharing state through Redis.
+
+Run with ``python -m benchmarks.workers [--workers 1 2 4 8] [--clients 64]
+[--duration 20] [--rows 20000] [--redis-url redis://...]``. For every worker
+count a fresh Redis stand-in (``benchmarks._redis``, in its own process) is
+started, unless ``--redis-url`` names a real server, which is flushed
+instead. A granian backend with that many workers then keeps session state
+(Reflex's redis state manager) and the stores (``ADMIN_STORE_BACKEND=redis``)
+in it, and ``--clients`` websocket sessions run the admin loop of
+``benchmarks.load`` back to back, without think time. Events per second and
+the scaling efficiency against one worker are printed.
+
+Each level then checks that writes are visible across workers: one
+session edits the phone of the customer every session is showing, and
+the time until that edit is pushed to the sessions connected to other
+workers is reported; finally every session visits ``/customers`` again
+and must read the new phone.
+
+Scaling needs as many free cores as workers, plus some for the clients
+and Redis, which run on the same machine; on a smaller host the events
+per second stay flat past the core count.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Iterator, Optional
+
+from redis import Redis
+
+from app.states.customers_state import CustomersState
+from benchmarks.load import Session, Workload, _percentiles, backend
+
+HOST = "127.0.0.1"
+TOKEN_KEY = "token_manager_socket_record_"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def redis_server(url: Optional[str]) -> Iterator[str]:
+    """``url`` flushed, or a stand-in served from a child process."""
+    if url is not None:
+        Redis.from_url(url).flushdb()
+        yield url
+        return
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks._redis",
+            "--host",
+            HOST,
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        client = Redis(HOST, port)
+        for _ in range(100):
+            with contextlib.suppress(OSError):
+                client.ping()
+                break
+            time.sleep(0.1)
+        yield f"redis://{HOST}:{port}/0"
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def _phone(session: Session) -> str:
+    return (session.get(CustomersState, "selected_customer", {}) or {}).get("phone")
+
+
+async def check_visibility(sessions: list[Session], redis_url: str) -> dict:
+    """Edit a customer from one session; when and whether the others see it."""
+    client = Redis.from_url(redis_url)
+    owners = {}
+    for session in sessions:
+        record = client.get(TOKEN_KEY + session.token)
+        owners[session.token] = json.loads(record)["instance_id"] if record else None
+    workload = Workload(0, 0)
+    for session in sessions:
+        await workload.visit(session, "/customers")
+    writer = sessions[0]
+    customer = writer.get(CustomersState, "selected_customer", {}) or {}
+    phone = f"+1 (555) {time.time_ns() % 10**7:07d}"
+    form = {f: customer.get(f, "") for f in ("name", "email", "company")}
+    form["phone"] = phone
+    remote = [s for s in sessions if owners[s.token] != owners[writer.token]]
+    start = time.perf_counter()
+    await writer.call(
+        f"{CustomersState.get_full_name()}.update_customer", form_data=form
+    )
+    delays = []
+
+    async def pushed(session: Session):
+        await session.wait_for(lambda view: _phone(session) == phone)
+        delays.append(time.perf_counter() - start)
+
+    await asyncio.gather(*map(pushed, remote))
+    for session in sessions:
+        await workload.visit(session, "/customers")
+    return {
+        "instances": len(set(owners.values())),
+        "remote_sessions": len(remote),
+        **{f"push_{k}": v for k, v in _percentiles(delays).items()},
+        "consistent": sum(_phone(session) == phone for session in sessions),
+    }
+
+
+async def measure(workers: int, args, redis_url: str) -> dict:
+    sessions = [Session(args.port, "/orders") for _ in range(args.clients)]
+    workloads = [Workload(0, seed) for seed in range(args.clients)]
+    opening = asyncio.Semaphore(16)
+
+    async def open_one(workload, session):
+        async with opening:
+            await workload.open(session)
+
+    await asyncio.gather(*map(open_one, workloads, sessions))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(w.loop(s, start + args.duration) for w, s in zip(workloads, sessions))
+    )
+    elapsed = time.perf_counter() - start
+    events = sum(
+        len(samples)
+        for workload in workloads
+        for kind, samples in workload.samples.items()
+        if kind != "hydrate"
+    )
+    visibility = await check_visibility(sessions, redis_url)
+    for session in sessions:
+        await session.close()
+    return {
+        "workers": workers,
+        "events_per_s": round(events / elapsed, 1),
+        **_percentiles(
+            [
+                seconds
+                for workload in workloads
+                for kind, samples in workload.samples.items()
+                if kind != "hydrate"
+                for seconds, _ in samples
+            ]
+        ),
+        "errors": sum(w.errors for w in workloads),
+        "visibility": visibility,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--port", type=int, default=8124)
+    parser.add_argument("--redis-url", help="a Redis to use instead of a stand-in")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients")
+    print(
+        f"{'workers':>7} {'events/s':>9} {'scaling':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'errors':>6} {'push p50':>9} {'push p99':>9} {'consistent':>10}"
+    )
+    base = None
+    for workers in args.workers:
+        with (
+            redis_server(args.redis_url) as url,
+            backend(args.port, args.rows, workers, url),
+        ):
+            level = asyncio.run(measure(workers, args, url))
+        base = base or level["events_per_s"] / workers
+        seen = level["visibility"]
+        print(
+            f"{workers:>7} {level['events_per_s']:>9.1f} "
+            f"{level['events_per_s'] / (base * workers):>8.0%} "
+            f"{level['p50']:>8.1f} {level['p99']:>8.1f} {level['errors']:>6} "
+            f"{seen['push_p50']:>9.1f} {seen['push_p99']:>9.1f} "
+            f"{seen['consistent']:>5}/{args.clients:<4}"
+        )
+
+
+if __name__ == "__main__":
+    main()